@@ -15,6 +15,7 @@ limitations under the License.
 """
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -30,25 +31,113 @@ else:
 
 from .client import CrossEncoderClient
 
+DEFAULT_MODEL = 'BAAI/bge-reranker-v2-m3'
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5
+DEFAULT_INFERENCE_WORKERS = 1
+
 
 class BGERerankerClient(CrossEncoderClient):
-    def __init__(self):
-        self.model = CrossEncoder('BAAI/bge-reranker-v2-m3')
+    """
+    Cross-encoder reranker backed by a local BGE model.
+
+    (query, passage) pairs from concurrent rank() calls are collected into micro-batches:
+    a batch is dispatched once it holds max_batch_size pairs or max_wait_ms after its first
+    pair arrived, whichever comes first. Batches run on a dedicated pool of inference
+    threads, so the model sees a few large predict calls instead of one small call per
+    search, and the scores are fanned back out to the callers.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        max_workers: int = DEFAULT_INFERENCE_WORKERS,
+        torch_threads: int | None = None,
+    ):
+        if max_batch_size <= 0:
+            raise ValueError('max_batch_size must be a positive integer')
+        if torch_threads is not None:
+            import torch
+
+            # intra-op threads used by each predict call; keep max_workers * torch_threads
+            # at or below the number of cores
+            torch.set_num_threads(torch_threads)
+
+        self.model_name = model_name
+        self.model = CrossEncoder(model_name)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='bge-reranker'
+        )
+        self._pending: list[tuple[list[str], asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task] = set()
 
     async def rank(self, query: str, passages: list[str]) -> list[tuple[str, float]]:
         if not passages:
             return []
 
-        input_pairs = [[query, passage] for passage in passages]
-
-        # Run the synchronous predict method in an executor
-        loop = asyncio.get_running_loop()
-        scores = await loop.run_in_executor(None, self.model.predict, input_pairs)
+        scores = await asyncio.gather(*[self._score([query, passage]) for passage in passages])
 
         ranked_passages = sorted(
-            [(passage, float(score)) for passage, score in zip(passages, scores, strict=False)],
+            [(passage, score) for passage, score in zip(passages, scores, strict=True)],
             key=lambda x: x[1],
             reverse=True,
         )
 
         return ranked_passages
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _score(self, pair: list[str]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((pair, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._dispatch)
+
+        return future
+
+    def _dispatch(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size :]
+
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[list[str], asyncio.Future]]):
+        # callers that were cancelled while queued are not scored
+        batch = [(pair, future) for pair, future in batch if not future.done()]
+        if not batch:
+            return
+
+        pairs = [pair for pair, _ in batch]
+        try:
+            scores = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._predict, pairs
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), score in zip(batch, scores, strict=True):
+            if not future.done():
+                future.set_result(float(score))
+
+    def _predict(self, pairs: list[list[str]]):
+        return self.model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
@@ -0,0 +1,100 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import logging
+from functools import partial
+from typing import Any
+
+from helpers import CoalescingLRUCache
+from .client import CrossEncoderClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RERANK_CACHE_SIZE = 16384
+DEFAULT_RERANK_CACHE_TTL = 24 * 60 * 60
+
+
+class CachedCrossEncoder(CrossEncoderClient):
+    """
+    Cross-encoder client that keeps (query, passage) scores in a bounded LRU + TTL cache.
+
+    Wraps another CrossEncoderClient. Scores are keyed by the reranker model, the
+    normalized query and the passage, so only the passages that have not been scored for
+    the query before are sent to the wrapped reranker, and the cached and fresh scores are
+    merged into one ranking. When cache_dir is set, scores are also persisted on disk and
+    survive restarts.
+    """
+
+    def __init__(
+        self,
+        cross_encoder: CrossEncoderClient,
+        max_size: int = DEFAULT_RERANK_CACHE_SIZE,
+        ttl: float | None = DEFAULT_RERANK_CACHE_TTL,
+        cache_dir: str | None = None,
+    ):
+        self.cross_encoder = cross_encoder
+        self.model = get_cross_encoder_model_name(cross_encoder)
+        # concurrent rankings of the same (query, passage) pair share a single score
+        self.cache = CoalescingLRUCache(max_size=max_size, ttl=ttl, cache_dir=cache_dir)
+
+    def _get_cache_key(self, query: str, passage: str) -> str:
+        key_str = f'{self.model}\x00{query}\x00{passage}'
+        return hashlib.md5(key_str.encode()).hexdigest()
+
+    async def rank(self, query: str, passages: list[str]) -> list[tuple[str, float]]:
+        if not passages:
+            return []
+
+        normalized_query = ' '.join(query.split())
+        keys = {
+            passage: self._get_cache_key(normalized_query, passage)
+            for passage in dict.fromkeys(passages)
+        }
+        scores = await self.cache.get_or_create_many(
+            list(keys.values()), partial(self._rank, query, keys)
+        )
+
+        results = [
+            (passage, scores[keys[passage]]) for passage in passages if keys[passage] in scores
+        ]
+        results.sort(reverse=True, key=lambda x: x[1])
+        return results
+
+    async def _rank(
+        self, query: str, keys: dict[str, str], missing_keys: list[str]
+    ) -> dict[str, float]:
+        # only the passages that have not been scored for the query are sent to the reranker
+        passages = {key: passage for passage, key in keys.items()}
+        ranked_passages = await self.cross_encoder.rank(
+            query, [passages[key] for key in missing_keys]
+        )
+        return {keys[passage]: score for passage, score in ranked_passages}
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {'model': self.model, **self.cache.stats()}
+
+
+def get_cross_encoder_model_name(cross_encoder: CrossEncoderClient) -> str:
+    # listwise and pointwise scores are not comparable, so they are cached separately
+    model = getattr(cross_encoder, 'model_name', None) or type(cross_encoder).__name__
+    if getattr(cross_encoder, 'listwise', False):
+        model = f'{model}:listwise'
+
+    return str(model)
@@ -38,3 +38,29 @@ class CrossEncoderClient(ABC):
                                      sorted in descending order of relevance.
         """
         pass
+
+    async def rank_items(self, query: str, items: list[tuple[str, str]]) -> list[tuple[str, float]]:
+        """
+        Rank (id, passage) items based on the relevance of their passages to the query.
+
+        Identical passages are scored once and their score is shared by every item that
+        carries them, so duplicates cost no extra reranker work.
+
+        Args:
+            query (str): The query string.
+            items (list[tuple[str, str]]): A list of (id, passage) tuples to rank.
+
+        Returns:
+            list[tuple[str, float]]: A list of (id, score) tuples, one per item,
+                                     sorted in descending order of relevance.
+        """
+        if not items:
+            return []
+
+        passage_ids: dict[str, list[str]] = {}
+        for id, passage in items:
+            passage_ids.setdefault(passage, []).append(id)
+
+        ranked_passages = await self.rank(query, list(passage_ids))
+
+        return [(id, score) for passage, score in ranked_passages for id in passage_ids[passage]]
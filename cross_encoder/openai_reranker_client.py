@@ -14,6 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import json
 import logging
 from typing import Any
 
@@ -29,6 +30,7 @@ from .client import CrossEncoderClient
 logger = logging.getLogger(__name__)
 
 DEFAULT_MODEL = 'gpt-4o-mini'
+DEFAULT_LISTWISE_CHUNK_SIZE = 10
 
 
 class OpenAIRerankerClient(CrossEncoderClient):
@@ -36,21 +38,36 @@ class OpenAIRerankerClient(CrossEncoderClient):
         self,
         config: LLMConfig | None = None,
         client: AsyncOpenAI | AsyncAzureOpenAI | OpenAIClient | None = None,
+        listwise: bool = False,
+        chunk_size: int = DEFAULT_LISTWISE_CHUNK_SIZE,
+        max_concurrency: int | None = None,
     ):
         """
         Initialize the OpenAIRerankerClient with the provided configuration and client.
 
-        This reranker uses the OpenAI API to run a simple boolean classifier prompt concurrently
-        for each passage. Log-probabilities are used to rank the passages.
+        By default this reranker uses the OpenAI API to run a simple boolean classifier prompt
+        concurrently for each passage, and log-probabilities are used to rank the passages.
+        In listwise mode the passages are split into chunks and each chunk is scored by a
+        single request that returns a relevance score per passage, so the number of requests
+        scales with the number of chunks instead of the number of passages.
 
         Args:
             config (LLMConfig | None): The configuration for the LLM client, including API key, model, base URL, temperature, and max tokens.
             client (AsyncOpenAI | AsyncAzureOpenAI | OpenAIClient | None): An optional async client instance to use. If not provided, a new AsyncOpenAI client is created.
+            listwise (bool): Score chunks of passages per request instead of one passage per request.
+            chunk_size (int): Number of passages scored by one listwise request.
+            max_concurrency (int | None): Maximum number of requests in flight. Defaults to SEMAPHORE_LIMIT.
         """
         if config is None:
             config = LLMConfig()
+        if chunk_size <= 0:
+            raise ValueError('chunk_size must be a positive integer')
 
         self.config = config
+        self.model_name = DEFAULT_MODEL
+        self.listwise = listwise
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
         if client is None:
             self.client = AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
         elif isinstance(client, OpenAIClient):
@@ -59,6 +76,11 @@ class OpenAIRerankerClient(CrossEncoderClient):
             self.client = client
 
     async def rank(self, query: str, passages: list[str]) -> list[tuple[str, float]]:
+        if not passages:
+            return []
+        if self.listwise:
+            return await self._rank_listwise(query, passages)
+
         openai_messages_list: Any = [
             [
                 Message(
@@ -84,7 +106,7 @@ class OpenAIRerankerClient(CrossEncoderClient):
             responses = await semaphore_gather(
                 *[
                     self.client.chat.completions.create(
-                        model=DEFAULT_MODEL,
+                        model=self.model_name,
                         messages=openai_messages,
                         temperature=0,
                         max_tokens=1,
@@ -93,7 +115,8 @@ class OpenAIRerankerClient(CrossEncoderClient):
                         top_logprobs=2,
                     )
                     for openai_messages in openai_messages_list
-                ]
+                ],
+                max_coroutines=self.max_concurrency,
             )
 
             responses_top_logprobs = [
@@ -106,6 +129,7 @@ class OpenAIRerankerClient(CrossEncoderClient):
             scores: list[float] = []
             for top_logprobs in responses_top_logprobs:
                 if len(top_logprobs) == 0:
+                    scores.append(0.0)
                     continue
                 norm_logprobs = np.exp(top_logprobs[0].logprob)
                 if top_logprobs[0].token.strip().split(' ')[0].lower() == 'true':
@@ -121,3 +145,78 @@ class OpenAIRerankerClient(CrossEncoderClient):
         except Exception as e:
             logger.error(f'Error in generating LLM response: {e}')
             raise
+
+    async def _rank_listwise(self, query: str, passages: list[str]) -> list[tuple[str, float]]:
+        chunks = [
+            passages[i : i + self.chunk_size] for i in range(0, len(passages), self.chunk_size)
+        ]
+        try:
+            chunk_scores = await semaphore_gather(
+                *[self._score_chunk(query, chunk) for chunk in chunks],
+                max_coroutines=self.max_concurrency,
+            )
+        except openai.RateLimitError as e:
+            raise RateLimitError from e
+        except Exception as e:
+            logger.error(f'Error in generating LLM response: {e}')
+            raise
+
+        results = [
+            (passage, score)
+            for chunk, scores in zip(chunks, chunk_scores, strict=True)
+            for passage, score in zip(chunk, scores, strict=True)
+        ]
+        results.sort(reverse=True, key=lambda x: x[1])
+        return results
+
+    async def _score_chunk(self, query: str, passages: list[str]) -> list[float]:
+        passages_text = '\n'.join(
+            f'<PASSAGE id="{i}">\n{passage}\n</PASSAGE>' for i, passage in enumerate(passages)
+        )
+        messages: Any = [
+            Message(
+                role='system',
+                content='You are an expert tasked with judging how relevant each passage is to the query',
+            ),
+            Message(
+                role='user',
+                content=f"""
+                       Rate how relevant each PASSAGE is to QUERY on a scale from 0 (irrelevant) to 100 (directly answers it).
+                       Respond with a JSON object of the form {{"scores": [{{"id": 0, "score": 87}}, ...]}} containing every passage id.
+                       {passages_text}
+                       <QUERY>
+                       {query}
+                       </QUERY>
+                       """,
+            ),
+        ]
+        response = await self.client.chat.completions.create(
+            model=self.model_name,
+            messages=messages,
+            temperature=0,
+            max_tokens=16 * len(passages) + 16,
+            response_format={'type': 'json_object'},
+        )
+
+        return parse_listwise_scores(response.choices[0].message.content, len(passages))
+
+
+def parse_listwise_scores(content: str | None, passage_count: int) -> list[float]:
+    # passages the model skipped or scored with something unparseable rank last
+    scores = [0.0] * passage_count
+    try:
+        entries = json.loads(content or '{}').get('scores', [])
+    except (json.JSONDecodeError, AttributeError):
+        logger.warning(f'Could not parse listwise rerank response: {content}')
+        return scores
+
+    for entry in entries:
+        try:
+            index = int(entry['id'])
+            score = float(entry['score'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < passage_count:
+            scores[index] = min(max(score / 100, 0.0), 1.0)
+
+    return scores
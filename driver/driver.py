@@ -18,11 +18,30 @@ import copy
 import logging
 from abc import ABC, abstractmethod
 from collections.abc import Coroutine
+from contextvars import ContextVar
 from enum import Enum
+from time import monotonic
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Smallest transaction timeout handed to the database; a timeout of zero means "no timeout"
+MIN_QUERY_TIMEOUT = 0.01
+
+# Monotonic deadline of the current search. Set by deadline-aware callers and inherited by
+# every task they spawn, so drivers can bound each query without threading a parameter
+# through every search function.
+query_deadline: ContextVar[float | None] = ContextVar('query_deadline', default=None)
+
+
+def get_query_timeout() -> float | None:
+    # seconds left before the current deadline, or None when no deadline is set
+    deadline = query_deadline.get()
+    if deadline is None:
+        return None
+
+    return max(deadline - monotonic(), MIN_QUERY_TIMEOUT)
+
 
 class GraphProvider(Enum):
     NEO4J = 'neo4j'
@@ -19,10 +19,11 @@ import sys
 from collections.abc import Coroutine
 from typing import Any
 
-from neo4j import AsyncGraphDatabase, EagerResult
+from neo4j import AsyncGraphDatabase, EagerResult, Query
+from neo4j.exceptions import ClientError
 from typing_extensions import LiteralString
 
-from .driver import GraphDriver, GraphDriverSession, GraphProvider
+from .driver import GraphDriver, GraphDriverSession, GraphProvider, get_query_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -52,14 +53,22 @@ class Neo4jDriver(GraphDriver):
         # print(f"[Neo4jDriver] Database: {self._database}", file=sys.stderr)
         # print(f"[Neo4jDriver] Additional kwargs: {kwargs}", file=sys.stderr)
 
+        # inside a deadline-aware search, bound the transaction by the time that is left
+        query: LiteralString | Query = cypher_query_
+        timeout = get_query_timeout()
+        if timeout is not None:
+            query = Query(cypher_query_, timeout=timeout)
+
         try:
-            result = await self.client.execute_query(cypher_query_, parameters_=params, **kwargs)
+            result = await self.client.execute_query(query, parameters_=params, **kwargs)
             # print(f"[Neo4jDriver] Query executed successfully", file=sys.stderr)
             # print(f"[Neo4jDriver] Result type: {type(result)}", file=sys.stderr)
             # if hasattr(result, '__len__'):
                 # print(f"[Neo4jDriver] Result length: {len(result)}", file=sys.stderr)
             return result
         except Exception as e:
+            if isinstance(e, ClientError) and timeout is not None and 'TransactionTimedOut' in (e.code or ''):
+                raise TimeoutError(f'Neo4j query exceeded the search deadline: {e}') from e
             error_msg = f'Error executing Neo4j query: {e}\nQuery: {cypher_query_}\nParams: {params}'
             # print(f"[Neo4jDriver] {error_msg}", file=sys.stderr)
             # print(f"[Neo4jDriver] Exception type: {type(e).__name__}", file=sys.stderr)
@@ -27,7 +27,7 @@ from typing_extensions import LiteralString
 from driver.driver import GraphDriver
 from embedder import EmbedderClient
 from errors import EdgeNotFoundError, GroupsEdgesNotFoundError
-from helpers import parse_db_date
+from helpers import parse_db_date, record_to_dict
 from models.edges.edge_db_queries import (
     # COMMUNITY_EDGE_RETURN,
     # ENTITY_EDGE_RETURN,
@@ -37,7 +37,7 @@ from models.edges.edge_db_queries import (
     # get_community_edge_save_query,
     # get_entity_edge_save_query,
 )
-from nodes import Node
+from nodes import DEFAULT_EMBEDDING_BATCH_SIZE, Node
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +101,18 @@ class SemanticEdge(Edge):
     source: str = Field(description='source of the relationship', default='PubMed')
     relationship: str = Field(description='relationship type of the edge')
     evaluate: datetime | None = Field(description='datetime of when the relationship was evaluated')
+    summary_embedding: list[float] | None = Field(default=None, description='embedding of the summary')
+
+    async def generate_embedding(self, embedder: EmbedderClient):
+        start = time()
+
+        text = self.summary.replace('\n', ' ')
+        self.summary_embedding = await embedder.create(input_data=[text])
+
+        end = time()
+        logger.debug(f'embedded {text} in {end - start} ms')
+
+        return self.summary_embedding
 
     async def save(self, driver: GraphDriver):
         result = await driver.execute_query(
@@ -458,6 +470,7 @@ class SemanticEdge(Edge):
 
 # Edge helpers
 def get_semantic_edge_from_record(record: Any) -> SemanticEdge:
+    record = record_to_dict(record)
     return SemanticEdge(
         id=record['id'],
         source_node_id=record['source_node_id'],
@@ -520,3 +533,118 @@ def get_semantic_edge_from_record(record: Any) -> SemanticEdge:
 #     fact_embeddings = await embedder.create_batch([edge.fact for edge in edges])
 #     for edge, fact_embedding in zip(edges, fact_embeddings, strict=True):
 #         edge.fact_embedding = fact_embedding
+
+
+async def create_semantic_edge_embeddings(embedder: EmbedderClient, edges: list[SemanticEdge]):
+    if len(edges) == 0:
+        return
+    summary_embeddings = await embedder.create_batch(
+        [edge.summary.replace('\n', ' ') for edge in edges]
+    )
+    for edge, summary_embedding in zip(edges, summary_embeddings, strict=True):
+        edge.summary_embedding = summary_embedding
+
+
+async def build_semantic_edge_embeddings(
+    driver: GraphDriver,
+    embedder: EmbedderClient,
+    batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+    max_edges: int | None = None,
+) -> int:
+    """
+    Embed the summaries of Cooccur edges that do not have a summary_embedding yet.
+
+    Edges are paged in (source id, target id) order with a cursor, so the backfill is a
+    single pass over the graph instead of rescanning the edges that are already embedded.
+    Every page holds at most batch_size edges, embedded with one create_batch call and
+    written back with db.create.setRelationshipVectorProperty, so memory and embedding
+    request size stay bounded however large the graph is: a hub whose pending edges do
+    not fit in one page is continued from its last target id on the next one. Saving an
+    edge replaces its properties and drops the embedding, so running this again after an
+    import re-embeds exactly the new and updated edges. The semantic_rels_embeddings
+    vector index picks the embeddings up as they are written. Returns the number of edges
+    embedded.
+    """
+    embedded = 0
+    # '' sorts before every id; the cursor predicates stay plain range comparisons so the
+    # id indexes serve both the seek and the ordering
+    source_id = ''
+    target_id: str | None = None
+    while max_edges is None or embedded < max_edges:
+        if target_id is None:
+            # the next source nodes, each with its first pending edges (or a null row)
+            records, _, _ = await driver.execute_query(
+                """
+                MATCH (n:Vocabulary)
+                WHERE n.id > $source_id
+                WITH n
+                ORDER BY n.id
+                LIMIT $batch_size
+                CALL {
+                    WITH n
+                    OPTIONAL MATCH (n)-[e:Cooccur]->(m:Vocabulary)
+                    WHERE e.summary_embedding IS NULL AND e.summary IS NOT NULL AND e.summary <> ''
+                    RETURN e, m
+                    ORDER BY m.id
+                    LIMIT $batch_size
+                }
+                RETURN n.id AS source_id, m.id AS target_id, elementId(e) AS id, e.summary AS summary
+                LIMIT $batch_size
+                """,
+                source_id=source_id,
+                batch_size=batch_size,
+                routing_='r',
+            )
+        else:
+            # the rest of a source node whose pending edges did not fit in the previous page
+            records, _, _ = await driver.execute_query(
+                """
+                MATCH (n:Vocabulary {id: $source_id})-[e:Cooccur]->(m:Vocabulary)
+                WHERE m.id > $target_id
+                AND e.summary_embedding IS NULL AND e.summary IS NOT NULL AND e.summary <> ''
+                RETURN n.id AS source_id, m.id AS target_id, elementId(e) AS id, e.summary AS summary
+                ORDER BY m.id
+                LIMIT $batch_size
+                """,
+                source_id=source_id,
+                target_id=target_id,
+                batch_size=batch_size,
+                routing_='r',
+            )
+        if len(records) == 0:
+            if target_id is None:
+                break
+            target_id = None
+            continue
+
+        last_record = records[-1]
+        source_id = last_record['source_id']
+        # a full page may have cut the last source node short, so resume inside it
+        target_id = last_record['target_id'] if len(records) == batch_size else None
+
+        edges = [record for record in records if record['id'] is not None]
+        if max_edges is not None:
+            edges = edges[: max_edges - embedded]
+        if not edges:
+            continue
+
+        embeddings = await embedder.create_batch(
+            [record['summary'].replace('\n', ' ') for record in edges]
+        )
+        await driver.execute_query(
+            """
+            UNWIND $edges AS edge
+            MATCH ()-[e:Cooccur]->()
+            WHERE elementId(e) = edge.id
+            CALL db.create.setRelationshipVectorProperty(e, 'summary_embedding', edge.embedding)
+            """,
+            edges=[
+                {'id': record['id'], 'embedding': embedding}
+                for record, embedding in zip(edges, embeddings, strict=True)
+            ],
+        )
+
+        embedded += len(edges)
+        logger.debug(f'Embedded {embedded} edge summaries')
+
+    return embedded
@@ -1,7 +1,9 @@
+from .cache import CachedEmbedder
 from .client import EmbedderClient
 from .openai import OpenAIEmbedder, OpenAIEmbedderConfig
 
 __all__ = [
+    'CachedEmbedder',
     'EmbedderClient',
     'OpenAIEmbedder',
     'OpenAIEmbedderConfig',
@@ -0,0 +1,107 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import logging
+import unicodedata
+from collections.abc import Iterable
+from functools import partial
+from typing import Any
+
+from helpers import CoalescingLRUCache
+from .client import EmbedderClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_CACHE_SIZE = 4096
+DEFAULT_EMBEDDING_CACHE_TTL = 24 * 60 * 60
+
+
+def normalize_embedding_text(text: str) -> str:
+    # Collapse unicode variants and whitespace so trivially different queries share an entry
+    return ' '.join(unicodedata.normalize('NFKC', text).split())
+
+
+class CachedEmbedder(EmbedderClient):
+    """
+    Embedder client that keeps query embeddings in a bounded LRU + TTL cache.
+
+    Wraps another EmbedderClient and sits in front of create / create_batch. Entries are
+    keyed by the embedding model and the normalized input text, so repeated queries skip
+    the embedding round trip. When cache_dir is set, embeddings are also persisted on disk
+    and survive restarts.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbedderClient,
+        max_size: int = DEFAULT_EMBEDDING_CACHE_SIZE,
+        ttl: float | None = DEFAULT_EMBEDDING_CACHE_TTL,
+        cache_dir: str | None = None,
+    ):
+        self.embedder = embedder
+        self.model = get_embedding_model_name(embedder)
+        # concurrent requests for the same text share a single embedding call
+        self.cache = CoalescingLRUCache(max_size=max_size, ttl=ttl, cache_dir=cache_dir)
+
+    def _get_cache_key(self, text: str) -> str:
+        key_str = f'{self.model}:{text}'
+        return hashlib.md5(key_str.encode()).hexdigest()
+
+    async def create(
+        self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
+    ) -> list[float]:
+        if isinstance(input_data, str):
+            text = input_data
+        elif isinstance(input_data, list) and len(input_data) == 1 and isinstance(input_data[0], str):
+            text = input_data[0]
+        else:
+            # Token inputs and multi-string inputs are not cached
+            return await self.embedder.create(input_data=input_data)
+
+        text = normalize_embedding_text(text)
+        return await self.cache.get_or_create(
+            self._get_cache_key(text), partial(self.embedder.create, input_data=[text])
+        )
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        texts = [normalize_embedding_text(text) for text in input_data_list]
+        keys = [self._get_cache_key(text) for text in texts]
+
+        embeddings = await self.cache.get_or_create_many(
+            keys, partial(self._create_batch, dict(zip(keys, texts, strict=True)))
+        )
+        return [embeddings[key] for key in keys]
+
+    async def _create_batch(
+        self, texts: dict[str, str], keys: list[str]
+    ) -> dict[str, list[float]]:
+        embeddings = await self.embedder.create_batch([texts[key] for key in keys])
+        return dict(zip(keys, embeddings, strict=True))
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {'model': self.model, **self.cache.stats()}
+
+
+def get_embedding_model_name(embedder: EmbedderClient) -> str:
+    config = getattr(embedder, 'config', None)
+    model = getattr(config, 'embedding_model', None) or type(embedder).__name__
+    embedding_dim = getattr(config, 'embedding_dim', None)
+
+    return f'{model}:{embedding_dim}' if embedding_dim is not None else str(model)
@@ -15,6 +15,7 @@ limitations under the License.
 """
 
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
 from time import time
 from dotenv import load_dotenv
@@ -22,6 +23,7 @@ from pydantic import BaseModel, ConfigDict
 from typing_extensions import LiteralString
 from graphagent_client import GraphAgentClients
 
+from cross_encoder.cache import CachedCrossEncoder
 from cross_encoder.client import CrossEncoderClient
 from cross_encoder.openai_reranker_client import OpenAIRerankerClient
 from driver.driver import GraphDriver
@@ -29,8 +31,9 @@ from driver.neo4j_driver import Neo4jDriver
 from edges import (
     SemanticEdge,
     Edge,
+    build_semantic_edge_embeddings,
 )
-from embedder import EmbedderClient, OpenAIEmbedder
+from embedder import CachedEmbedder, EmbedderClient, OpenAIEmbedder
 from helpers import (
     # get_default_group_id,
     semaphore_gather,
@@ -38,14 +41,25 @@ from helpers import (
     # validate_group_id,
 )
 from llm_client import LLMClient, OpenAIClient
+from models.nodes.node_db_queries import NodeProjection
 from nodes import (
+    DEFAULT_EMBEDDING_BATCH_SIZE,
     VocabularyNode,
     ArticleNode,
     SentenceNode,
     Node,
+    build_sentence_embeddings,
     create_vocabulary_node_embeddings,
 )
-from search.search import SearchConfig, search, vocabulary_search
+from search.search import (
+    SearchConfig,
+    search,
+    search_many,
+    search_stream,
+    vocabulary_search,
+    vocabulary_search_many,
+)
+from search.search_cache import SearchResultCache
 from search.search_config import DEFAULT_SEARCH_LIMIT, SearchResults
 from search.search_config_recipes import (
     COMBINED_HYBRID_SEARCH_CROSS_ENCODER,
@@ -58,7 +72,10 @@ from search.search_config_recipes import (
 )
 from search.search_filters import SearchFilters
 from search.search_utils import (
+    ARTICLE_CHANNEL,
+    EDGE_CHANNEL,
     RELEVANT_SCHEMA_LIMIT,
+    SENTENCE_CHANNEL,
     # get_edge_invalidation_candidates,
     # get_mentioned_nodes,
     # get_relevant_edges,
@@ -115,6 +132,10 @@ class GraphAgent:
         graph_driver: GraphDriver | None = None,
         max_coroutines: int | None = None,
         ensure_ascii: bool = False,
+        cache_embeddings: bool = True,
+        cache_reranker_scores: bool = True,
+        cache_search_results: bool = True,
+        search_cache: SearchResultCache | None = None,
     ):
         """
         Initialize a Graphiti instance.
@@ -151,6 +172,18 @@ class GraphAgent:
             Whether to escape non-ASCII characters in JSON serialization for prompts. Defaults to False.
             Set as False to preserve non-ASCII characters (e.g., Korean, Japanese, Chinese) in their
             original form, making them readable in LLM logs and improving model understanding.
+        cache_embeddings : bool, optional
+            Whether to wrap the embedder in a CachedEmbedder so repeated queries skip the embedding
+            round trip. Defaults to True.
+        cache_reranker_scores : bool, optional
+            Whether to wrap the cross encoder in a CachedCrossEncoder so (query, passage) pairs that
+            were already scored are not sent to the reranker again. Defaults to True.
+        cache_search_results : bool, optional
+            Whether to cache whole search results, keyed by query, config, filters and center
+            node. Defaults to True. Call invalidate_search_cache after writing to the graph.
+        search_cache : SearchResultCache | None, optional
+            The cache to use when cache_search_results is set. If not provided, a default
+            SearchResultCache is created.
 
         Returns
         -------
@@ -189,10 +222,18 @@ class GraphAgent:
             self.embedder = embedder
         else:
             self.embedder = OpenAIEmbedder()
+        if cache_embeddings and not isinstance(self.embedder, CachedEmbedder):
+            self.embedder = CachedEmbedder(self.embedder)
         if cross_encoder:
             self.cross_encoder = cross_encoder
         else:
             self.cross_encoder = OpenAIRerankerClient()
+        if cache_reranker_scores and not isinstance(self.cross_encoder, CachedCrossEncoder):
+            self.cross_encoder = CachedCrossEncoder(self.cross_encoder)
+
+        self.search_cache = None
+        if cache_search_results:
+            self.search_cache = search_cache if search_cache is not None else SearchResultCache()
 
         self.clients = GraphAgentClients(
             driver=self.driver,
@@ -200,6 +241,7 @@ class GraphAgent:
             embedder=self.embedder,
             cross_encoder=self.cross_encoder,
             ensure_ascii=self.ensure_ascii,
+            search_cache=self.search_cache,
         )
 
         # Capture telemetry event
@@ -256,6 +298,48 @@ class GraphAgent:
         """
         await self.driver.close()
 
+    def invalidate_search_cache(self):
+        """
+        Drop every cached search result.
+
+        Ingestion jobs should call this after writing to the graph so later searches see the
+        new data instead of results cached before the write.
+        """
+        if self.search_cache is not None:
+            self.search_cache.invalidate()
+
+    def search_cache_stats(self) -> dict:
+        return self.search_cache.stats() if self.search_cache is not None else {}
+
+    def reranker_cache_stats(self) -> dict:
+        return self.cross_encoder.stats() if isinstance(self.cross_encoder, CachedCrossEncoder) else {}
+
+    async def build_edge_embeddings(self, batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE) -> int:
+        """
+        Embed the summaries of edges that are missing a summary embedding, in batches.
+
+        Run this after importing or updating edges so edge cosine similarity search covers
+        them. Returns the number of edges embedded.
+        """
+        embedded = await build_semantic_edge_embeddings(self.driver, self.embedder, batch_size)
+        if embedded > 0:
+            self.invalidate_search_cache()
+
+        return embedded
+
+    async def build_sentence_embeddings(self, batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE) -> int:
+        """
+        Backfill embeddings for sentences that are missing one, in batches.
+
+        Run this after importing sentences so the sentence vector channel covers them.
+        Returns the number of sentences embedded.
+        """
+        embedded = await build_sentence_embeddings(self.driver, self.embedder, batch_size)
+        if embedded > 0:
+            self.invalidate_search_cache()
+
+        return embedded
+
     async def search(
         self,
         query: str,
@@ -263,6 +347,7 @@ class GraphAgent:
         group_ids: list[str] | None = None,
         num_results=DEFAULT_SEARCH_LIMIT,
         search_filter: SearchFilters | None = None,
+        budget_ms: float | None = None,
     ) -> tuple[list[dict], list[dict]]:
         """
         Perform a hybrid search on the knowledge graph.
@@ -283,6 +368,10 @@ class GraphAgent:
         #     The graph partitions to return data from.
         num_results : int, optional
             The maximum number of results to return. Defaults to 10.
+        budget_ms : float, optional
+            Latency budget in milliseconds. Channels that have not finished by then are
+            dropped and the remaining results are returned; search_() reports them through
+            SearchResults.degraded and timed_out_channels.
 
         Returns
         -------
@@ -300,7 +389,6 @@ class GraphAgent:
         search_config = (
             COMBINED_HYBRID_SEARCH_RRF if center_node_uuid is None else COMBINED_HYBRID_SEARCH_NODE_DISTANCE
         )
-        search_config.limit = num_results
 
         group_ids = None
 
@@ -311,24 +399,93 @@ class GraphAgent:
                 search_config,
                 search_filter if search_filter is not None else SearchFilters(),
                 center_node_uuid,
+                limit=num_results,
+                budget_ms=budget_ms,
+            )
+
+        return search_results_to_dicts(result)
+
+    async def search_many(
+        self,
+        queries: list[str],
+        center_node_uuid: str | None = None,
+        group_ids: list[str] | None = None,
+        num_results=DEFAULT_SEARCH_LIMIT,
+        search_filter: SearchFilters | None = None,
+        budget_ms: float | None = None,
+    ) -> list[tuple[list[dict], list[dict], list[dict]]]:
+        """
+        Run search() for several queries at once.
+
+        All queries are embedded with one batched call and each fulltext index is queried
+        once for the whole batch, so N queries cost about one round trip per channel instead
+        of N. Returns one (edges, articles, sentences) tuple per query, in query order.
+        """
+        search_config = (
+            COMBINED_HYBRID_SEARCH_RRF if center_node_uuid is None else COMBINED_HYBRID_SEARCH_NODE_DISTANCE
+        )
+
+        group_ids = None
+
+        results = await search_many(
+            self.clients,
+            queries,
+            group_ids,
+            search_config,
+            search_filter if search_filter is not None else SearchFilters(),
+            center_node_uuid,
+            limit=num_results,
+            budget_ms=budget_ms,
+        )
+
+        return [search_results_to_dicts(result) for result in results]
+
+    async def search_stream(
+        self,
+        query: str,
+        center_node_uuid: str | None = None,
+        group_ids: list[str] | None = None,
+        num_results=DEFAULT_SEARCH_LIMIT,
+        search_filter: SearchFilters | None = None,
+        budget_ms: float | None = None,
+    ) -> AsyncIterator[tuple[str, list[dict], bool]]:
+        """
+        Streaming variant of search().
+
+        Yields (channel, results, timed_out) tuples as each channel ('edges', 'articles',
+        'sentences') finishes, so the fast channels can be shown before the slow ones are
+        reranked. With budget_ms, channels that miss the deadline are yielded with no
+        results and timed_out set.
+        """
+        search_config = (
+            COMBINED_HYBRID_SEARCH_RRF if center_node_uuid is None else COMBINED_HYBRID_SEARCH_NODE_DISTANCE
+        )
+
+        group_ids = None
+
+        async for channel_results in search_stream(
+            self.clients,
+            query,
+            group_ids,
+            search_config,
+            search_filter if search_filter is not None else SearchFilters(),
+            center_node_uuid,
+            limit=num_results,
+            budget_ms=budget_ms,
+        ):
+            edge_dicts, article_dicts, sentence_dicts = search_results_to_dicts(
+                channel_results.results
+            )
+            channel_dicts = {
+                EDGE_CHANNEL: edge_dicts,
+                ARTICLE_CHANNEL: article_dicts,
+                SENTENCE_CHANNEL: sentence_dicts,
+            }
+            yield (
+                channel_results.channel,
+                channel_dicts[channel_results.channel],
+                channel_results.results.degraded,
             )
-        edge_dicts = []
-        sentence_dicts = []
-        article_dicts = []
-        for edge, score in zip(result.edges, result.edge_reranker_scores):
-            edge_dict = dict(edge)
-            edge_dict['score'] = score
-            edge_dicts.append(edge_dict)
-        for sentence, score in zip(result.sentences, result.sentence_reranker_scores):
-            sentence_dict = dict(sentence)
-            sentence_dict['score'] = score
-            sentence_dicts.append(sentence_dict)
-        for article, score in zip(result.articles, result.article_reranker_scores):
-            article_dict = dict(article)
-            article_dict['score'] = score
-            article_dicts.append(article_dict)
-        
-        return edge_dicts, article_dicts, sentence_dicts
 
     async def search_(
         self,
@@ -337,6 +494,7 @@ class GraphAgent:
         group_ids: list[str] | None = None,
         num_results=DEFAULT_SEARCH_LIMIT,
         search_filter: SearchFilters | None = None,
+        budget_ms: float | None = None,
     ) -> SearchResults:
         """
         Advanced search method that returns Graph objects (nodes and edges) rather
@@ -348,7 +506,6 @@ class GraphAgent:
         search_config = (
             COMBINED_HYBRID_SEARCH_RRF if center_node_uuid is None else COMBINED_HYBRID_SEARCH_NODE_DISTANCE
         )
-        search_config.limit = num_results
 
         group_ids = None
 
@@ -359,6 +516,8 @@ class GraphAgent:
                 search_config,
                 search_filter if search_filter is not None else SearchFilters(),
                 center_node_uuid,
+                limit=num_results,
+                budget_ms=budget_ms,
             )
         
         return result
@@ -374,7 +533,6 @@ class GraphAgent:
         search_config = (
             NODE_HYBRID_SEARCH_RRF if center_node_uuid is None else NODE_HYBRID_SEARCH_MMR
         )
-        search_config.limit = num_results
 
         group_ids = None
 
@@ -385,19 +543,43 @@ class GraphAgent:
                 search_config,
                 search_filter if search_filter is not None else SearchFilters(),
                 center_node_uuid,
+                limit=num_results,
             )
-        vocabulary_dicts = []
-        for node, score in zip(result.nodes, result.node_reranker_scores):
-            vocabulary_dict = dict(node)
-            if 'embedding' in vocabulary_dict:
-                del vocabulary_dict['embedding']
-            vocabulary_dict['score'] = score
-            vocabulary_dicts.append(vocabulary_dict)
-        
-        return vocabulary_dicts
+
+        return vocabulary_results_to_dicts(result)
+
+    async def search_vocabulary_many(
+        self,
+        queries: list[str],
+        center_node_uuid: str | None = None,
+        group_ids: list[str] | None = None,
+        num_results=DEFAULT_SEARCH_LIMIT,
+        search_filter: SearchFilters | None = None,
+    ) -> list[list[dict]]:
+        """
+        Run search_vocabulary() for several queries with one batched embedding call and one
+        fulltext statement. Returns one list of vocabulary dicts per query, in query order.
+        """
+        search_config = (
+            NODE_HYBRID_SEARCH_RRF if center_node_uuid is None else NODE_HYBRID_SEARCH_MMR
+        )
+
+        group_ids = None
+
+        results = await vocabulary_search_many(
+            self.clients,
+            queries,
+            group_ids,
+            search_config,
+            search_filter if search_filter is not None else SearchFilters(),
+            center_node_uuid,
+            limit=num_results,
+        )
+
+        return [vocabulary_results_to_dicts(result) for result in results]
     
     async def get_article_by_id(self, id: str) -> ArticleNode:
-        result = await ArticleNode.get_by_id(self.driver, id)
+        result = await ArticleNode.get_by_id(self.driver, id, NodeProjection.lean)
         if 'embedding' in result:
             del result['embedding']
         if 'openai_embedding' in result:
@@ -405,7 +587,7 @@ class GraphAgent:
         return result
     
     async def get_article_by_pubmedid(self, pubmedid: str) -> ArticleNode:
-        result = await ArticleNode.get_by_pubmedid(self.driver, pubmedid)
+        result = await ArticleNode.get_by_pubmedid(self.driver, pubmedid, NodeProjection.lean)
         result = dict(result)
         if 'embedding' in result:
             del result['embedding']
@@ -414,7 +596,7 @@ class GraphAgent:
         return result
     
     async def get_article_by_ids(self, ids: list[str]) -> list[ArticleNode]:
-        results = await ArticleNode.get_by_ids(self.driver, ids)
+        results = await ArticleNode.get_by_ids(self.driver, ids, NodeProjection.lean)
         results = [dict(result) for result in results]
         for result in results:
             if 'embedding' in result:
@@ -424,7 +606,7 @@ class GraphAgent:
         return results
     
     async def get_article_by_pubmedids(self, pubmedids: list[str]) -> list[ArticleNode]:
-        results = await ArticleNode.get_by_pubmedids(self.driver, pubmedids)
+        results = await ArticleNode.get_by_pubmedids(self.driver, pubmedids, NodeProjection.lean)
         results = [dict(result) for result in results]
         for result in results:
             if 'embedding' in result:
@@ -434,7 +616,9 @@ class GraphAgent:
         return results
     
     async def get_article_by_vocabulary_ids(self, vocabulary_ids: list[str]) -> list[ArticleNode]:
-        results = await ArticleNode.get_by_vocabulary_ids(self.driver, vocabulary_ids)
+        results = await ArticleNode.get_by_vocabulary_ids(
+            self.driver, vocabulary_ids, projection=NodeProjection.lean
+        )
         results = [dict(result) for result in results]
         for result in results:
             if 'embedding' in result:
@@ -468,16 +652,50 @@ class GraphAgent:
         return results
     
     async def get_vocabulary_by_id(self, id: str) -> VocabularyNode:
-        result = await VocabularyNode.get_by_id(self.driver, id)
+        result = await VocabularyNode.get_by_id(self.driver, id, NodeProjection.lean)
         result = dict(result)
         if 'embedding' in result:
             del result['embedding']
         return result
     
     async def get_vocabulary_by_ids(self, ids: list[str]) -> list[VocabularyNode]:
-        results = await VocabularyNode.get_by_ids(self.driver, ids)
+        results = await VocabularyNode.get_by_ids(self.driver, ids, NodeProjection.lean)
         results = [dict(result) for result in results]
         for result in results:
             if 'embedding' in result:
                 del result['embedding']
-        return results
\ No newline at end of file
+        return results
+
+
+def search_results_to_dicts(result: SearchResults) -> tuple[list[dict], list[dict], list[dict]]:
+    edge_dicts = []
+    sentence_dicts = []
+    article_dicts = []
+    for edge, score in zip(result.edges, result.edge_reranker_scores):
+        edge_dict = dict(edge)
+        edge_dict.pop('summary_embedding', None)
+        edge_dict['score'] = score
+        edge_dicts.append(edge_dict)
+    for sentence, score in zip(result.sentences, result.sentence_reranker_scores):
+        sentence_dict = dict(sentence)
+        sentence_dict.pop('embedding', None)
+        sentence_dict['score'] = score
+        sentence_dicts.append(sentence_dict)
+    for article, score in zip(result.articles, result.article_reranker_scores):
+        article_dict = dict(article)
+        article_dict['score'] = score
+        article_dicts.append(article_dict)
+
+    return edge_dicts, article_dicts, sentence_dicts
+
+
+def vocabulary_results_to_dicts(result: SearchResults) -> list[dict]:
+    vocabulary_dicts = []
+    for node, score in zip(result.nodes, result.node_reranker_scores):
+        vocabulary_dict = dict(node)
+        if 'embedding' in vocabulary_dict:
+            del vocabulary_dict['embedding']
+        vocabulary_dict['score'] = score
+        vocabulary_dicts.append(vocabulary_dict)
+
+    return vocabulary_dicts
@@ -8,6 +8,7 @@ supporting index creation, fulltext search, and bulk operations.
 from typing_extensions import LiteralString
 
 from driver.driver import GraphProvider
+from embedder.client import EMBEDDING_DIM
 
 
 # def get_range_indices(provider: GraphProvider) -> list[LiteralString]:
@@ -50,6 +51,20 @@ from driver.driver import GraphProvider
 #     ]
 
 
+def get_vector_indices(embedding_dim: int = EMBEDDING_DIM) -> list[LiteralString]:
+    return [
+        f"""CREATE VECTOR INDEX vocabulary_embeddings IF NOT EXISTS
+        FOR (n:Vocabulary) ON (n.embedding)
+        OPTIONS {{indexConfig: {{`vector.dimensions`: {embedding_dim}, `vector.similarity_function`: 'cosine'}}}}""",
+        f"""CREATE VECTOR INDEX semantic_rels_embeddings IF NOT EXISTS
+        FOR ()-[e:Cooccur]-() ON (e.summary_embedding)
+        OPTIONS {{indexConfig: {{`vector.dimensions`: {embedding_dim}, `vector.similarity_function`: 'cosine'}}}}""",
+        f"""CREATE VECTOR INDEX sentence_embeddings IF NOT EXISTS
+        FOR (n:Sentence) ON (n.embedding)
+        OPTIONS {{indexConfig: {{`vector.dimensions`: {embedding_dim}, `vector.similarity_function`: 'cosine'}}}}""",
+    ]
+
+
 def get_nodes_query(provider: GraphProvider, name: str = '', query: str | None = None) -> str:
     return f'CALL db.index.fulltext.queryNodes("{name}", {query}, {{limit: $limit}})'
 
@@ -57,8 +72,13 @@ def get_nodes_query(provider: GraphProvider, name: str = '', query: str | None =
 def get_vector_cosine_func_query(vec1, vec2) -> str:
     return f'vector.similarity.cosine({vec1}, {vec2})'
 
-def get_nodes_similarity_query(name: str = '', query_vector: list[float] | None = None, limit: int = 10) -> str:
-    return f"CALL db.index.vector.queryNodes('{name}', {limit}, {query_vector})"
+def get_nodes_similarity_query(name: str = '') -> str:
+    # the vector and k are always passed as parameters so the query text, and therefore the
+    # cached plan, is the same for every search against an index
+    return f"CALL db.index.vector.queryNodes('{name}', $k, $search_vector)"
+
+def get_relationships_similarity_query(name: str = '') -> str:
+    return f"CALL db.index.vector.queryRelationships('{name}', $k, $search_vector)"
 
-def get_relationships_query(name: str) -> str:
-    return f'CALL db.index.fulltext.queryRelationships("{name}", $query, {{limit: $limit}})'
+def get_relationships_query(name: str, query: str = '$query') -> str:
+    return f'CALL db.index.fulltext.queryRelationships("{name}", {query}, {{limit: $limit}})'
@@ -3,6 +3,7 @@ from driver.driver import GraphDriver
 from llm_client import LLMClient
 from embedder import EmbedderClient
 from cross_encoder.client import CrossEncoderClient
+from search.search_cache import SearchResultCache
 
 class GraphAgentClients(BaseModel):
     driver: GraphDriver
@@ -10,5 +11,6 @@ class GraphAgentClients(BaseModel):
     embedder: EmbedderClient
     cross_encoder: CrossEncoderClient
     ensure_ascii: bool = False
+    search_cache: SearchResultCache | None = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
\ No newline at end of file
@@ -15,13 +15,18 @@ limitations under the License.
 """
 
 import asyncio
+import contextvars
 import os
 import re
-from collections.abc import Coroutine
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Coroutine, Hashable
 from datetime import datetime
+from functools import partial
+from time import monotonic
 from typing import Any
 
 import numpy as np
+from diskcache import Cache
 from dotenv import load_dotenv
 from neo4j import time as neo4j_time
 from numpy._typing import NDArray
@@ -64,6 +69,9 @@ def get_default_group_id(provider: GraphProvider) -> str:
         return ''
 
 
+LUCENE_OPERATOR_PATTERN = re.compile(r'\b(?:AND|OR|NOT|TO)\b')
+
+
 def lucene_sanitize(query: str) -> str:
     # Escape special characters from a query before passing into Lucene
     # + - && || ! ( ) { } [ ] ^ " ~ * ? : \ /
@@ -88,17 +96,23 @@ def lucene_sanitize(query: str) -> str:
             ':': r'\:',
             '\\': r'\\',
             '/': r'\/',
-            'O': r'\O',
-            'R': r'\R',
-            'N': r'\N',
-            'T': r'\T',
-            'A': r'\A',
-            'D': r'\D',
         }
     )
 
     sanitized = query.translate(escape_map)
-    return sanitized
+    # Boolean operators are words rather than characters; lowercasing them keeps the words
+    # searchable without escaping every capital letter (which mangles gene symbols like TNF)
+    return LUCENE_OPERATOR_PATTERN.sub(lambda match: match.group(0).lower(), sanitized)
+
+
+def record_to_dict(record: Any) -> dict[str, Any]:
+    # neo4j.Record resolves every key lookup with a linear scan over its keys; pairing keys
+    # and values once is roughly twice as fast as reading a dozen fields off the record
+    if isinstance(record, dict):
+        return record
+    if isinstance(record, tuple):
+        return dict(zip(record.keys(), record, strict=True))
+    return dict(record)
 
 
 def normalize_l2(embedding: list[float]) -> NDArray:
@@ -121,6 +135,177 @@ async def semaphore_gather(
     return await asyncio.gather(*(_wrap_coroutine(coroutine) for coroutine in coroutines))
 
 
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded in-memory LRU cache with an optional per-entry time to live.
+
+    Entries are evicted least-recently-used first once max_size is reached, and lazily
+    on lookup once they are older than ttl seconds. Hits and misses are counted so
+    callers can report hit ratios.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float | None = None):
+        if max_size <= 0:
+            raise ValueError('max_size must be a positive integer')
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        return value
+
+    def _get(self, key: Hashable, default: Any) -> Any:
+        # uncounted lookup, so subclasses can consult other tiers and count once
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        stored_at, value = entry
+        if self.ttl is not None and monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CoalescingLRUCache(LRUCache):
+    """
+    LRUCache optionally backed by an on-disk diskcache, that coalesces concurrent misses.
+
+    When cache_dir is set, entries are also persisted on disk with the same ttl and
+    survive restarts; a memory miss falls back to the disk and counts as a single hit or
+    miss. get_or_create_many() creates all missing values with one call, and keys already
+    being created for another caller are awaited instead of created again. Creation runs
+    as its own task in an empty context and every caller awaits it through a shield, so a
+    caller that is cancelled or times out never cancels the creation for the others.
+    """
+
+    def __init__(
+        self, max_size: int = 1024, ttl: float | None = None, cache_dir: str | None = None
+    ):
+        super().__init__(max_size=max_size, ttl=ttl)
+        self.disk_cache = Cache(cache_dir) if cache_dir is not None else None
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    def _get(self, key: Hashable, default: Any) -> Any:
+        value = super()._get(key, _MISSING)
+        if value is _MISSING and self.disk_cache is not None:
+            value = self.disk_cache.get(key, _MISSING)
+            if value is not _MISSING:
+                super().set(key, value)
+
+        return default if value is _MISSING else value
+
+    def set(self, key: Hashable, value: Any):
+        super().set(key, value)
+        if self.disk_cache is not None:
+            self.disk_cache.set(key, value, expire=self.ttl)
+
+    def clear(self):
+        super().clear()
+        if self.disk_cache is not None:
+            self.disk_cache.clear()
+
+    async def get_or_create(self, key: Hashable, create: Callable[[], Awaitable[Any]]) -> Any:
+        async def create_one(keys: list[Hashable]) -> dict[Hashable, Any]:
+            return {key: await create()}
+
+        return (await self.get_or_create_many([key], create_one)).get(key)
+
+    async def get_or_create_many(
+        self,
+        keys: list[Hashable],
+        create_many: Callable[[list[Hashable]], Awaitable[dict[Hashable, Any]]],
+    ) -> dict[Hashable, Any]:
+        # create_many receives the missing keys and returns the values it could create
+        values: dict[Hashable, Any] = {}
+        in_flight: dict[Hashable, asyncio.Task] = {}
+        missing: list[Hashable] = []
+        unique_keys = list(dict.fromkeys(keys))
+        for key in unique_keys:
+            value = self._get(key, _MISSING)
+            if value is not _MISSING:
+                values[key] = value
+            elif key in self._in_flight:
+                in_flight[key] = self._in_flight[key]
+            else:
+                missing.append(key)
+
+        self.hits += len(unique_keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            task = asyncio.get_running_loop().create_task(
+                self._create(missing, create_many), context=contextvars.Context()
+            )
+            task.add_done_callback(partial(self._finish, missing))
+            for key in missing:
+                self._in_flight[key] = task
+                in_flight[key] = task
+
+        if in_flight:
+            await asyncio.gather(*(asyncio.shield(task) for task in set(in_flight.values())))
+            for key, task in in_flight.items():
+                created = task.result()
+                if key in created:
+                    values[key] = created[key]
+
+        return values
+
+    async def _create(
+        self,
+        keys: list[Hashable],
+        create_many: Callable[[list[Hashable]], Awaitable[dict[Hashable, Any]]],
+    ) -> dict[Hashable, Any]:
+        created = await create_many(keys)
+        for key, value in created.items():
+            self.set(key, value)
+
+        return created
+
+    def _finish(self, keys: list[Hashable], task: asyncio.Task):
+        for key in keys:
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+        # Mark the exception as retrieved when every caller has already given up on the call
+        if not task.cancelled():
+            task.exception()
+
+
 # def validate_group_id(group_id: str) -> bool:
 #     """
 #     Validate that a group_id contains only ASCII alphanumeric characters, dashes, and underscores.
@@ -1,10 +1,10 @@
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from typing import List, Dict, Optional
 import os
 import json
 import dotenv
 
-from graph_agent import GraphAgent
+from graph_agent import GraphAgent, search_results_to_dicts
 from cypher.text2cypher_agent import Text2CypherAgent
 from driver.neo4j_driver import Neo4jDriver
 
@@ -32,7 +32,10 @@ neo4j_driver = Neo4jDriver(uri=_neo4j_uri, user=_neo4j_user, password=_neo4j_pas
 async def graph_search(
     query: str,
     limit: int = 10,
-    center_node_uuid: Optional[str] = None
+    center_node_uuid: Optional[str] = None,
+    stream: bool = False,
+    budget_ms: Optional[int] = None,
+    ctx: Context = None
 ) -> Dict:
     """Search GLKB for relevant literature evidence using hybrid retrieval.
 
@@ -40,17 +43,102 @@ async def graph_search(
         query: A few keywords to search for. (e.g., "diabetes gene variant")
         limit: Maximum number of results to return
         center_node_uuid: Optional node UUID to bias search by proximity
+        stream: If true, each result type (edges, articles, sentences) is sent as a progress
+            notification as soon as it is ready, before the full result is returned
+        budget_ms: Optional latency budget in milliseconds; result types that are not ready in time are left empty.
+            When streaming, they are sent as empty notifications marked timed_out
 
     Returns:
-        A dictionary with keys: edges, articles, sentences
+        A dictionary with keys: edges, articles, sentences. When the budget ran out it also has
+        degraded=True and timed_out_channels listing the result types that were dropped.
     """
-    edges, articles, sentences = await _agent.search(
+    if stream and ctx is not None:
+        return await _stream_graph_search(query, limit, center_node_uuid, budget_ms, ctx)
+
+    result = await _agent.search_(
+        query=query,
+        center_node_uuid=center_node_uuid,
+        group_ids=None,
+        num_results=limit,
+        search_filter=None,
+        budget_ms=budget_ms,
+    )
+    formatted = _format_graph_search_results(*search_results_to_dicts(result))
+    if result.degraded:
+        formatted["degraded"] = True
+        formatted["timed_out_channels"] = result.timed_out_channels
+    return formatted
+
+async def _stream_graph_search(
+    query: str,
+    limit: int,
+    center_node_uuid: Optional[str],
+    budget_ms: Optional[int],
+    ctx: Context
+) -> Dict:
+    channel_results = {"edges": [], "articles": [], "sentences": []}
+    timed_out_channels = []
+    completed = 0
+    async for channel, results, timed_out in _agent.search_stream(
         query=query,
         center_node_uuid=center_node_uuid,
         group_ids=None,
         num_results=limit,
         search_filter=None,
+        budget_ms=budget_ms,
+    ):
+        channel_results[channel] = results
+        completed += 1
+        formatted = _format_graph_search_results(
+            channel_results["edges"] if channel == "edges" else [],
+            channel_results["articles"] if channel == "articles" else [],
+            channel_results["sentences"] if channel == "sentences" else [],
+        )
+        chunk = {"query": query, "channel": channel, channel: formatted[channel]}
+        if timed_out:
+            timed_out_channels.append(channel)
+            chunk["timed_out"] = True
+        await ctx.info(json.dumps(chunk))
+        await ctx.report_progress(completed, len(channel_results))
+
+    formatted = _format_graph_search_results(
+        channel_results["edges"], channel_results["articles"], channel_results["sentences"]
+    )
+    if timed_out_channels:
+        formatted["degraded"] = True
+        formatted["timed_out_channels"] = timed_out_channels
+    return formatted
+
+@mcp.tool()
+async def graph_search_many(
+    queries: List[str],
+    limit: int = 10,
+    center_node_uuid: Optional[str] = None
+) -> List[Dict]:
+    """Run several graph_search queries in one call. Prefer this over repeated graph_search
+    calls when you have multiple related queries.
+
+    Args:
+        queries: A list of keyword queries (e.g., ["BRCA1 breast cancer", "TP53 apoptosis"])
+        limit: Maximum number of results to return per query
+        center_node_uuid: Optional node UUID to bias search by proximity
+
+    Returns:
+        A list with one dictionary per query, in order, each with keys: query, edges, articles, sentences
+    """
+    results = await _agent.search_many(
+        queries=queries,
+        center_node_uuid=center_node_uuid,
+        group_ids=None,
+        num_results=limit,
+        search_filter=None,
     )
+    return [
+        {"query": query, **_format_graph_search_results(edges, articles, sentences)}
+        for query, (edges, articles, sentences) in zip(queries, results)
+    ]
+
+def _format_graph_search_results(edges: List[Dict], articles: List[Dict], sentences: List[Dict]) -> Dict:
     formatted_edges = []
     formatted_articles = []
     formatted_sentences = []
@@ -219,6 +307,38 @@ async def vocabulary_search(
         num_results=limit,
         search_filter=None,
     )
+    return _format_vocabulary_results(results)
+
+@mcp.tool()
+async def vocabulary_search_many(
+    queries: List[str],
+    limit: int = 10,
+    center_node_uuid: Optional[str] = None
+) -> List[Dict]:
+    """Search GLKB vocabulary terms for several biomedical terms in one call. Prefer this over
+    repeated vocabulary_search calls when you have multiple terms to look up.
+
+    Args:
+        queries: A list of biomedical terms to search for
+        limit: Maximum number of results per term
+        center_node_uuid: Optional node UUID to bias search by proximity
+
+    Returns:
+        A list with one dictionary per query, in order, each with keys: query, results
+    """
+    results = await _agent.search_vocabulary_many(
+        queries=queries,
+        center_node_uuid=center_node_uuid,
+        group_ids=None,
+        num_results=limit,
+        search_filter=None,
+    )
+    return [
+        {"query": query, "results": _format_vocabulary_results(query_results)}
+        for query, query_results in zip(queries, results)
+    ]
+
+def _format_vocabulary_results(results: List[Dict]) -> List[Dict]:
     formatted_results = []
     for result in results:
         formatted_results.append({
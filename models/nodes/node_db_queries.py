@@ -14,10 +14,19 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from enum import Enum
 from typing import Any
 
 from driver.driver import GraphProvider
 
+
+class NodeProjection(Enum):
+    """Which node fields a query ships back over Bolt."""
+
+    lean = 'lean'  # every property except embeddings
+    with_embedding = 'with_embedding'  # lean fields plus the embedding used for query-time similarity
+    full = 'full'  # every stored property, including all embeddings
+
 ARTICLE_NODE_SAVE = """
     MERGE (n:Article:Entity:InformationContentEntity:JournalArticle:NamedThing:Publication:PubmedArticle {id: $id})
     SET n = {n_citation: $n_citation, doi: $doi, journal: $journal, pubdate: $pubdate, authors: $authors, pubmedid: $pubmedid, title: $title, abstract: $abstract, embedding: $embedding, openai_embedding: $openai_embedding}
@@ -46,6 +55,42 @@ ARTICLE_NODE_RETURN = """
     n.source AS source
 """
 
+ARTICLE_NODE_RETURN_LEAN = """
+    n.id AS id,
+    n.n_citation AS n_citation,
+    n.doi AS doi,
+    n.journal AS journal,
+    n.pubdate AS pubdate,
+    n.authors AS authors,
+    n.pubmedid AS pubmedid,
+    n.title AS title,
+    n.abstract AS abstract,
+    n.source AS source
+"""
+
+ARTICLE_NODE_RETURN_WITH_EMBEDDING = """
+    n.id AS id,
+    n.n_citation AS n_citation,
+    n.doi AS doi,
+    n.journal AS journal,
+    n.pubdate AS pubdate,
+    n.authors AS authors,
+    n.pubmedid AS pubmedid,
+    n.title AS title,
+    n.abstract AS abstract,
+    n.openai_embedding AS openai_embedding,
+    n.source AS source
+"""
+
+
+def get_article_node_return(projection: NodeProjection = NodeProjection.full) -> str:
+    if projection == NodeProjection.lean:
+        return ARTICLE_NODE_RETURN_LEAN
+    if projection == NodeProjection.with_embedding:
+        return ARTICLE_NODE_RETURN_WITH_EMBEDDING
+
+    return ARTICLE_NODE_RETURN
+
 
 def get_vocabulary_node_save_query(provider: GraphProvider, labels: str) -> str:
     return f"""
@@ -75,6 +120,34 @@ VOCABULARY_NODE_RETURN = """
     properties(n) AS attributes
 """
 
+VOCABULARY_NODE_RETURN_LEAN = """
+    n.id AS id,
+    n.name AS name,
+    n.description AS description,
+    n.n_citation AS n_citation,
+    labels(n) AS labels,
+    apoc.map.removeKey(properties(n), 'embedding') AS attributes
+"""
+
+VOCABULARY_NODE_RETURN_WITH_EMBEDDING = """
+    n.id AS id,
+    n.name AS name,
+    n.description AS description,
+    n.embedding AS embedding,
+    n.n_citation AS n_citation,
+    labels(n) AS labels,
+    apoc.map.removeKey(properties(n), 'embedding') AS attributes
+"""
+
+
+def get_vocabulary_node_return(projection: NodeProjection = NodeProjection.full) -> str:
+    if projection == NodeProjection.lean:
+        return VOCABULARY_NODE_RETURN_LEAN
+    if projection == NodeProjection.with_embedding:
+        return VOCABULARY_NODE_RETURN_WITH_EMBEDDING
+
+    return VOCABULARY_NODE_RETURN
+
 
 # def get_community_node_save_query(provider: GraphProvider) -> str:
 #     if provider == GraphProvider.FALKORDB:
@@ -104,7 +177,7 @@ VOCABULARY_NODE_RETURN = """
 # Sentence node queries
 SENTENCE_NODE_SAVE = """
     MERGE (n:Sentence:Entity:InformationContentEntity:NamedThing:StudyResult:TextMiningResult {id: $id})
-    SET n = {text: $text, informative: $informative}
+    SET n = {id: $id, text: $text, informative: $informative}
     RETURN n.id AS id
 """
 
@@ -14,7 +14,10 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
+import contextvars
 import logging
+import weakref
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
@@ -28,22 +31,25 @@ from typing_extensions import LiteralString
 from driver.driver import GraphDriver, GraphProvider
 from embedder import EmbedderClient
 from errors import NodeNotFoundError
-from helpers import parse_db_date
+from helpers import parse_db_date, record_to_dict
 from models.nodes.node_db_queries import (
     # COMMUNITY_NODE_RETURN,
     # ENTITY_NODE_RETURN,
-    VOCABULARY_NODE_RETURN,
-    ARTICLE_NODE_RETURN,
     ARTICLE_NODE_SAVE,
     SENTENCE_NODE_SAVE,
     SENTENCE_NODE_RETURN,
+    NodeProjection,
+    get_article_node_return,
     # get_community_node_save_query,
+    get_vocabulary_node_return,
     get_vocabulary_node_save_query,
 )
 from utils.datetime_utils import utc_now
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_EMBEDDING_BATCH_SIZE = 500
+
 
 # class EpisodeType(Enum):
 #     """
@@ -81,6 +87,106 @@ logger = logging.getLogger(__name__)
 #         raise NotImplementedError
 
 
+class EmbeddingLoader:
+    """
+    Batches embedding lookups for one node label and embedding property.
+
+    load() registers an id and returns a future. Every id requested before the event loop
+    gets back to the loader is fetched with a single `WHERE n.id IN $ids` query, so nodes
+    hydrated concurrently share one round trip instead of issuing one query each. Each
+    caller gets its own shielded future, so a caller that is cancelled or times out never
+    cancels the lookup for the others, and the batched query runs in an empty context
+    rather than under the query deadline of whichever caller triggered it.
+    """
+
+    def __init__(
+        self,
+        driver: GraphDriver,
+        label: str,
+        embedding_property: str,
+        max_batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+    ):
+        self.driver = driver
+        self.label = label
+        self.embedding_property = embedding_property
+        self.max_batch_size = max_batch_size
+        self._pending: dict[str, asyncio.Future] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    def load(self, id: str) -> asyncio.Future:
+        future = self._pending.get(id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[id] = future
+            if self._flush_task is None:
+                self._flush_task = loop.create_task(self._flush(), context=contextvars.Context())
+
+        return asyncio.shield(future)
+
+    async def load_many(self, ids: list[str]) -> dict[str, list[float] | None]:
+        ids = list(dict.fromkeys(ids))
+        results = await asyncio.gather(*(self.load(id) for id in ids), return_exceptions=True)
+
+        embeddings: dict[str, list[float] | None] = {}
+        for id, result in zip(ids, results, strict=True):
+            if isinstance(result, NodeNotFoundError):
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            embeddings[id] = result
+
+        return embeddings
+
+    async def _flush(self):
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+
+        ids = list(pending.keys())
+        for i in range(0, len(ids), self.max_batch_size):
+            batch = ids[i : i + self.max_batch_size]
+            try:
+                records, _, _ = await self.driver.execute_query(
+                    f"""
+                    MATCH (n:{self.label})
+                    WHERE n.id IN $ids
+                    RETURN n.id AS id, n.{self.embedding_property} AS embedding
+                    """,
+                    ids=batch,
+                    routing_='r',
+                )
+            except Exception as e:
+                for id in batch:
+                    if not pending[id].done():
+                        pending[id].set_exception(e)
+                continue
+
+            embeddings = {record['id']: record['embedding'] for record in records}
+            for id in batch:
+                future = pending[id]
+                if future.done():
+                    continue
+                if id in embeddings:
+                    future.set_result(embeddings[id])
+                else:
+                    future.set_exception(NodeNotFoundError(id))
+
+
+_embedding_loaders: weakref.WeakKeyDictionary[
+    GraphDriver, dict[tuple[str, str], EmbeddingLoader]
+] = weakref.WeakKeyDictionary()
+
+
+def get_embedding_loader(driver: GraphDriver, label: str, embedding_property: str) -> EmbeddingLoader:
+    loaders = _embedding_loaders.setdefault(driver, {})
+    loader = loaders.get((label, embedding_property))
+    if loader is None:
+        loader = EmbeddingLoader(driver, label, embedding_property)
+        loaders[(label, embedding_property)] = loader
+
+    return loader
+
+
 class Node(BaseModel, ABC):
     id: str = Field(description='id of the node')
     # name: str = Field(description='name of the node')
@@ -191,14 +297,45 @@ class ArticleNode(Node):
 
         return result
 
+    async def load_embedding(self, driver: GraphDriver):
+        self.embedding = await get_embedding_loader(driver, 'Article', 'embedding').load(self.id)
+
+    async def load_openai_embedding(self, driver: GraphDriver):
+        self.openai_embedding = await get_embedding_loader(
+            driver, 'Article', 'openai_embedding'
+        ).load(self.id)
+
+    async def get_openai_embedding(self, driver: GraphDriver) -> list[float] | None:
+        if self.openai_embedding is None:
+            await self.load_openai_embedding(driver)
+
+        return self.openai_embedding
+
     @classmethod
-    async def get_by_id(cls, driver: GraphDriver, id: str):
+    async def load_openai_embeddings(cls, driver: GraphDriver, articles: list['ArticleNode']):
+        missing = [article for article in articles if article.openai_embedding is None]
+        if not missing:
+            return
+
+        embeddings = await get_embedding_loader(driver, 'Article', 'openai_embedding').load_many(
+            [article.id for article in missing]
+        )
+        for article in missing:
+            article.openai_embedding = embeddings.get(article.id)
+
+    @classmethod
+    async def get_by_id(
+        cls,
+        driver: GraphDriver,
+        id: str,
+        projection: NodeProjection = NodeProjection.full,
+    ):
         records, _, _ = await driver.execute_query(
             """
             MATCH (n:Article {id: $id})
             RETURN
             """
-            + ARTICLE_NODE_RETURN,
+            + get_article_node_return(projection),
             id=id,
             routing_='r',
         )
@@ -211,13 +348,18 @@ class ArticleNode(Node):
         return articles[0]
     
     @classmethod
-    async def get_by_pubmedid(cls, driver: GraphDriver, pubmedid: str):
+    async def get_by_pubmedid(
+        cls,
+        driver: GraphDriver,
+        pubmedid: str,
+        projection: NodeProjection = NodeProjection.full,
+    ):
         records, _, _ = await driver.execute_query(
             """
             MATCH (n:Article {pubmedid: $pubmedid})
             RETURN
             """
-            + ARTICLE_NODE_RETURN,
+            + get_article_node_return(projection),
             pubmedid=pubmedid,
             routing_='r',
         )
@@ -230,14 +372,19 @@ class ArticleNode(Node):
         return articles[0]
 
     @classmethod
-    async def get_by_ids(cls, driver: GraphDriver, ids: list[str]):
+    async def get_by_ids(
+        cls,
+        driver: GraphDriver,
+        ids: list[str],
+        projection: NodeProjection = NodeProjection.full,
+    ):
         records, _, _ = await driver.execute_query(
             """
             MATCH (n:Article)
             WHERE n.id IN $ids
             RETURN DISTINCT
             """
-            + ARTICLE_NODE_RETURN,
+            + get_article_node_return(projection),
             ids=ids,
             routing_='r',
         )
@@ -247,14 +394,19 @@ class ArticleNode(Node):
         return articles
     
     @classmethod
-    async def get_by_pubmedids(cls, driver: GraphDriver, pubmedids: list[str]):
+    async def get_by_pubmedids(
+        cls,
+        driver: GraphDriver,
+        pubmedids: list[str],
+        projection: NodeProjection = NodeProjection.full,
+    ):
         records, _, _ = await driver.execute_query(
             """
             MATCH (n:Article)
             WHERE n.pubmedid IN $pubmedids
             RETURN DISTINCT
             """
-            + ARTICLE_NODE_RETURN,
+            + get_article_node_return(projection),
             pubmedids=pubmedids,
             routing_='r',
         )
@@ -269,6 +421,7 @@ class ArticleNode(Node):
         driver: GraphDriver,
         vocabulary_ids: list[str],
         limit: int | None = 20,
+        projection: NodeProjection = NodeProjection.full,
     ):
         if limit is None:
             limit = 20
@@ -280,7 +433,7 @@ class ArticleNode(Node):
             WHERE v.id IN $vocabulary_ids
             RETURN DISTINCT
             """
-            + ARTICLE_NODE_RETURN
+            + get_article_node_return(projection)
             + limit_query,
             vocabulary_ids=vocabulary_ids,
             limit=limit,
@@ -310,6 +463,7 @@ class ArticleNode(Node):
 class SentenceNode(Node):
     text: str = Field(description='text of the sentence')
     informative: str = Field(description='one of ["Informative", "Non-Informative"]')
+    embedding: list[float] | None = Field(default=None, description='embedding of the sentence')
 
     async def save(self, driver: GraphDriver):
         result = await driver.execute_query(
@@ -323,6 +477,21 @@ class SentenceNode(Node):
 
         return result
 
+    async def load_embedding(self, driver: GraphDriver):
+        self.embedding = await get_embedding_loader(driver, 'Sentence', 'embedding').load(self.id)
+
+    @classmethod
+    async def load_embeddings(cls, driver: GraphDriver, sentences: list['SentenceNode']):
+        missing = [sentence for sentence in sentences if sentence.embedding is None]
+        if not missing:
+            return
+
+        embeddings = await get_embedding_loader(driver, 'Sentence', 'embedding').load_many(
+            [sentence.id for sentence in missing]
+        )
+        for sentence in missing:
+            sentence.embedding = embeddings.get(sentence.id)
+
     @classmethod
     async def get_by_id(cls, driver: GraphDriver, id: str):
         records, _, _ = await driver.execute_query(
@@ -421,19 +590,25 @@ class VocabularyNode(Node):
         return self.name_embedding
 
     async def load_embedding(self, driver: GraphDriver):
-        records, _, _ = await driver.execute_query(
-            """
-            MATCH (n:Vocabulary {id: $id})
-            RETURN n.embedding AS embedding
-            """,
-            id=self.id,
-            routing_='r',
-        )
+        self.embedding = await get_embedding_loader(driver, 'Vocabulary', 'embedding').load(self.id)
 
-        if len(records) == 0:
-            raise NodeNotFoundError(self.id)
+    async def get_embedding(self, driver: GraphDriver) -> list[float] | None:
+        if self.embedding is None:
+            await self.load_embedding(driver)
+
+        return self.embedding
+
+    @classmethod
+    async def load_embeddings(cls, driver: GraphDriver, nodes: list['VocabularyNode']):
+        missing = [node for node in nodes if node.embedding is None]
+        if not missing:
+            return
 
-        self.embedding = records[0]['embedding']
+        embeddings = await get_embedding_loader(driver, 'Vocabulary', 'embedding').load_many(
+            [node.id for node in missing]
+        )
+        for node in missing:
+            node.embedding = embeddings.get(node.id)
 
     async def save(self, driver: GraphDriver):
         entity_data: dict[str, Any] = {
@@ -456,13 +631,18 @@ class VocabularyNode(Node):
         return result
 
     @classmethod
-    async def get_by_id(cls, driver: GraphDriver, id: str):
+    async def get_by_id(
+        cls,
+        driver: GraphDriver,
+        id: str,
+        projection: NodeProjection = NodeProjection.full,
+    ):
         records, _, _ = await driver.execute_query(
             """
             MATCH (n:Vocabulary {id: $id})
             RETURN
             """
-            + VOCABULARY_NODE_RETURN,
+            + get_vocabulary_node_return(projection),
             id=id,
             routing_='r',
         )
@@ -475,14 +655,19 @@ class VocabularyNode(Node):
         return nodes[0]
 
     @classmethod
-    async def get_by_ids(cls, driver: GraphDriver, ids: list[str]):
+    async def get_by_ids(
+        cls,
+        driver: GraphDriver,
+        ids: list[str],
+        projection: NodeProjection = NodeProjection.full,
+    ):
         records, _, _ = await driver.execute_query(
             """
             MATCH (n:Vocabulary)
             WHERE n.id IN $ids
             RETURN
             """
-            + VOCABULARY_NODE_RETURN,
+            + get_vocabulary_node_return(projection),
             ids=ids,
             routing_='r',
         )
@@ -653,6 +838,7 @@ class VocabularyNode(Node):
 
 # Node helpers
 def get_article_node_from_record(record: Any) -> ArticleNode:
+    record = record_to_dict(record)
     # created_at = parse_db_date(record['created_at'])
     # valid_at = parse_db_date(record['valid_at'])
 
@@ -671,13 +857,14 @@ def get_article_node_from_record(record: Any) -> ArticleNode:
         pubmedid=record['pubmedid'],
         title=record['title'],
         abstract=record['abstract'],
-        embedding=record['embedding'],
-        openai_embedding=record['openai_embedding'],
+        embedding=record.get('embedding'),
+        openai_embedding=record.get('openai_embedding'),
         source=record['source']
     )
 
 
 def get_sentence_node_from_record(record: Any) -> SentenceNode:
+    record = record_to_dict(record)
     return SentenceNode(
         id=record['id'],
         text=record['text'],
@@ -686,11 +873,12 @@ def get_sentence_node_from_record(record: Any) -> SentenceNode:
 
 
 def get_vocabulary_node_from_record(record: Any) -> VocabularyNode:
+    record = record_to_dict(record)
     return VocabularyNode(
         id=record['id'],
         name=record['name'],
         description=record['description'],
-        embedding=record['embedding'],
+        embedding=record.get('embedding'),
         labels=record['labels'],
         n_citation=record.get('n_citation', None),
         attributes=record['attributes'],
@@ -715,3 +903,76 @@ async def create_vocabulary_node_embeddings(embedder: EmbedderClient, nodes: lis
     embeddings = await embedder.create_batch([node.name + '. ' + node.description for node in nodes])
     for node, embedding in zip(nodes, embeddings, strict=True):
         node.embedding = embedding
+
+
+async def create_sentence_node_embeddings(embedder: EmbedderClient, nodes: list[SentenceNode]):
+    if not nodes:
+        return
+
+    embeddings = await embedder.create_batch([node.text.replace('\n', ' ') for node in nodes])
+    for node, embedding in zip(nodes, embeddings, strict=True):
+        node.embedding = embedding
+
+
+async def build_sentence_embeddings(
+    driver: GraphDriver,
+    embedder: EmbedderClient,
+    batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+    max_nodes: int | None = None,
+) -> int:
+    """
+    Backfill embeddings for Sentence nodes that do not have one yet.
+
+    Works batch_size sentences at a time: one read, one create_batch call and one
+    setNodeVectorProperty write per batch, feeding the sentence_embeddings vector index.
+    Sentences are paged with a cursor over the indexed n.id, so every batch resumes where
+    the previous one stopped instead of rescanning the sentences already embedded.
+    Saving a sentence replaces its properties and drops the embedding, so re-running the
+    backfill after an import embeds exactly the new and updated sentences. Returns the
+    number of sentences embedded.
+    """
+    embedded = 0
+    # '' sorts before every id, so the cursor is a plain range predicate the id index can
+    # serve for both the seek and the ordering
+    last_id = ''
+    while max_nodes is None or embedded < max_nodes:
+        limit = batch_size if max_nodes is None else min(batch_size, max_nodes - embedded)
+        records, _, _ = await driver.execute_query(
+            """
+            MATCH (n:Sentence)
+            WHERE n.id > $last_id
+            AND n.embedding IS NULL AND n.text IS NOT NULL AND n.text <> ''
+            RETURN n.id AS id, n.text AS text
+            ORDER BY n.id
+            LIMIT $limit
+            """,
+            last_id=last_id,
+            limit=limit,
+            routing_='r',
+        )
+        if len(records) == 0:
+            break
+
+        last_id = records[-1]['id']
+        embeddings = await embedder.create_batch(
+            [record['text'].replace('\n', ' ') for record in records]
+        )
+        await driver.execute_query(
+            """
+            UNWIND $sentences AS sentence
+            MATCH (n:Sentence {id: sentence.id})
+            CALL db.create.setNodeVectorProperty(n, 'embedding', sentence.embedding)
+            """,
+            sentences=[
+                {'id': record['id'], 'embedding': embedding}
+                for record, embedding in zip(records, embeddings, strict=True)
+            ],
+        )
+
+        embedded += len(records)
+        logger.debug(f'Embedded {embedded} sentences')
+
+        if len(records) < limit:
+            break
+
+    return embedded
@@ -14,12 +14,18 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
+import contextvars
 import logging
 from collections import defaultdict
-from time import time
+from collections.abc import AsyncIterator, Coroutine
+from enum import Enum
+from time import monotonic, time
+from typing import Any
 
 from cross_encoder.client import CrossEncoderClient
-from driver.driver import GraphDriver
+from driver.driver import GraphDriver, query_deadline
+from embedder import EmbedderClient
 from edges import SemanticEdge
 from errors import SearchRerankerError
 from graphagent_client import GraphAgentClients
@@ -37,35 +43,106 @@ from search.search_config import (
     NodeReranker,
     NodeSearchConfig,
     NodeSearchMethod,
+    SearchChannelResults,
     SearchConfig,
+    SearchExecutionMode,
     SearchResults,
     ArticleReranker,
     ArticleSearchConfig,
     ArticleSearchMethod,
 )
 from search.search_filters import SearchFilters
+from search.search_cache import SearchResultCache
+from search.search_plan import SearchPlan, compile_search_plan
 from search.search_utils import (
+    ARTICLE_CHANNEL,
+    EDGE_CHANNEL,
+    SENTENCE_CHANNEL,
+    VOCABULARY_CHANNEL,
+    batch_fulltext_search,
+    cascade_rerank,
+    collapse_near_duplicates,
     # community_fulltext_search,
     # community_similarity_search,
     edge_bfs_search,
     edge_fulltext_search,
     sentence_fulltext_search,
-    # edge_similarity_search,
+    sentence_similarity_search,
+    edge_similarity_search,
     article_fulltext_search,
     # episode_mentions_reranker,
     # get_embeddings_for_communities,
     # get_embeddings_for_edges,
+    get_embeddings_for_articles,
+    get_embeddings_for_sentences,
     get_embeddings_for_vocabulary,
-    maximal_marginal_relevance,
+    mmr_rerank,
+    multi_channel_fulltext_search,
     node_bfs_search,
     node_distance_reranker,
     node_fulltext_search,
     node_similarity_search,
+    resolve_query_vector,
     rrf,
 )
 
 logger = logging.getLogger(__name__)
 
+def create_query_vector_task(
+    embedder: EmbedderClient,
+    query: str,
+    query_vector: list[float] | None,
+    needs_query_vector: bool,
+) -> asyncio.Future | None:
+    """
+    Start embedding the query in the background so it runs concurrently with the
+    fulltext channels. Returns None when no channel consumes the query vector.
+    """
+    if query_vector is not None:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(query_vector)
+        return future
+    if not needs_query_vector:
+        return None
+
+    return asyncio.ensure_future(embedder.create(input_data=[query.replace('\n', ' ')]))
+
+
+def release_query_vector_task(query_vector_task: asyncio.Future | None):
+    if query_vector_task is None:
+        return
+    if not query_vector_task.done():
+        query_vector_task.cancel()
+    elif not query_vector_task.cancelled():
+        # retrieve any exception so an unused embedding failure is not reported as unhandled
+        query_vector_task.exception()
+
+
+def _cached_search(
+    search_cache: SearchResultCache | None,
+    kind: str,
+    query: str,
+    plan: SearchPlan,
+    limit: int,
+    search_filter: SearchFilters,
+    center_node_uuid: str | None,
+    bfs_origin_node_uuids: list[str] | None,
+) -> tuple[str | None, SearchResults | None]:
+    # the cache key to store the search's results under and the cached results, if any
+    if search_cache is None:
+        return None, None
+
+    cache_key = search_cache.get_cache_key(
+        kind,
+        query,
+        plan.config_key,
+        limit,
+        search_filter,
+        center_node_uuid,
+        bfs_origin_node_uuids,
+    )
+    return cache_key, search_cache.get(cache_key)
+
 
 async def search(
     clients: GraphAgentClients,
@@ -76,31 +153,275 @@ async def search(
     center_node_uuid: str | None = None,
     bfs_origin_node_uuids: list[str] | None = None,
     query_vector: list[float] | None = None,
+    limit: int | None = None,
+    budget_ms: float | None = None,
 ) -> SearchResults:
+    """
+    Hybrid search over the edge, article and sentence channels.
+
+    When budget_ms is set, every channel must finish within that many milliseconds of the
+    call: Neo4j queries get a transaction timeout for the time that is left, and channels
+    still running at the deadline are cancelled. The channels that completed are returned
+    with degraded set and the missing ones listed in timed_out_channels; degraded results
+    are not cached.
+    """
     start = time()
+    deadline = get_search_deadline(budget_ms)
 
     driver = clients.driver
     embedder = clients.embedder
-    cross_encoder = clients.cross_encoder
 
     if query.strip() == '':
         return SearchResults()
-    query_vector = (
-        query_vector
-        if query_vector is not None
-        else await embedder.create(input_data=[query.replace('\n', ' ')])
+
+    plan = compile_search_plan(config, clients.driver.provider)
+    # the limit is passed per call so shared configs never have to be modified
+    limit = limit if limit is not None else config.limit
+
+    # an explicit query vector may not match the query text, so those searches bypass the cache
+    search_cache = clients.search_cache if query_vector is None else None
+    cache_key, cached_results = _cached_search(
+        search_cache,
+        'search',
+        query,
+        plan,
+        limit,
+        search_filter,
+        center_node_uuid,
+        bfs_origin_node_uuids,
+    )
+    if cached_results is not None:
+        logger.debug(f'search returned cached context for query {query}')
+        return cached_results
+
+    query_vector_task = create_query_vector_task(
+        embedder, query, query_vector, plan.needs_query_vector
     )
 
     # if group_ids is empty, set it to None
     # group_ids = group_ids if group_ids and group_ids != [''] else None
     group_ids = None
-    (
-        (edges, edge_reranker_scores),
-        # (nodes, node_reranker_scores),
-        (articles, article_reranker_scores),
-        (sentences, sentence_reranker_scores),
-    ) = await semaphore_gather(
-        edge_search(
+    deadline_token = query_deadline.set(deadline)
+    try:
+        fulltext_results: dict[str, list] = {}
+        if config.execution_mode == SearchExecutionMode.single_query:
+            # if the shared prefetch misses the deadline, the channels time out right after it
+            fulltext_results = (
+                await run_before_deadline(
+                    multi_channel_fulltext_search(
+                        driver,
+                        query,
+                        search_filter,
+                        list(plan.fulltext_channels),
+                        group_ids,
+                        2 * limit,
+                        plan.multi_channel_fulltext_query,
+                    ),
+                    deadline,
+                )
+                or {}
+            )
+
+        results = await search_channels(
+            clients,
+            query,
+            query_vector_task,
+            group_ids,
+            config,
+            search_filter,
+            center_node_uuid,
+            bfs_origin_node_uuids,
+            limit,
+            fulltext_results,
+            deadline,
+        )
+    finally:
+        query_deadline.reset(deadline_token)
+        release_query_vector_task(query_vector_task)
+
+    if results.degraded:
+        logger.warning(
+            f'search for query {query} ran out of its {budget_ms} ms budget, '
+            f'timed out channels: {results.timed_out_channels}'
+        )
+    elif search_cache is not None:
+        search_cache.set(cache_key, results)
+
+    latency = (time() - start) * 1000
+
+    logger.debug(f'search returned context for query {query} in {latency} ms')
+
+    return results
+
+
+async def search_many(
+    clients: GraphAgentClients,
+    queries: list[str],
+    group_ids: list[str] | None,
+    config: SearchConfig,
+    search_filter: SearchFilters,
+    center_node_uuid: str | None = None,
+    bfs_origin_node_uuids: list[str] | None = None,
+    limit: int | None = None,
+    budget_ms: float | None = None,
+) -> list[SearchResults]:
+    """
+    Run search() for several queries, returning one SearchResults per query in order.
+
+    All query embeddings come from a single create_batch call, and each fulltext index is
+    queried once for every query with an UNWIND statement. Fusion and reranking still run
+    per query. budget_ms bounds the whole batch the same way it bounds search().
+    """
+    start = time()
+    deadline = get_search_deadline(budget_ms)
+
+    plan = compile_search_plan(config, clients.driver.provider)
+    limit = limit if limit is not None else config.limit
+    group_ids = None
+
+    results: list[SearchResults | None] = [None] * len(queries)
+    cache_keys: list[str | None] = [None] * len(queries)
+    pending: list[int] = []
+    for index, query in enumerate(queries):
+        if query.strip() == '':
+            results[index] = SearchResults()
+            continue
+        cache_keys[index], cached_results = _cached_search(
+            clients.search_cache,
+            'search',
+            query,
+            plan,
+            limit,
+            search_filter,
+            center_node_uuid,
+            bfs_origin_node_uuids,
+        )
+        if cached_results is not None:
+            results[index] = cached_results
+            continue
+        pending.append(index)
+
+    deadline_token = query_deadline.set(deadline)
+    try:
+        prefetched = None
+        if pending:
+            pending_queries = [queries[index] for index in pending]
+            prefetched = await run_before_deadline(
+                semaphore_gather(
+                    create_query_vectors(
+                        clients.embedder, pending_queries, plan.needs_query_vector
+                    ),
+                    batch_fulltext_search_channels(
+                        clients.driver,
+                        pending_queries,
+                        search_filter,
+                        plan.fulltext_channels,
+                        group_ids,
+                        2 * limit,
+                        plan.batch_fulltext_queries,
+                    ),
+                ),
+                deadline,
+            )
+
+        if prefetched is None:
+            # the batched embedding and fulltext round trips did not finish in time
+            for index in pending:
+                results[index] = SearchResults(
+                    degraded=True, timed_out_channels=list(plan.channels)
+                )
+        else:
+            query_vectors, fulltext_results = prefetched
+            pending_results = await search_pending_queries(
+                clients,
+                pending_queries,
+                query_vectors,
+                fulltext_results,
+                group_ids,
+                config,
+                search_filter,
+                center_node_uuid,
+                bfs_origin_node_uuids,
+                limit,
+                deadline,
+            )
+            for index, query_results in zip(pending, pending_results, strict=True):
+                results[index] = query_results
+                if clients.search_cache is not None and not query_results.degraded:
+                    clients.search_cache.set(cache_keys[index], query_results)
+    finally:
+        query_deadline.reset(deadline_token)
+
+    latency = (time() - start) * 1000
+
+    logger.debug(f'search_many returned context for {len(queries)} queries in {latency} ms')
+
+    return results
+
+
+async def search_pending_queries(
+    clients: GraphAgentClients,
+    queries: list[str],
+    query_vectors: list[list[float] | None],
+    fulltext_results: list[dict[str, list]],
+    group_ids: list[str] | None,
+    config: SearchConfig,
+    search_filter: SearchFilters,
+    center_node_uuid: str | None,
+    bfs_origin_node_uuids: list[str] | None,
+    limit: int,
+    deadline: float | None,
+) -> list[SearchResults]:
+    query_vector_tasks = [
+        create_query_vector_task(clients.embedder, query, query_vector, False)
+        for query, query_vector in zip(queries, query_vectors, strict=True)
+    ]
+    try:
+        return await semaphore_gather(
+            *[
+                search_channels(
+                    clients,
+                    query,
+                    query_vector_task,
+                    group_ids,
+                    config,
+                    search_filter,
+                    center_node_uuid,
+                    bfs_origin_node_uuids,
+                    limit,
+                    query_fulltext_results,
+                    deadline,
+                )
+                for query, query_vector_task, query_fulltext_results in zip(
+                    queries, query_vector_tasks, fulltext_results, strict=True
+                )
+            ]
+        )
+    finally:
+        for query_vector_task in query_vector_tasks:
+            release_query_vector_task(query_vector_task)
+
+
+def get_channel_searches(
+    clients: GraphAgentClients,
+    query: str,
+    query_vector: asyncio.Future | None,
+    group_ids: list[str] | None,
+    config: SearchConfig,
+    search_filter: SearchFilters,
+    center_node_uuid: str | None,
+    bfs_origin_node_uuids: list[str] | None,
+    limit: int,
+    fulltext_results: dict[str, list],
+) -> dict[str, Coroutine]:
+    # one coroutine per configured channel, each resolving to (ranked items, scores)
+    driver = clients.driver
+    cross_encoder = clients.cross_encoder
+    channel_queries = compile_search_plan(config, driver.provider).channel_queries
+
+    channel_searches: dict[str, Coroutine] = {}
+    if config.edge_config is not None:
+        channel_searches[EDGE_CHANNEL] = edge_search(
             driver,
             cross_encoder,
             query,
@@ -110,10 +431,13 @@ async def search(
             search_filter,
             center_node_uuid,
             bfs_origin_node_uuids,
-            config.limit,
+            limit,
             config.reranker_min_score,
-        ),
-        article_search(
+            get_prefetched_fulltext_search(fulltext_results, EDGE_CHANNEL),
+            channel_queries.get(EDGE_CHANNEL),
+        )
+    if config.article_config is not None:
+        channel_searches[ARTICLE_CHANNEL] = article_search(
             driver,
             cross_encoder,
             query,
@@ -121,10 +445,15 @@ async def search(
             group_ids,
             config.article_config,
             search_filter,
-            config.limit,
+            center_node_uuid,
+            bfs_origin_node_uuids,
+            limit,
             config.reranker_min_score,
-        ),
-        sentence_search(
+            get_prefetched_fulltext_search(fulltext_results, ARTICLE_CHANNEL),
+            channel_queries.get(ARTICLE_CHANNEL),
+        )
+    if config.node_config is not None:
+        channel_searches[SENTENCE_CHANNEL] = sentence_search(
             driver,
             cross_encoder,
             query,
@@ -134,27 +463,261 @@ async def search(
             search_filter,
             center_node_uuid,
             bfs_origin_node_uuids,
-            config.limit,
+            limit,
             config.reranker_min_score,
-        ),
+            get_prefetched_fulltext_search(fulltext_results, SENTENCE_CHANNEL),
+            channel_queries.get(SENTENCE_CHANNEL),
+        )
+
+    return channel_searches
+
+
+def get_prefetched_fulltext_search(
+    fulltext_results: dict[str, list], channel: str
+) -> Coroutine | None:
+    # bm25 hits prefetched by the single-query or batched search paths stand in for the
+    # channel's own fulltext search
+    if channel not in fulltext_results:
+        return None
+
+    return get_prefetched_results(fulltext_results[channel])
+
+
+async def get_prefetched_results(results: list) -> list:
+    return results
+
+
+def get_channel_results(channel: str, items: list, scores: list[float]) -> SearchResults:
+    if channel == EDGE_CHANNEL:
+        return SearchResults(edges=items, edge_reranker_scores=scores)
+    if channel == ARTICLE_CHANNEL:
+        return SearchResults(articles=items, article_reranker_scores=scores)
+    if channel == SENTENCE_CHANNEL:
+        return SearchResults(sentences=items, sentence_reranker_scores=scores)
+
+    raise ValueError(f'Unknown search channel: {channel}')
+
+
+def merge_search_results(channel_results: list[SearchResults]) -> SearchResults:
+    results = SearchResults()
+    for partial_results in channel_results:
+        for field in partial_results.model_fields_set:
+            setattr(results, field, getattr(partial_results, field))
+
+    return results
+
+
+async def search_channels(
+    clients: GraphAgentClients,
+    query: str,
+    query_vector: asyncio.Future | None,
+    group_ids: list[str] | None,
+    config: SearchConfig,
+    search_filter: SearchFilters,
+    center_node_uuid: str | None,
+    bfs_origin_node_uuids: list[str] | None,
+    limit: int,
+    fulltext_results: dict[str, list],
+    deadline: float | None = None,
+) -> SearchResults:
+    channel_searches = get_channel_searches(
+        clients,
+        query,
+        query_vector,
+        group_ids,
+        config,
+        search_filter,
+        center_node_uuid,
+        bfs_origin_node_uuids,
+        limit,
+        fulltext_results,
+    )
+    channel_results = await semaphore_gather(
+        *[
+            run_before_deadline(channel_search, deadline)
+            for channel_search in channel_searches.values()
+        ]
     )
 
-    results = SearchResults(
-        edges=edges,
-        edge_reranker_scores=edge_reranker_scores,
-        # nodes=nodes,
-        # node_reranker_scores=node_reranker_scores,
-        articles=articles,
-        article_reranker_scores=article_reranker_scores,
-        sentences=sentences,
-        sentence_reranker_scores=sentence_reranker_scores,
+    results = merge_search_results(
+        [
+            get_channel_results(channel, *channel_result)
+            for channel, channel_result in zip(channel_searches, channel_results, strict=True)
+            if channel_result is not None
+        ]
     )
+    results.timed_out_channels = [
+        channel
+        for channel, channel_result in zip(channel_searches, channel_results, strict=True)
+        if channel_result is None
+    ]
+    results.degraded = len(results.timed_out_channels) > 0
 
-    latency = (time() - start) * 1000
+    return results
 
-    logger.debug(f'search returned context for query {query} in {latency} ms')
 
-    return results
+def get_search_deadline(budget_ms: float | None) -> float | None:
+    return monotonic() + budget_ms / 1000 if budget_ms is not None else None
+
+
+async def run_before_deadline(coroutine: Coroutine, deadline: float | None) -> Any | None:
+    # returns None when the coroutine is still running at the deadline and has been cancelled
+    if deadline is None:
+        return await coroutine
+
+    try:
+        return await asyncio.wait_for(coroutine, timeout=max(deadline - monotonic(), 0))
+    except (asyncio.TimeoutError, TimeoutError):
+        return None
+
+
+async def search_stream(
+    clients: GraphAgentClients,
+    query: str,
+    group_ids: list[str] | None,
+    config: SearchConfig,
+    search_filter: SearchFilters,
+    center_node_uuid: str | None = None,
+    bfs_origin_node_uuids: list[str] | None = None,
+    query_vector: list[float] | None = None,
+    limit: int | None = None,
+    budget_ms: float | None = None,
+) -> AsyncIterator[SearchChannelResults]:
+    """
+    Streaming variant of search().
+
+    Yields one SearchChannelResults per configured channel as soon as that channel has been
+    retrieved and reranked, so callers can use the edges while slower channels are still
+    running. Once every channel is done the merged results are cached like search() does.
+    Closing the generator early cancels the channels that are still running. budget_ms
+    bounds the search like it does for search(): a channel still running at the deadline
+    is cancelled and yielded empty, marked degraded with itself in timed_out_channels.
+    """
+    start = time()
+    deadline = get_search_deadline(budget_ms)
+
+    if query.strip() == '':
+        return
+
+    plan = compile_search_plan(config, clients.driver.provider)
+    limit = limit if limit is not None else config.limit
+
+    search_cache = clients.search_cache if query_vector is None else None
+    cache_key, cached_results = _cached_search(
+        search_cache,
+        'search',
+        query,
+        plan,
+        limit,
+        search_filter,
+        center_node_uuid,
+        bfs_origin_node_uuids,
+    )
+    if cached_results is not None:
+        for channel in plan.channels:
+            yield SearchChannelResults(
+                channel=channel, results=get_cached_channel_results(cached_results, channel)
+            )
+        return
+
+    query_vector_task = create_query_vector_task(
+        clients.embedder, query, query_vector, plan.needs_query_vector
+    )
+
+    group_ids = None
+    # the deadline is only set in the context the search tasks run in, since the caller's
+    # context is shared with whatever it does between two yields
+    deadline_context = contextvars.copy_context()
+    deadline_context.run(query_deadline.set, deadline)
+    loop = asyncio.get_running_loop()
+    channel_tasks: list[asyncio.Task] = []
+    try:
+        fulltext_results: dict[str, list] = {}
+        if config.execution_mode == SearchExecutionMode.single_query:
+            fulltext_task = loop.create_task(
+                run_before_deadline(
+                    multi_channel_fulltext_search(
+                        clients.driver,
+                        query,
+                        search_filter,
+                        list(plan.fulltext_channels),
+                        group_ids,
+                        2 * limit,
+                        plan.multi_channel_fulltext_query,
+                    ),
+                    deadline,
+                ),
+                context=deadline_context,
+            )
+            channel_tasks.append(fulltext_task)
+            fulltext_results = await fulltext_task or {}
+
+        channel_searches = get_channel_searches(
+            clients,
+            query,
+            query_vector_task,
+            group_ids,
+            config,
+            search_filter,
+            center_node_uuid,
+            bfs_origin_node_uuids,
+            limit,
+            fulltext_results,
+        )
+        channel_tasks = [
+            loop.create_task(
+                run_channel_search(channel, run_before_deadline(channel_search, deadline)),
+                context=deadline_context,
+            )
+            for channel, channel_search in channel_searches.items()
+        ]
+
+        channel_results: list[SearchResults] = []
+        for channel_task in asyncio.as_completed(channel_tasks):
+            channel, channel_result = await channel_task
+            if channel_result is None:
+                results = get_channel_results(channel, [], [])
+                results.degraded = True
+                results.timed_out_channels = [channel]
+                logger.warning(
+                    f'search_stream for query {query} ran out of its {budget_ms} ms budget '
+                    f'before {channel} finished'
+                )
+            else:
+                results = get_channel_results(channel, *channel_result)
+            channel_results.append(results)
+
+            logger.debug(
+                f'search_stream returned {channel} for query {query} in '
+                f'{(time() - start) * 1000} ms'
+            )
+            yield SearchChannelResults(channel=channel, results=results)
+    finally:
+        for channel_task in channel_tasks:
+            if not channel_task.done():
+                channel_task.cancel()
+        release_query_vector_task(query_vector_task)
+
+    if search_cache is not None and not any(results.degraded for results in channel_results):
+        search_cache.set(cache_key, merge_search_results(channel_results))
+
+
+async def run_channel_search(
+    channel: str, channel_search: Coroutine
+) -> tuple[str, tuple[list, list[float]] | None]:
+    return channel, await channel_search
+
+
+def get_cached_channel_results(results: SearchResults, channel: str) -> SearchResults:
+    if channel == EDGE_CHANNEL:
+        return get_channel_results(channel, results.edges, results.edge_reranker_scores)
+    if channel == ARTICLE_CHANNEL:
+        return get_channel_results(channel, results.articles, results.article_reranker_scores)
+    if channel == SENTENCE_CHANNEL:
+        return get_channel_results(channel, results.sentences, results.sentence_reranker_scores)
+
+    raise ValueError(f'Unknown search channel: {channel}')
+
 
 async def vocabulary_search(
     clients: GraphAgentClients,
@@ -165,6 +728,7 @@ async def vocabulary_search(
     center_node_uuid: str | None = None,
     bfs_origin_node_uuids: list[str] | None = None,
     query_vector: list[float] | None = None,
+    limit: int | None = None,
 ) -> SearchResults:
     
     start = time()
@@ -175,29 +739,53 @@ async def vocabulary_search(
     if query.strip() == '':
         return SearchResults()
 
-    query_vector = (
-        query_vector
-        if query_vector is not None
-        else await embedder.create(input_data=[query.replace('\n', ' ')])
+    plan = compile_search_plan(config, clients.driver.provider)
+    limit = limit if limit is not None else config.limit
+
+    search_cache = clients.search_cache if query_vector is None else None
+    cache_key, cached_results = _cached_search(
+        search_cache,
+        'vocabulary',
+        query,
+        plan,
+        limit,
+        search_filter,
+        center_node_uuid,
+        bfs_origin_node_uuids,
+    )
+    if cached_results is not None:
+        logger.debug(f'vocabulary search returned cached context for query {query}')
+        return cached_results
+
+    query_vector_task = create_query_vector_task(
+        embedder, query, query_vector, plan.needs_vocabulary_query_vector
     )
 
     group_ids = None
-    nodes, node_reranker_scores = await node_search(
+    try:
+        nodes, node_reranker_scores = await node_search(
             driver,
             cross_encoder,
             query,
-            query_vector,   
+            query_vector_task,
             group_ids,
             config.node_config,
             search_filter,
-            config.limit,
+            center_node_uuid,
+            bfs_origin_node_uuids,
+            limit,
             config.reranker_min_score,
+            compiled_queries=plan.channel_queries.get(VOCABULARY_CHANNEL),
         )
+    finally:
+        release_query_vector_task(query_vector_task)
 
     results = SearchResults(
         nodes=nodes,
         node_reranker_scores=node_reranker_scores,
     )
+    if search_cache is not None:
+        search_cache.set(cache_key, results)
 
     latency = (time() - start) * 1000
 
@@ -205,11 +793,159 @@ async def vocabulary_search(
 
     return results
 
+
+async def vocabulary_search_many(
+    clients: GraphAgentClients,
+    queries: list[str],
+    group_ids: list[str] | None,
+    config: SearchConfig,
+    search_filter: SearchFilters,
+    center_node_uuid: str | None = None,
+    bfs_origin_node_uuids: list[str] | None = None,
+    limit: int | None = None,
+) -> list[SearchResults]:
+    """
+    Run vocabulary_search() for several queries with one batched embedding call and one
+    UNWIND fulltext statement, returning one SearchResults per query in order.
+    """
+    start = time()
+
+    plan = compile_search_plan(config, clients.driver.provider)
+    limit = limit if limit is not None else config.limit
+    group_ids = None
+
+    results: list[SearchResults | None] = [None] * len(queries)
+    cache_keys: list[str | None] = [None] * len(queries)
+    pending: list[int] = []
+    for index, query in enumerate(queries):
+        if query.strip() == '':
+            results[index] = SearchResults()
+            continue
+        cache_keys[index], cached_results = _cached_search(
+            clients.search_cache,
+            'vocabulary',
+            query,
+            plan,
+            limit,
+            search_filter,
+            center_node_uuid,
+            bfs_origin_node_uuids,
+        )
+        if cached_results is not None:
+            results[index] = cached_results
+            continue
+        pending.append(index)
+
+    if pending:
+        pending_queries = [queries[index] for index in pending]
+        query_vectors, fulltext_results = await semaphore_gather(
+            create_query_vectors(
+                clients.embedder, pending_queries, plan.needs_vocabulary_query_vector
+            ),
+            batch_fulltext_search_channels(
+                clients.driver,
+                pending_queries,
+                search_filter,
+                plan.vocabulary_fulltext_channels,
+                group_ids,
+                2 * limit,
+                plan.batch_fulltext_queries,
+            ),
+        )
+
+        query_vector_tasks = [
+            create_query_vector_task(clients.embedder, query, query_vector, False)
+            for query, query_vector in zip(pending_queries, query_vectors, strict=True)
+        ]
+        try:
+            pending_results = await semaphore_gather(
+                *[
+                    node_search(
+                        clients.driver,
+                        clients.cross_encoder,
+                        query,
+                        query_vector_task,
+                        group_ids,
+                        config.node_config,
+                        search_filter,
+                        center_node_uuid,
+                        bfs_origin_node_uuids,
+                        limit,
+                        config.reranker_min_score,
+                        get_prefetched_fulltext_search(
+                            query_fulltext_results, VOCABULARY_CHANNEL
+                        ),
+                        plan.channel_queries.get(VOCABULARY_CHANNEL),
+                    )
+                    for query, query_vector_task, query_fulltext_results in zip(
+                        pending_queries, query_vector_tasks, fulltext_results, strict=True
+                    )
+                ]
+            )
+        finally:
+            for query_vector_task in query_vector_tasks:
+                release_query_vector_task(query_vector_task)
+
+        for index, (nodes, node_reranker_scores) in zip(pending, pending_results, strict=True):
+            results[index] = SearchResults(nodes=nodes, node_reranker_scores=node_reranker_scores)
+            if clients.search_cache is not None:
+                clients.search_cache.set(cache_keys[index], results[index])
+
+    latency = (time() - start) * 1000
+
+    logger.debug(
+        f'vocabulary_search_many returned context for {len(queries)} queries in {latency} ms'
+    )
+
+    return results
+
+
+async def create_query_vectors(
+    embedder: EmbedderClient, queries: list[str], needs_query_vector: bool
+) -> list[list[float] | None]:
+    if not needs_query_vector:
+        return [None] * len(queries)
+
+    return await embedder.create_batch([query.replace('\n', ' ') for query in queries])
+
+
+async def batch_fulltext_search_channels(
+    driver: GraphDriver,
+    queries: list[str],
+    search_filter: SearchFilters,
+    channels: tuple[str, ...],
+    group_ids: list[str] | None,
+    limit: int,
+    compiled_queries: dict[str, str] | None = None,
+) -> list[dict[str, list]]:
+    # one UNWIND statement per channel, regrouped into the per-query shape search_channels expects
+    compiled_queries = compiled_queries or {}
+    channel_results = await semaphore_gather(
+        *[
+            batch_fulltext_search(
+                driver,
+                queries,
+                search_filter,
+                channel,
+                group_ids,
+                limit,
+                compiled_queries.get(channel),
+            )
+            for channel in channels
+        ]
+    )
+
+    return [
+        {channel: results[index] for channel, results in zip(channels, channel_results, strict=True)}
+        for index in range(len(queries))
+    ]
+
+
 async def edge_search(
     driver: GraphDriver,
     cross_encoder: CrossEncoderClient,
     query: str,
-    query_vector: list[float],
+    query_vector: asyncio.Future | None,
     group_ids: list[str] | None,
     config: EdgeSearchConfig | None,
     search_filter: SearchFilters,
@@ -217,29 +953,40 @@ async def edge_search(
     bfs_origin_node_uuids: list[str] | None = None,
     limit=DEFAULT_SEARCH_LIMIT,
     reranker_min_score: float = 0,
+    fulltext_search: Coroutine | None = None,
+    compiled_queries: dict[Enum, str] | None = None,
 ) -> tuple[list[SemanticEdge], list[float]]:
     if config is None:
         return [], []
 
+    compiled_queries = compiled_queries or {}
+
     # Build search tasks based on configured search methods
     search_tasks = []
     if EdgeSearchMethod.bm25 in config.search_methods:
         search_tasks.append(
-            edge_fulltext_search(driver, query, search_filter, group_ids, 2 * limit)
+            fulltext_search
+            or edge_fulltext_search(
+                driver,
+                query,
+                search_filter,
+                group_ids,
+                2 * limit,
+                compiled_queries.get(EdgeSearchMethod.bm25),
+            )
+        )
+    if EdgeSearchMethod.cosine_similarity in config.search_methods:
+        search_tasks.append(
+            edge_similarity_search(
+                driver,
+                query_vector,
+                search_filter,
+                group_ids,
+                2 * limit,
+                config.sim_min_score,
+                compiled_queries.get(EdgeSearchMethod.cosine_similarity),
+            )
         )
-    # if EdgeSearchMethod.cosine_similarity in config.search_methods:
-    #     search_tasks.append(
-    #         edge_similarity_search(
-    #             driver,
-    #             query_vector,
-    #             None,
-    #             None,
-    #             search_filter,
-    #             group_ids,
-    #             2 * limit,
-    #             config.sim_min_score,
-    #         )
-    #     )
     if EdgeSearchMethod.bfs in config.search_methods:
         search_tasks.append(
             edge_bfs_search(
@@ -249,6 +996,7 @@ async def edge_search(
                 search_filter,
                 group_ids,
                 2 * limit,
+                config.bfs_max_fanout,
             )
         )
 
@@ -258,7 +1006,9 @@ async def edge_search(
         search_results = list(await semaphore_gather(*search_tasks))
 
     if EdgeSearchMethod.bfs in config.search_methods and bfs_origin_node_uuids is None:
-        source_node_uuids = [edge.source_node_uuid for result in search_results for edge in result]
+        source_node_uuids = list(
+            dict.fromkeys(edge.source_node_id for result in search_results for edge in result)
+        )
         search_results.append(
             await edge_bfs_search(
                 driver,
@@ -267,9 +1017,15 @@ async def edge_search(
                 search_filter,
                 group_ids,
                 2 * limit,
+                config.bfs_max_fanout,
             )
         )
 
+    if config.near_duplicate_distance is not None:
+        search_results = collapse_near_duplicates(
+            search_results, lambda edge: edge.summary, config.near_duplicate_distance
+        )
+
     edge_uuid_map = {edge.id: edge for result in search_results for edge in result}
 
     reranked_uuids: list[str] = []
@@ -289,12 +1045,16 @@ async def edge_search(
     #         reranker_min_score,
     #     )
     elif config.reranker == EdgeReranker.cross_encoder:
-        fact_to_uuid_map = {edge.fact: edge.id for edge in list(edge_uuid_map.values())[:limit]}
-        reranked_facts = await cross_encoder.rank(query, list(fact_to_uuid_map.keys()))
-        reranked_uuids = [
-            fact_to_uuid_map[fact] for fact, score in reranked_facts if score >= reranker_min_score
-        ]
-        edge_scores = [score for _, score in reranked_facts if score >= reranker_min_score]
+        reranked_uuids, edge_scores = await cascade_rerank(
+            cross_encoder,
+            query,
+            [[edge.id for edge in result] for result in search_results],
+            {edge.id: edge.summary for edge in edge_uuid_map.values()},
+            limit,
+            config.cross_encoder_top_k,
+            config.cross_encoder_timeout,
+            reranker_min_score,
+        )
     elif config.reranker == EdgeReranker.node_distance:
         if center_node_uuid is None:
             raise SearchRerankerError('No center node provided for Node Distance reranker')
@@ -332,7 +1092,7 @@ async def node_search(
     driver: GraphDriver,
     cross_encoder: CrossEncoderClient,
     query: str,
-    query_vector: list[float],
+    query_vector: asyncio.Future | None,
     group_ids: list[str] | None,
     config: NodeSearchConfig | None,
     search_filter: SearchFilters,
@@ -340,22 +1100,40 @@ async def node_search(
     bfs_origin_node_uuids: list[str] | None = None,
     limit=DEFAULT_SEARCH_LIMIT,
     reranker_min_score: float = 0,
+    fulltext_search: Coroutine | None = None,
+    compiled_queries: dict[Enum, str] | None = None,
 ) -> tuple[list[VocabularyNode], list[float]]:
     if config is None:
         return [], []
 
+    compiled_queries = compiled_queries or {}
+
     # Build search tasks based on configured search methods
     search_tasks = []
     if NodeSearchMethod.bm25 in config.search_methods:
         search_tasks.append(
-            node_fulltext_search(driver, query, search_filter, group_ids, 2 * limit)
+            fulltext_search
+            or node_fulltext_search(
+                driver,
+                query,
+                search_filter,
+                group_ids,
+                2 * limit,
+                compiled_queries.get(NodeSearchMethod.bm25),
+            )
+        )
+    if NodeSearchMethod.cosine_similarity in config.search_methods:
+        search_tasks.append(
+            node_similarity_search(
+                driver,
+                query_vector,
+                search_filter,
+                group_ids,
+                2 * limit,
+                config.sim_min_score,
+                compiled_queries.get(NodeSearchMethod.cosine_similarity),
+            )
         )
-    # if NodeSearchMethod.cosine_similarity in config.search_methods:
-    #     search_tasks.append(
-    #         node_similarity_search(
-    #             driver, query_vector, search_filter, group_ids, 2 * limit, config.sim_min_score
-    #         )
-    #     )
     # if NodeSearchMethod.bfs in config.search_methods:
     #     search_tasks.append(
     #         node_bfs_search(
@@ -398,22 +1176,25 @@ async def node_search(
             driver, list(node_uuid_map.values())
         )
 
-        reranked_uuids, node_scores = maximal_marginal_relevance(
-            query_vector,
+        reranked_uuids, node_scores = mmr_rerank(
+            await resolve_query_vector(query_vector),
+            search_result_uuids,
             search_result_uuids_and_vectors,
             config.mmr_lambda,
             reranker_min_score,
+            limit,
         )
     elif config.reranker == NodeReranker.cross_encoder:
-        name_to_uuid_map = {node.name: node.uuid for node in list(node_uuid_map.values())}
-
-        reranked_node_names = await cross_encoder.rank(query, list(name_to_uuid_map.keys()))
-        reranked_uuids = [
-            name_to_uuid_map[name]
-            for name, score in reranked_node_names
-            if score >= reranker_min_score
-        ]
-        node_scores = [score for _, score in reranked_node_names if score >= reranker_min_score]
+        reranked_uuids, node_scores = await cascade_rerank(
+            cross_encoder,
+            query,
+            [[node.id for node in result] for result in search_results],
+            {node.id: node.name for node in node_uuid_map.values()},
+            limit,
+            config.cross_encoder_top_k,
+            config.cross_encoder_timeout,
+            reranker_min_score,
+        )
     elif config.reranker == NodeReranker.episode_mentions:
         reranked_uuids, node_scores = await episode_mentions_reranker(
             driver, search_result_uuids, min_score=reranker_min_score
@@ -436,7 +1217,7 @@ async def sentence_search(
     driver: GraphDriver,
     cross_encoder: CrossEncoderClient,
     query: str,
-    query_vector: list[float],
+    query_vector: asyncio.Future | None,
     group_ids: list[str] | None,
     config: NodeSearchConfig | None,
     search_filter: SearchFilters,
@@ -444,22 +1225,40 @@ async def sentence_search(
     bfs_origin_node_uuids: list[str] | None = None,
     limit=DEFAULT_SEARCH_LIMIT,
     reranker_min_score: float = 0,
+    fulltext_search: Coroutine | None = None,
+    compiled_queries: dict[Enum, str] | None = None,
 ) -> tuple[list[SentenceNode], list[float]]:
     if config is None:
         return [], []
 
+    compiled_queries = compiled_queries or {}
+
     # Build search tasks based on configured search methods
     search_tasks = []
     if NodeSearchMethod.bm25 in config.search_methods:
         search_tasks.append(
-            sentence_fulltext_search(driver, query, search_filter, group_ids, 2 * limit)
+            fulltext_search
+            or sentence_fulltext_search(
+                driver,
+                query,
+                search_filter,
+                group_ids,
+                2 * limit,
+                compiled_queries.get(NodeSearchMethod.bm25),
+            )
+        )
+    if NodeSearchMethod.cosine_similarity in config.search_methods:
+        search_tasks.append(
+            sentence_similarity_search(
+                driver,
+                query_vector,
+                search_filter,
+                group_ids,
+                2 * limit,
+                config.sim_min_score,
+                compiled_queries.get(NodeSearchMethod.cosine_similarity),
+            )
         )
-    # if NodeSearchMethod.cosine_similarity in config.search_methods:
-    #     search_tasks.append(
-    #         node_similarity_search(
-    #             driver, query_vector, search_filter, group_ids, 2 * limit, config.sim_min_score
-    #         )
-    #     )
     # if NodeSearchMethod.bfs in config.search_methods:
     #     search_tasks.append(
     #         node_bfs_search(
@@ -490,6 +1289,11 @@ async def sentence_search(
     #         )
     #     )
 
+    if config.near_duplicate_distance is not None:
+        search_results = collapse_near_duplicates(
+            search_results, lambda node: node.text, config.near_duplicate_distance
+        )
+
     search_result_uuids = [[node.id for node in result] for result in search_results]
     node_uuid_map = {node.id: node for result in search_results for node in result}
 
@@ -497,27 +1301,30 @@ async def sentence_search(
     node_scores: list[float] = []
     if config.reranker == NodeReranker.rrf:
         reranked_uuids, node_scores = rrf(search_result_uuids, min_score=reranker_min_score)
-    # elif config.reranker == NodeReranker.mmr:
-    #     search_result_uuids_and_vectors = await get_embeddings_for_vocabulary(
-    #         driver, list(node_uuid_map.values())
-    #     )
+    elif config.reranker == NodeReranker.mmr:
+        search_result_uuids_and_vectors = await get_embeddings_for_sentences(
+            driver, list(node_uuid_map.values())
+        )
 
-    #     reranked_uuids, node_scores = maximal_marginal_relevance(
-    #         query_vector,
-    #         search_result_uuids_and_vectors,
-    #         config.mmr_lambda,
-    #         reranker_min_score,
-    #     )
+        reranked_uuids, node_scores = mmr_rerank(
+            await resolve_query_vector(query_vector),
+            search_result_uuids,
+            search_result_uuids_and_vectors,
+            config.mmr_lambda,
+            reranker_min_score,
+            limit,
+        )
     elif config.reranker == NodeReranker.cross_encoder:
-        name_to_uuid_map = {node.name: node.id for node in list(node_uuid_map.values())}
-
-        reranked_node_names = await cross_encoder.rank(query, list(name_to_uuid_map.keys()))
-        reranked_uuids = [
-            name_to_uuid_map[name]
-            for name, score in reranked_node_names
-            if score >= reranker_min_score
-        ]
-        node_scores = [score for _, score in reranked_node_names if score >= reranker_min_score]
+        reranked_uuids, node_scores = await cascade_rerank(
+            cross_encoder,
+            query,
+            [[node.id for node in result] for result in search_results],
+            {node.id: node.text for node in node_uuid_map.values()},
+            limit,
+            config.cross_encoder_top_k,
+            config.cross_encoder_timeout,
+            reranker_min_score,
+        )
     # elif config.reranker == NodeReranker.episode_mentions:
     #     reranked_uuids, node_scores = await episode_mentions_reranker(
     #         driver, search_result_uuids, min_score=reranker_min_score
@@ -540,7 +1347,7 @@ async def article_search(
     driver: GraphDriver,
     cross_encoder: CrossEncoderClient,
     query: str,
-    query_vector: list[float],
+    query_vector: asyncio.Future | None,
     group_ids: list[str] | None,
     config: ArticleSearchConfig | None,
     search_filter: SearchFilters,
@@ -548,16 +1355,28 @@ async def article_search(
     bfs_origin_node_uuids: list[str] | None = None,
     limit=DEFAULT_SEARCH_LIMIT,
     reranker_min_score: float = 0,
+    fulltext_search: Coroutine | None = None,
+    compiled_queries: dict[Enum, str] | None = None,
 ) -> tuple[list[ArticleNode], list[float]]:
     if config is None:
         return [], []
 
+    compiled_queries = compiled_queries or {}
+
     group_ids = None
     # Build search tasks based on configured search methods
     search_tasks = []
     if ArticleSearchMethod.bm25 in config.search_methods:
         search_tasks.append(
-            article_fulltext_search(driver, query, search_filter, group_ids, 2 * limit)
+            fulltext_search
+            or article_fulltext_search(
+                driver,
+                query,
+                search_filter,
+                group_ids,
+                2 * limit,
+                compiled_queries.get(ArticleSearchMethod.bm25),
+            )
         )
     # if NodeSearchMethod.cosine_similarity in config.search_methods:
     #     search_tasks.append(
@@ -602,27 +1421,30 @@ async def article_search(
     article_scores: list[float] = []
     if config.reranker == ArticleReranker.rrf:
         reranked_uuids, article_scores = rrf(search_result_uuids, min_score=reranker_min_score)
-    # elif config.reranker == NodeReranker.mmr:
-    #     search_result_uuids_and_vectors = await get_embeddings_for_vocabulary(
-    #         driver, list(node_uuid_map.values())
-    #     )
+    elif config.reranker == ArticleReranker.mmr:
+        search_result_uuids_and_vectors = await get_embeddings_for_articles(
+            driver, list(article_uuid_map.values())
+        )
 
-    #     reranked_uuids, node_scores = maximal_marginal_relevance(
-    #         query_vector,
-    #         search_result_uuids_and_vectors,
-    #         config.mmr_lambda,
-    #         reranker_min_score,
-    #     )
+        reranked_uuids, article_scores = mmr_rerank(
+            await resolve_query_vector(query_vector),
+            search_result_uuids,
+            search_result_uuids_and_vectors,
+            config.mmr_lambda,
+            reranker_min_score,
+            limit,
+        )
     elif config.reranker == ArticleReranker.cross_encoder:
-        name_to_uuid_map = {article.name: article.id for article in list(article_uuid_map.values())}
-
-        reranked_node_names = await cross_encoder.rank(query, list(name_to_uuid_map.keys()))
-        reranked_uuids = [
-            name_to_uuid_map[name]
-            for name, score in reranked_node_names
-            if score >= reranker_min_score
-        ]
-        article_scores = [score for _, score in reranked_node_names if score >= reranker_min_score]
+        reranked_uuids, article_scores = await cascade_rerank(
+            cross_encoder,
+            query,
+            [[article.id for article in result] for result in search_results],
+            {article.id: article.title for article in article_uuid_map.values()},
+            limit,
+            config.cross_encoder_top_k,
+            config.cross_encoder_timeout,
+            reranker_min_score,
+        )
     # elif config.reranker == NodeReranker.episode_mentions:
     #     reranked_uuids, node_scores = await episode_mentions_reranker(
     #         driver, search_result_uuids, min_score=reranker_min_score
@@ -0,0 +1,94 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any
+
+from helpers import LRUCache
+from search.search_config import SearchResults
+from search.search_filters import SearchFilters
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_CACHE_SIZE = 1024
+DEFAULT_SEARCH_CACHE_TTL = 5 * 60
+
+
+def normalize_search_query(query: str) -> str:
+    return ' '.join(query.split())
+
+
+class SearchResultCache:
+    """
+    Bounded LRU + TTL cache of whole SearchResults.
+
+    Entries are keyed by the search kind, the normalized query, the SearchPlan config key,
+    the limit, the SearchFilters and the center / BFS origin nodes, so a hit is served
+    without touching the graph, the embedder or the reranker. Results are deep-copied when
+    stored and again on every hit, so callers (and lazy embedding hydration) may mutate
+    what they get back. Call invalidate() after writing to the graph.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_SEARCH_CACHE_SIZE,
+        ttl: float | None = DEFAULT_SEARCH_CACHE_TTL,
+    ):
+        self.cache = LRUCache(max_size=max_size, ttl=ttl)
+        self.invalidations = 0
+
+    def get_cache_key(
+        self,
+        kind: str,
+        query: str,
+        config_key: str,
+        limit: int,
+        search_filter: SearchFilters,
+        center_node_uuid: str | None = None,
+        bfs_origin_node_uuids: list[str] | None = None,
+        group_ids: list[str] | None = None,
+    ) -> str:
+        key_data = {
+            'kind': kind,
+            'query': normalize_search_query(query),
+            'config': config_key,
+            'limit': limit,
+            'filters': search_filter.model_dump(mode='json'),
+            'center_node_uuid': center_node_uuid,
+            'bfs_origin_node_uuids': sorted(bfs_origin_node_uuids)
+            if bfs_origin_node_uuids is not None
+            else None,
+            'group_ids': sorted(group_ids) if group_ids is not None else None,
+        }
+        key_str = json.dumps(key_data, sort_keys=True)
+        return hashlib.md5(key_str.encode()).hexdigest()
+
+    def get(self, key: str) -> SearchResults | None:
+        results = self.cache.get(key)
+        return results.model_copy(deep=True) if results is not None else None
+
+    def set(self, key: str, results: SearchResults):
+        self.cache.set(key, results.model_copy(deep=True))
+
+    def invalidate(self):
+        self.cache.clear()
+        self.invalidations += 1
+        logger.debug('Invalidated search result cache')
+
+    def stats(self) -> dict[str, Any]:
+        return {**self.cache.stats(), 'invalidations': self.invalidations}
@@ -16,13 +16,17 @@ limitations under the License.
 
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from edges import SemanticEdge
 from nodes import VocabularyNode, ArticleNode, SentenceNode
 from search.search_utils import (
+    DEFAULT_CROSS_ENCODER_TIMEOUT,
+    DEFAULT_CROSS_ENCODER_TOP_K,
     DEFAULT_MIN_SCORE,
     DEFAULT_MMR_LAMBDA,
+    DEFAULT_NEAR_DUPLICATE_DISTANCE,
+    MAX_BFS_FANOUT,
     MAX_SEARCH_DEPTH,
 )
 
@@ -68,6 +72,7 @@ class NodeReranker(Enum):
 
 class ArticleReranker(Enum):
     rrf = 'reciprocal_rank_fusion'
+    mmr = 'mmr'
     cross_encoder = 'cross_encoder'
 
 
@@ -77,32 +82,57 @@ class CommunityReranker(Enum):
     cross_encoder = 'cross_encoder'
 
 
+class SearchExecutionMode(Enum):
+    fan_out = 'fan_out'
+    single_query = 'single_query'
+
+
 class EdgeSearchConfig(BaseModel):
-    search_methods: list[EdgeSearchMethod]
+    model_config = ConfigDict(frozen=True)
+
+    search_methods: tuple[EdgeSearchMethod, ...]
     reranker: EdgeReranker = Field(default=EdgeReranker.rrf)
     sim_min_score: float = Field(default=DEFAULT_MIN_SCORE)
     mmr_lambda: float = Field(default=DEFAULT_MMR_LAMBDA)
     bfs_max_depth: int = Field(default=MAX_SEARCH_DEPTH)
+    bfs_max_fanout: int = Field(default=MAX_BFS_FANOUT)
+    # the cross_encoder reranker only scores the top-k fused candidates, within the timeout
+    cross_encoder_top_k: int = Field(default=DEFAULT_CROSS_ENCODER_TOP_K)
+    cross_encoder_timeout: float | None = Field(default=DEFAULT_CROSS_ENCODER_TIMEOUT)
+    # collapse candidates whose texts are within this SimHash distance before reranking;
+    # None disables the near-duplicate stage
+    near_duplicate_distance: int | None = Field(default=DEFAULT_NEAR_DUPLICATE_DISTANCE)
 
 
 class NodeSearchConfig(BaseModel):
-    search_methods: list[NodeSearchMethod]
+    model_config = ConfigDict(frozen=True)
+
+    search_methods: tuple[NodeSearchMethod, ...]
     reranker: NodeReranker = Field(default=NodeReranker.rrf)
     sim_min_score: float = Field(default=DEFAULT_MIN_SCORE)
     mmr_lambda: float = Field(default=DEFAULT_MMR_LAMBDA)
     bfs_max_depth: int = Field(default=MAX_SEARCH_DEPTH)
+    cross_encoder_top_k: int = Field(default=DEFAULT_CROSS_ENCODER_TOP_K)
+    cross_encoder_timeout: float | None = Field(default=DEFAULT_CROSS_ENCODER_TIMEOUT)
+    near_duplicate_distance: int | None = Field(default=DEFAULT_NEAR_DUPLICATE_DISTANCE)
 
 
 class ArticleSearchConfig(BaseModel):
-    search_methods: list[ArticleSearchMethod]
+    model_config = ConfigDict(frozen=True)
+
+    search_methods: tuple[ArticleSearchMethod, ...]
     reranker: ArticleReranker = Field(default=ArticleReranker.rrf)
     sim_min_score: float = Field(default=DEFAULT_MIN_SCORE)
     mmr_lambda: float = Field(default=DEFAULT_MMR_LAMBDA)
     bfs_max_depth: int = Field(default=MAX_SEARCH_DEPTH)
+    cross_encoder_top_k: int = Field(default=DEFAULT_CROSS_ENCODER_TOP_K)
+    cross_encoder_timeout: float | None = Field(default=DEFAULT_CROSS_ENCODER_TIMEOUT)
 
 
 class CommunitySearchConfig(BaseModel):
-    search_methods: list[CommunitySearchMethod]
+    model_config = ConfigDict(frozen=True)
+
+    search_methods: tuple[CommunitySearchMethod, ...]
     reranker: CommunityReranker = Field(default=CommunityReranker.rrf)
     sim_min_score: float = Field(default=DEFAULT_MIN_SCORE)
     mmr_lambda: float = Field(default=DEFAULT_MMR_LAMBDA)
@@ -110,12 +140,17 @@ class CommunitySearchConfig(BaseModel):
 
 
 class SearchConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     edge_config: EdgeSearchConfig | None = Field(default=None)
     node_config: NodeSearchConfig | None = Field(default=None)
     article_config: ArticleSearchConfig | None = Field(default=None)
     community_config: CommunitySearchConfig | None = Field(default=None)
     limit: int = Field(default=DEFAULT_SEARCH_LIMIT)
     reranker_min_score: float = Field(default=0)
+    # fan_out runs one query per search method; single_query fetches the fulltext hits of
+    # every channel with one Cypher statement
+    execution_mode: SearchExecutionMode = Field(default=SearchExecutionMode.fan_out)
 
 
 class SearchResults(BaseModel):
@@ -126,4 +161,13 @@ class SearchResults(BaseModel):
     articles: list[ArticleNode] = Field(default_factory=list)
     article_reranker_scores: list[float] = Field(default_factory=list)
     sentences: list[SentenceNode] = Field(default_factory=list)
-    sentence_reranker_scores: list[float] = Field(default_factory=list)
\ No newline at end of file
+    sentence_reranker_scores: list[float] = Field(default_factory=list)
+    # set when a search budget ran out; the channels listed in timed_out_channels are empty
+    degraded: bool = False
+    timed_out_channels: list[str] = Field(default_factory=list)
+
+
+class SearchChannelResults(BaseModel):
+    # Results of a single channel, yielded by search_stream; only that channel's fields are set
+    channel: str
+    results: SearchResults
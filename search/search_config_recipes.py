@@ -33,21 +33,21 @@ from search.search_config import (
 # Performs a hybrid search with rrf reranking over edges, nodes, and communities
 COMBINED_HYBRID_SEARCH_RRF = SearchConfig(
     edge_config=EdgeSearchConfig(
-        search_methods=[EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity],
+        search_methods=(EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity),
         reranker=EdgeReranker.rrf,
     ),
     node_config=NodeSearchConfig(
-        search_methods=[NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity],
+        search_methods=(NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity),
         reranker=NodeReranker.rrf,
     ),
     article_config=ArticleSearchConfig(
-        search_methods=[
+        search_methods=(
             ArticleSearchMethod.bm25,
-        ],
+        ),
         reranker=ArticleReranker.rrf,
     ),
     community_config=CommunitySearchConfig(
-        search_methods=[CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity],
+        search_methods=(CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity),
         reranker=CommunityReranker.rrf,
     ),
 )
@@ -55,23 +55,23 @@ COMBINED_HYBRID_SEARCH_RRF = SearchConfig(
 # Performs a hybrid search with mmr reranking over edges, nodes, and communities
 COMBINED_HYBRID_SEARCH_MMR = SearchConfig(
     edge_config=EdgeSearchConfig(
-        search_methods=[EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity],
+        search_methods=(EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity),
         reranker=EdgeReranker.mmr,
         mmr_lambda=1,
     ),
     node_config=NodeSearchConfig(
-        search_methods=[NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity],
+        search_methods=(NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity),
         reranker=NodeReranker.mmr,
         mmr_lambda=1,
     ),
     article_config=ArticleSearchConfig(
-        search_methods=[
+        search_methods=(
             ArticleSearchMethod.bm25,
-        ],
+        ),
         reranker=ArticleReranker.rrf,
     ),
     community_config=CommunitySearchConfig(
-        search_methods=[CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity],
+        search_methods=(CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity),
         reranker=CommunityReranker.mmr,
         mmr_lambda=1,
     ),
@@ -79,22 +79,22 @@ COMBINED_HYBRID_SEARCH_MMR = SearchConfig(
 
 COMBINED_HYBRID_SEARCH_NODE_DISTANCE = SearchConfig(
     edge_config=EdgeSearchConfig(
-        search_methods=[EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity],
+        search_methods=(EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity),
         reranker=EdgeReranker.node_distance,
     ),
     node_config=NodeSearchConfig(
-        search_methods=[NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity],
+        search_methods=(NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity),
         reranker=NodeReranker.mmr,
         mmr_lambda=1,
     ),
     article_config=ArticleSearchConfig(
-        search_methods=[
+        search_methods=(
             ArticleSearchMethod.bm25,
-        ],
+        ),
         reranker=ArticleReranker.rrf,
     ),
     community_config=CommunitySearchConfig(
-        search_methods=[CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity],
+        search_methods=(CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity),
         reranker=CommunityReranker.rrf,
     ),
 )
@@ -102,29 +102,29 @@ COMBINED_HYBRID_SEARCH_NODE_DISTANCE = SearchConfig(
 # Performs a full-text search, similarity search, and bfs with cross_encoder reranking over edges, nodes, and communities
 COMBINED_HYBRID_SEARCH_CROSS_ENCODER = SearchConfig(
     edge_config=EdgeSearchConfig(
-        search_methods=[
+        search_methods=(
             EdgeSearchMethod.bm25,
             EdgeSearchMethod.cosine_similarity,
             EdgeSearchMethod.bfs,
-        ],
+        ),
         reranker=EdgeReranker.cross_encoder,
     ),
     node_config=NodeSearchConfig(
-        search_methods=[
+        search_methods=(
             NodeSearchMethod.bm25,
             NodeSearchMethod.cosine_similarity,
             NodeSearchMethod.bfs,
-        ],
+        ),
         reranker=NodeReranker.cross_encoder,
     ),
     article_config=ArticleSearchConfig(
-        search_methods=[
+        search_methods=(
             ArticleSearchMethod.bm25,
-        ],
+        ),
         reranker=ArticleReranker.cross_encoder,
     ),
     community_config=CommunitySearchConfig(
-        search_methods=[CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity],
+        search_methods=(CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity),
         reranker=CommunityReranker.cross_encoder,
     ),
 )
@@ -132,7 +132,7 @@ COMBINED_HYBRID_SEARCH_CROSS_ENCODER = SearchConfig(
 # performs a hybrid search over edges with rrf reranking
 EDGE_HYBRID_SEARCH_RRF = SearchConfig(
     edge_config=EdgeSearchConfig(
-        search_methods=[EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity],
+        search_methods=(EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity),
         reranker=EdgeReranker.rrf,
     )
 )
@@ -140,7 +140,7 @@ EDGE_HYBRID_SEARCH_RRF = SearchConfig(
 # performs a hybrid search over edges with mmr reranking
 EDGE_HYBRID_SEARCH_MMR = SearchConfig(
     edge_config=EdgeSearchConfig(
-        search_methods=[EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity],
+        search_methods=(EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity),
         reranker=EdgeReranker.mmr,
     )
 )
@@ -148,7 +148,7 @@ EDGE_HYBRID_SEARCH_MMR = SearchConfig(
 # performs a hybrid search over edges with node distance reranking
 EDGE_HYBRID_SEARCH_NODE_DISTANCE = SearchConfig(
     edge_config=EdgeSearchConfig(
-        search_methods=[EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity],
+        search_methods=(EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity),
         reranker=EdgeReranker.node_distance,
     ),
 )
@@ -156,7 +156,7 @@ EDGE_HYBRID_SEARCH_NODE_DISTANCE = SearchConfig(
 # performs a hybrid search over edges with episode mention reranking
 EDGE_HYBRID_SEARCH_EPISODE_MENTIONS = SearchConfig(
     edge_config=EdgeSearchConfig(
-        search_methods=[EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity],
+        search_methods=(EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity),
         reranker=EdgeReranker.episode_mentions,
     )
 )
@@ -164,11 +164,11 @@ EDGE_HYBRID_SEARCH_EPISODE_MENTIONS = SearchConfig(
 # performs a hybrid search over edges with cross encoder reranking
 EDGE_HYBRID_SEARCH_CROSS_ENCODER = SearchConfig(
     edge_config=EdgeSearchConfig(
-        search_methods=[
+        search_methods=(
             EdgeSearchMethod.bm25,
             EdgeSearchMethod.cosine_similarity,
             EdgeSearchMethod.bfs,
-        ],
+        ),
         reranker=EdgeReranker.cross_encoder,
     ),
     limit=10,
@@ -177,7 +177,7 @@ EDGE_HYBRID_SEARCH_CROSS_ENCODER = SearchConfig(
 # performs a hybrid search over nodes with rrf reranking
 NODE_HYBRID_SEARCH_RRF = SearchConfig(
     node_config=NodeSearchConfig(
-        search_methods=[NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity],
+        search_methods=(NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity),
         reranker=NodeReranker.rrf,
     )
 )
@@ -185,7 +185,7 @@ NODE_HYBRID_SEARCH_RRF = SearchConfig(
 # performs a hybrid search over nodes with mmr reranking
 NODE_HYBRID_SEARCH_MMR = SearchConfig(
     node_config=NodeSearchConfig(
-        search_methods=[NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity],
+        search_methods=(NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity),
         reranker=NodeReranker.mmr,
     )
 )
@@ -193,7 +193,7 @@ NODE_HYBRID_SEARCH_MMR = SearchConfig(
 # performs a hybrid search over nodes with node distance reranking
 NODE_HYBRID_SEARCH_NODE_DISTANCE = SearchConfig(
     node_config=NodeSearchConfig(
-        search_methods=[NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity],
+        search_methods=(NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity),
         reranker=NodeReranker.node_distance,
     )
 )
@@ -201,7 +201,7 @@ NODE_HYBRID_SEARCH_NODE_DISTANCE = SearchConfig(
 # performs a hybrid search over nodes with episode mentions reranking
 NODE_HYBRID_SEARCH_EPISODE_MENTIONS = SearchConfig(
     node_config=NodeSearchConfig(
-        search_methods=[NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity],
+        search_methods=(NodeSearchMethod.bm25, NodeSearchMethod.cosine_similarity),
         reranker=NodeReranker.episode_mentions,
     )
 )
@@ -209,11 +209,11 @@ NODE_HYBRID_SEARCH_EPISODE_MENTIONS = SearchConfig(
 # performs a hybrid search over nodes with episode mentions reranking
 NODE_HYBRID_SEARCH_CROSS_ENCODER = SearchConfig(
     node_config=NodeSearchConfig(
-        search_methods=[
+        search_methods=(
             NodeSearchMethod.bm25,
             NodeSearchMethod.cosine_similarity,
             NodeSearchMethod.bfs,
-        ],
+        ),
         reranker=NodeReranker.cross_encoder,
     ),
     limit=10,
@@ -222,7 +222,7 @@ NODE_HYBRID_SEARCH_CROSS_ENCODER = SearchConfig(
 # performs a hybrid search over communities with rrf reranking
 COMMUNITY_HYBRID_SEARCH_RRF = SearchConfig(
     community_config=CommunitySearchConfig(
-        search_methods=[CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity],
+        search_methods=(CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity),
         reranker=CommunityReranker.rrf,
     )
 )
@@ -230,7 +230,7 @@ COMMUNITY_HYBRID_SEARCH_RRF = SearchConfig(
 # performs a hybrid search over communities with mmr reranking
 COMMUNITY_HYBRID_SEARCH_MMR = SearchConfig(
     community_config=CommunitySearchConfig(
-        search_methods=[CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity],
+        search_methods=(CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity),
         reranker=CommunityReranker.mmr,
     )
 )
@@ -238,7 +238,7 @@ COMMUNITY_HYBRID_SEARCH_MMR = SearchConfig(
 # performs a hybrid search over communities with mmr reranking
 COMMUNITY_HYBRID_SEARCH_CROSS_ENCODER = SearchConfig(
     community_config=CommunitySearchConfig(
-        search_methods=[CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity],
+        search_methods=(CommunitySearchMethod.bm25, CommunitySearchMethod.cosine_similarity),
         reranker=CommunityReranker.cross_encoder,
     ),
     limit=3,
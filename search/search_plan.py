@@ -0,0 +1,219 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+
+from driver.driver import GraphProvider
+from search.search_config import (
+    ArticleReranker,
+    ArticleSearchConfig,
+    ArticleSearchMethod,
+    EdgeReranker,
+    EdgeSearchConfig,
+    EdgeSearchMethod,
+    NodeReranker,
+    NodeSearchConfig,
+    NodeSearchMethod,
+    SearchConfig,
+)
+from search.search_utils import (
+    ARTICLE_CHANNEL,
+    EDGE_CHANNEL,
+    SENTENCE_CHANNEL,
+    VOCABULARY_CHANNEL,
+    get_article_fulltext_search_query,
+    get_batch_fulltext_query,
+    get_edge_fulltext_search_query,
+    get_edge_similarity_search_query,
+    get_multi_channel_fulltext_query,
+    get_sentence_fulltext_search_query,
+    get_sentence_similarity_search_query,
+    get_vocabulary_fulltext_search_query,
+    get_vocabulary_similarity_search_query,
+)
+from models.edges.edge_db_queries import SEMANTIC_EDGE_RETURN
+
+SEARCH_PLAN_CACHE_SIZE = 256
+
+# Search methods and rerankers that consume the query vector in each channel. Methods listed in a
+# config but not run by the channel are left out, so they never trigger an embedding call.
+EDGE_VECTOR_SEARCH_METHODS: set[EdgeSearchMethod] = {EdgeSearchMethod.cosine_similarity}
+EDGE_VECTOR_RERANKERS: set[EdgeReranker] = set()
+NODE_VECTOR_SEARCH_METHODS: set[NodeSearchMethod] = {NodeSearchMethod.cosine_similarity}
+NODE_VECTOR_RERANKERS: set[NodeReranker] = {NodeReranker.mmr}
+SENTENCE_VECTOR_SEARCH_METHODS: set[NodeSearchMethod] = {NodeSearchMethod.cosine_similarity}
+SENTENCE_VECTOR_RERANKERS: set[NodeReranker] = {NodeReranker.mmr}
+ARTICLE_VECTOR_SEARCH_METHODS: set[ArticleSearchMethod] = set()
+ARTICLE_VECTOR_RERANKERS: set[ArticleReranker] = {ArticleReranker.mmr}
+
+
+def uses_query_vector(
+    config: EdgeSearchConfig | NodeSearchConfig | ArticleSearchConfig | None,
+    vector_search_methods: set,
+    vector_rerankers: set,
+) -> bool:
+    if config is None:
+        return False
+
+    return config.reranker in vector_rerankers or any(
+        search_method in vector_search_methods for search_method in config.search_methods
+    )
+
+
+def get_channels(config: SearchConfig) -> list[str]:
+    channels: list[str] = []
+    if config.edge_config is not None:
+        channels.append(EDGE_CHANNEL)
+    if config.article_config is not None:
+        channels.append(ARTICLE_CHANNEL)
+    if config.node_config is not None:
+        channels.append(SENTENCE_CHANNEL)
+
+    return channels
+
+
+def get_fulltext_channels(config: SearchConfig) -> list[str]:
+    channels: list[str] = []
+    if config.edge_config is not None and EdgeSearchMethod.bm25 in config.edge_config.search_methods:
+        channels.append(EDGE_CHANNEL)
+    if (
+        config.article_config is not None
+        and ArticleSearchMethod.bm25 in config.article_config.search_methods
+    ):
+        channels.append(ARTICLE_CHANNEL)
+    if config.node_config is not None and NodeSearchMethod.bm25 in config.node_config.search_methods:
+        channels.append(SENTENCE_CHANNEL)
+
+    return channels
+
+
+def get_channel_queries(
+    config: SearchConfig, provider: GraphProvider
+) -> dict[str, dict[Enum, str]]:
+    # the unfiltered Cypher of every search method each channel runs
+    channel_queries: dict[str, dict[Enum, str]] = {}
+    if config.edge_config is not None:
+        methods = config.edge_config.search_methods
+        channel_queries[EDGE_CHANNEL] = {}
+        if EdgeSearchMethod.bm25 in methods:
+            channel_queries[EDGE_CHANNEL][EdgeSearchMethod.bm25] = get_edge_fulltext_search_query(
+                '', SEMANTIC_EDGE_RETURN
+            )
+        if EdgeSearchMethod.cosine_similarity in methods:
+            channel_queries[EDGE_CHANNEL][EdgeSearchMethod.cosine_similarity] = (
+                get_edge_similarity_search_query('')
+            )
+    if config.article_config is not None:
+        channel_queries[ARTICLE_CHANNEL] = {}
+        if ArticleSearchMethod.bm25 in config.article_config.search_methods:
+            channel_queries[ARTICLE_CHANNEL][ArticleSearchMethod.bm25] = (
+                get_article_fulltext_search_query('', provider)
+            )
+    if config.node_config is not None:
+        methods = config.node_config.search_methods
+        channel_queries[SENTENCE_CHANNEL] = {}
+        channel_queries[VOCABULARY_CHANNEL] = {}
+        if NodeSearchMethod.bm25 in methods:
+            channel_queries[SENTENCE_CHANNEL][NodeSearchMethod.bm25] = (
+                get_sentence_fulltext_search_query('', provider)
+            )
+            channel_queries[VOCABULARY_CHANNEL][NodeSearchMethod.bm25] = (
+                get_vocabulary_fulltext_search_query('', provider)
+            )
+        if NodeSearchMethod.cosine_similarity in methods:
+            channel_queries[SENTENCE_CHANNEL][NodeSearchMethod.cosine_similarity] = (
+                get_sentence_similarity_search_query('')
+            )
+            channel_queries[VOCABULARY_CHANNEL][NodeSearchMethod.cosine_similarity] = (
+                get_vocabulary_similarity_search_query()
+            )
+
+    return channel_queries
+
+
+def get_vocabulary_fulltext_channels(config: SearchConfig) -> list[str]:
+    if config.node_config is not None and NodeSearchMethod.bm25 in config.node_config.search_methods:
+        return [VOCABULARY_CHANNEL]
+
+    return []
+
+
+@dataclass(frozen=True)
+class SearchPlan:
+    """
+    Immutable, precomputed view of a SearchConfig for one graph provider.
+
+    Holds everything search() and vocabulary_search() derive from the config alone, so the
+    work is done once per distinct config instead of on every call. Configs are frozen all
+    the way down, so plans are cached by config value and are safe to share between
+    concurrent searches; per-call values such as the limit are passed alongside the plan
+    rather than written into it. The Cypher of every channel and search method, and of the
+    single-query and batched fulltext statements, is compiled into the plan for unfiltered
+    searches; searches with SearchFilters build theirs from the lru-cached query builders
+    in search_utils, keyed by the filter shape.
+    """
+
+    config_key: str
+    provider: GraphProvider
+    channels: tuple[str, ...]
+    fulltext_channels: tuple[str, ...]
+    vocabulary_fulltext_channels: tuple[str, ...]
+    needs_query_vector: bool
+    needs_vocabulary_query_vector: bool
+    # multi-channel statement over fulltext_channels, None when no channel uses fulltext
+    multi_channel_fulltext_query: str | None
+    # UNWIND statement per fulltext channel, vocabulary included
+    batch_fulltext_queries: dict[str, str]
+    # channel -> search method -> Cypher, for the fan-out channel searches
+    channel_queries: dict[str, dict[Enum, str]]
+
+
+@lru_cache(maxsize=SEARCH_PLAN_CACHE_SIZE)
+def compile_search_plan(config: SearchConfig, provider: GraphProvider) -> SearchPlan:
+    fulltext_channels = tuple(get_fulltext_channels(config))
+    vocabulary_fulltext_channels = tuple(get_vocabulary_fulltext_channels(config))
+
+    return SearchPlan(
+        config_key=config.model_dump_json(),
+        provider=provider,
+        channels=tuple(get_channels(config)),
+        fulltext_channels=fulltext_channels,
+        vocabulary_fulltext_channels=vocabulary_fulltext_channels,
+        needs_query_vector=(
+            uses_query_vector(config.edge_config, EDGE_VECTOR_SEARCH_METHODS, EDGE_VECTOR_RERANKERS)
+            or uses_query_vector(
+                config.article_config, ARTICLE_VECTOR_SEARCH_METHODS, ARTICLE_VECTOR_RERANKERS
+            )
+            or uses_query_vector(
+                config.node_config, SENTENCE_VECTOR_SEARCH_METHODS, SENTENCE_VECTOR_RERANKERS
+            )
+        ),
+        needs_vocabulary_query_vector=uses_query_vector(
+            config.node_config, NODE_VECTOR_SEARCH_METHODS, NODE_VECTOR_RERANKERS
+        ),
+        multi_channel_fulltext_query=(
+            get_multi_channel_fulltext_query(provider, fulltext_channels, '', '')
+            if fulltext_channels
+            else None
+        ),
+        batch_fulltext_queries={
+            channel: get_batch_fulltext_query(provider, channel, '', '')
+            for channel in fulltext_channels + vocabulary_fulltext_channels
+        },
+        channel_queries=get_channel_queries(config, provider),
+    )
@@ -14,20 +14,28 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
+import hashlib
 import logging
+import re
 from collections import defaultdict
-from time import time
-from typing import Any
+from collections.abc import Callable
+from functools import lru_cache
+from time import monotonic, time
+from typing import Any, TypeVar
 
 import numpy as np
+from neo4j.exceptions import ClientError
 from numpy._typing import NDArray
 from typing_extensions import LiteralString
 
+from cross_encoder.client import CrossEncoderClient
 from driver.driver import GraphDriver, GraphProvider
 from edges import SemanticEdge, get_semantic_edge_from_record
 from graph_queries import (
     get_nodes_query,
     get_relationships_query,
+    get_relationships_similarity_query,
     get_vector_cosine_func_query,
     get_nodes_similarity_query,
 )
@@ -38,7 +46,11 @@ from helpers import (
     semaphore_gather,
 )
 from models.edges.edge_db_queries import SEMANTIC_EDGE_RETURN
-from models.nodes.node_db_queries import VOCABULARY_NODE_RETURN, SENTENCE_NODE_RETURN, ARTICLE_NODE_RETURN
+from models.nodes.node_db_queries import (
+    ARTICLE_NODE_RETURN_LEAN,
+    SENTENCE_NODE_RETURN,
+    VOCABULARY_NODE_RETURN_LEAN,
+)
 from nodes import (
     ArticleNode,
     SentenceNode,
@@ -59,7 +71,51 @@ RELEVANT_SCHEMA_LIMIT = 10
 DEFAULT_MIN_SCORE = 0.6
 DEFAULT_MMR_LAMBDA = 0.5
 MAX_SEARCH_DEPTH = 3
-MAX_QUERY_LENGTH = 128
+MAX_BFS_FANOUT = 25
+VOCABULARY_VECTOR_INDEX = 'vocabulary_embeddings'
+ARTICLE_VECTOR_INDEX = 'article_embeddings'
+EDGE_VECTOR_INDEX = 'semantic_rels_embeddings'
+SENTENCE_VECTOR_INDEX = 'sentence_embeddings'
+MISSING_INDEX_ERROR_CODES = frozenset(
+    {'Neo.ClientError.Procedure.ProcedureCallFailed', 'Neo.ClientError.Schema.IndexNotFound'}
+)
+DEFAULT_CROSS_ENCODER_TOP_K = 20
+DEFAULT_CROSS_ENCODER_TIMEOUT = 5.0
+# cross-encoder scores are relevance probabilities; a result set whose weakest member clears
+# the confident score, or a chunk that falls this far below it, ends the cascade early
+CROSS_ENCODER_CONFIDENT_SCORE = 0.9
+CROSS_ENCODER_SEPARATION_MARGIN = 0.2
+# SimHash fingerprints of candidates within this many bits of each other are near duplicates
+DEFAULT_NEAR_DUPLICATE_DISTANCE = 3
+SIMHASH_CACHE_SIZE = 8192
+SIMHASH_SHINGLE_SIZE = 2
+# negation flips the meaning of a statement while barely moving its fingerprint, so texts
+# only collapse when they carry the same negations
+SIMHASH_NEGATIONS = frozenset('no not nor never neither none without cannot'.split())
+SIMHASH_STOPWORDS = frozenset(
+    'a an the of in on and or to with for by is are was were be been that this these those as at from'.split()
+)
+# Fulltext queries are compiled into at most this many term clauses (plus one phrase clause)
+MAX_FULLTEXT_CLAUSES = 32
+MAX_FULLTEXT_PHRASE_TERMS = 8
+DEFAULT_FULLTEXT_PHRASE_BOOST = 2.0
+FULLTEXT_QUERY_CACHE_SIZE = 4096
+FULLTEXT_STOPWORDS = SIMHASH_STOPWORDS | frozenset(
+    'what which who whom whose when where why how does do did can could should would will '
+    'it its not no into about between than then there their they has have had'.split()
+)
+# Words joined by hyphens, dots or slashes (IL-6, TNF-alpha, 5-HT2A, p.V600E) are kept as
+# one token so the compiler can match them as a phrase instead of as unrelated fragments
+FULLTEXT_TOKEN_PATTERN = re.compile(r'\w+(?:[-./]\w+)*')
+
+SearchItem = TypeVar('SearchItem', SemanticEdge, SentenceNode, ArticleNode, VocabularyNode)
+ANN_OVERFETCH_FACTOR = 4
+MAX_ANN_CANDIDATES = 1000
+EXACT_SEARCH_MAX_CANDIDATES = 10000
+EDGE_CHANNEL = 'edges'
+ARTICLE_CHANNEL = 'articles'
+SENTENCE_CHANNEL = 'sentences'
+VOCABULARY_CHANNEL = 'vocabulary'
 
 
 def fulltext_query(query: str, group_ids: list[str] | None = None, fulltext_syntax: str = ''):
@@ -73,9 +129,8 @@ def fulltext_query(query: str, group_ids: list[str] | None = None, fulltext_synt
     # group_ids_filter += ' AND ' if group_ids_filter else ''
     group_ids_filter = ''
 
-    lucene_query = lucene_sanitize(query)
-    # If the lucene query is too long return no query
-    if len(lucene_query.split(' ')) + len(group_ids or '') >= MAX_QUERY_LENGTH:
+    lucene_query = compile_fulltext_query(query)
+    if lucene_query == '':
         return ''
 
     full_query = group_ids_filter + '(' + lucene_query + ')'
@@ -83,6 +138,70 @@ def fulltext_query(query: str, group_ids: list[str] | None = None, fulltext_synt
     return full_query
 
 
+def is_fulltext_identifier(token: str) -> bool:
+    # Gene symbols, variants and other identifiers: anything carrying a digit, internal
+    # punctuation, or written in capitals (TNF, BRCA1, IL-6, rs429358). Capitalized
+    # stopwords such as AND / NOT are boolean operators typed by the user, not symbols.
+    return (
+        any(char.isdigit() for char in token)
+        or not token.isalnum()
+        or (len(token) > 1 and token.isupper() and token.lower() not in FULLTEXT_STOPWORDS)
+    )
+
+
+@lru_cache(maxsize=FULLTEXT_QUERY_CACHE_SIZE)
+def compile_fulltext_query(
+    query: str, phrase_boost: float | None = DEFAULT_FULLTEXT_PHRASE_BOOST
+) -> str:
+    """
+    Compile a natural-language query into a Lucene query string for the fulltext indexes.
+
+    The query is tokenized, stopwords are dropped and duplicate terms collapsed, so Lucene
+    scores each distinct content word once instead of scoring every word of the question.
+    Identifiers (see is_fulltext_identifier) are never treated as stopwords and multi-part
+    identifiers are quoted, so IL-6 matches as IL followed by 6. Queries with more than
+    MAX_FULLTEXT_CLAUSES distinct terms are truncated, keeping identifiers first, rather
+    than dropped. Short queries also get an exact-phrase clause boosted by phrase_boost.
+    Returns '' when nothing searchable is left.
+    """
+    tokens = FULLTEXT_TOKEN_PATTERN.findall(query)
+
+    terms: dict[str, bool] = {}
+    for token in tokens:
+        identifier = is_fulltext_identifier(token)
+        if not identifier and token.lower() in FULLTEXT_STOPWORDS:
+            continue
+        terms.setdefault(token.lower(), identifier)
+
+    if not terms:
+        return ''
+
+    if len(terms) > MAX_FULLTEXT_CLAUSES:
+        kept = set(sorted(terms, key=lambda term: not terms[term])[:MAX_FULLTEXT_CLAUSES])
+        terms = {term: identifier for term, identifier in terms.items() if term in kept}
+
+    clauses = [
+        f'"{term}"' if not term.isalnum() else lucene_sanitize(term) for term in terms
+    ]
+
+    if phrase_boost is not None and 1 < len(terms) and len(tokens) <= MAX_FULLTEXT_PHRASE_TERMS:
+        phrase = ' '.join(token.lower() for token in tokens)
+        clauses.append(f'"{phrase}"^{phrase_boost:g}')
+
+    return ' '.join(clauses)
+
+
+async def resolve_query_vector(
+    query_vector: asyncio.Future | list[float] | None,
+) -> list[float] | None:
+    # channels receive the query embedding as a future so it can be computed alongside fulltext search
+    if isinstance(query_vector, asyncio.Future):
+        # shielded so a channel cancelled at its deadline does not cancel the shared embedding
+        return await asyncio.shield(query_vector)
+
+    return query_vector
+
+
 async def get_articles_by_vocabulary(
     driver: GraphDriver,
     nodes: list[VocabularyNode] = [],
@@ -125,7 +244,7 @@ async def get_mentioned_nodes(
         WHERE s.id IN $uuids
         RETURN DISTINCT
         """
-        + VOCABULARY_NODE_RETURN,
+        + VOCABULARY_NODE_RETURN_LEAN,
         uuids=sentence_ids,
         routing_='r',
     )
@@ -162,6 +281,7 @@ async def edge_fulltext_search(
     search_filter: SearchFilters,
     group_ids: list[str] | None = None,
     limit=RELEVANT_SCHEMA_LIMIT,
+    compiled_query: str | None = None,
 ) -> list[SemanticEdge]:
     # fulltext search over facts
     fuzzy_query = fulltext_query(query, group_ids, driver.fulltext_syntax)
@@ -169,22 +289,8 @@ async def edge_fulltext_search(
         return []
 
     filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
-
-    query = (
-        get_relationships_query('Semantic_rels')
-        + """
-        YIELD relationship AS rel, score
-        MATCH (n:Vocabulary)-[e:Cooccur]->(m:Vocabulary) WHERE elementId(e) = elementId(rel)"""
-        + filter_query
-        + """
-        WITH e, score, n, m
-        RETURN
-        """
-        + SEMANTIC_EDGE_RETURN
-        + """
-        ORDER BY score DESC
-        LIMIT $limit
-        """
+    query = get_compiled_query(
+        compiled_query, filter_query, get_edge_fulltext_search_query, SEMANTIC_EDGE_RETURN
     )
 
     records, _, _ = await driver.execute_query(
@@ -201,68 +307,94 @@ async def edge_fulltext_search(
     return edges
 
 
-# async def edge_similarity_search(
-#     driver: GraphDriver,
-#     search_vector: list[float],
-#     source_node_uuid: str | None,
-#     target_node_uuid: str | None,
-#     search_filter: SearchFilters,
-#     group_ids: list[str] | None = None,
-#     limit: int = RELEVANT_SCHEMA_LIMIT,
-#     min_score: float = DEFAULT_MIN_SCORE,
-# ) -> list[EntityEdge]:
-#     # vector similarity search over embedded facts
-#     query_params: dict[str, Any] = {}
+async def edge_similarity_search(
+    driver: GraphDriver,
+    search_vector: asyncio.Future | list[float],
+    search_filter: SearchFilters,
+    group_ids: list[str] | None = None,
+    limit: int = RELEVANT_SCHEMA_LIMIT,
+    min_score: float = DEFAULT_MIN_SCORE,
+    compiled_query: str | None = None,
+) -> list[SemanticEdge]:
+    """
+    Approximate nearest neighbour search over edge summary embeddings.
 
-#     filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
-#     query_params.update(filter_params)
+    Candidates come from the semantic_rels_embeddings relationship vector index, so the
+    edges are never scanned. Edge filters are applied to the returned candidates, and the
+    index is over-fetched when filters are set. Returns no edges, with a warning, when the
+    index has not been created yet.
+    """
+    search_vector = await resolve_query_vector(search_vector)
 
-#     group_filter_query: LiteralString = 'WHERE e.group_id IS NOT NULL'
-#     if group_ids is not None:
-#         group_filter_query += '\nAND e.group_id IN $group_ids'
-#         query_params['group_ids'] = group_ids
+    filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
+    query = get_compiled_query(compiled_query, filter_query, get_edge_similarity_search_query)
 
-#         if source_node_uuid is not None:
-#             query_params['source_uuid'] = source_node_uuid
-#             group_filter_query += '\nAND (n.uuid = $source_uuid)'
+    records = await query_vector_index(
+        driver,
+        EDGE_VECTOR_INDEX,
+        query,
+        search_vector=search_vector,
+        k=min(limit * ANN_OVERFETCH_FACTOR, MAX_ANN_CANDIDATES) if filter_query else limit,
+        limit=limit,
+        min_score=min_score,
+        **filter_params,
+    )
 
-#         if target_node_uuid is not None:
-#             query_params['target_uuid'] = target_node_uuid
-#             group_filter_query += '\nAND (m.uuid = $target_uuid)'
+    edges = [get_semantic_edge_from_record(record) for record in records]
 
-#     query = (
-#         RUNTIME_QUERY
-#         + """
-#         MATCH (n:Entity)-[e:RELATES_TO]->(m:Entity)
-#         """
-#         + group_filter_query
-#         + filter_query
-#         + """
-#         WITH DISTINCT e, n, m, """
-#         + get_vector_cosine_func_query('e.fact_embedding', '$search_vector', driver.provider)
-#         + """ AS score
-#         WHERE score > $min_score
-#         RETURN
-#         """
-#         + ENTITY_EDGE_RETURN
-#         + """
-#         ORDER BY score DESC
-#         LIMIT $limit
-#         """
-#     )
+    return edges
+
+
+def get_compiled_query(
+    compiled_query: str | None, filter_query: str, build_query: Callable[..., str], *args: Any
+) -> str:
+    # plans compile each channel's Cypher without filters; filtered searches build their own
+    if compiled_query is not None and filter_query == '':
+        return compiled_query
+
+    return build_query(filter_query, *args)
+
+
+@lru_cache(maxsize=128)
+def get_edge_similarity_search_query(filter_query: str) -> str:
+    return (
+        get_relationships_similarity_query(EDGE_VECTOR_INDEX)
+        + """
+        YIELD relationship AS e, score
+        WHERE score > $min_score
+        WITH e, score, startNode(e) AS n, endNode(e) AS m
+        WHERE n:Vocabulary AND m:Vocabulary"""
+        + filter_query
+        + """
+        WITH e, score, n, m
+        ORDER BY score DESC
+        LIMIT $limit
+        RETURN
+        """
+        + SEMANTIC_EDGE_RETURN
+    )
 
-#     records, _, _ = await driver.execute_query(
-#         query,
-#         search_vector=search_vector,
-#         limit=limit,
-#         min_score=min_score,
-#         routing_='r',
-#         **query_params,
-#     )
 
-#     edges = [get_semantic_edge_from_record(record) for record in records]
+async def query_vector_index(
+    driver: GraphDriver, index_name: str, query: str, **kwargs: Any
+) -> list[Any]:
+    # vector indexes are built by a separate backfill, so a missing index degrades the
+    # channel to no results instead of failing the whole search
+    try:
+        records, _, _ = await driver.execute_query(query, routing_='r', **kwargs)
+    except ClientError as e:
+        if not is_missing_index_error(e, index_name):
+            raise
+        logger.warning(f'Vector index {index_name} is not available: {e}')
+        return []
+
+    return records
 
-#     return edges
+
+def is_missing_index_error(error: ClientError, index_name: str) -> bool:
+    # db.index.vector.query* reports an unknown index as a failed procedure call, newer
+    # servers as IndexNotFound; only errors naming this index count as missing
+    return error.code in MISSING_INDEX_ERROR_CODES and index_name in (error.message or '')
 
 
 async def edge_bfs_search(
@@ -270,76 +402,102 @@ async def edge_bfs_search(
     bfs_origin_node_uuids: list[str] | None,
     bfs_max_depth: int,
     search_filter: SearchFilters,
-    # group_ids: list[str] | None = None,
-    # limit: int = RELEVANT_SCHEMA_LIMIT,
+    group_ids: list[str] | None = None,
+    limit: int = RELEVANT_SCHEMA_LIMIT,
+    max_fanout: int = MAX_BFS_FANOUT,
 ) -> list[SemanticEdge]:
-    # vector similarity search over embedded facts
-    if bfs_origin_node_uuids is None:
+    """
+    Breadth-first search over Cooccur edges, one hop at a time.
+
+    Each hop expands only the nodes discovered by the previous hop, takes at most
+    max_fanout edges per node so hub terms cannot blow up the expansion, and never
+    revisits a node or returns an edge twice. Edges are returned in hop order with
+    their endpoints projected directly from the expanded pattern.
+    """
+    if not bfs_origin_node_uuids:
         return []
 
     filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
 
     query = (
-        f"""
-            UNWIND $bfs_origin_node_uuids AS origin_uuid
-            MATCH path = (origin:Vocabulary {{id: origin_uuid}})-[:Cooccur*1..{bfs_max_depth}]->(:Vocabulary)
-            UNWIND relationships(path) AS rel
-            MATCH (n:Vocabulary)-[e:Cooccur]-(m:Vocabulary)
-            WHERE elementId(e) = elementId(rel)
         """
+        UNWIND $frontier AS node_id
+        MATCH (n:Vocabulary {id: node_id})
+        CALL {
+            WITH n
+            MATCH (n)-[e:Cooccur]->(m)
+            WHERE m:Vocabulary"""
         + filter_query
         + """
-        RETURN DISTINCT
+            RETURN e, m
+            LIMIT $max_fanout
+        }
+        WITH n, e, m
+        LIMIT $hop_limit
+        RETURN
         """
         + SEMANTIC_EDGE_RETURN
-        + """
-        LIMIT $limit
-        """
     )
 
-    records, _, _ = await driver.execute_query(
-        query,
-        bfs_origin_node_uuids=bfs_origin_node_uuids,
-        # group_ids=group_ids,
-        limit=limit,
-        routing_='r',
-        **filter_params,
-    )
+    edges: list[SemanticEdge] = []
+    seen_edge_ids: set[str] = set()
+    visited_node_ids: set[str] = set(bfs_origin_node_uuids)
+    frontier = list(dict.fromkeys(bfs_origin_node_uuids))
 
-    edges = [get_semantic_edge_from_record(record) for record in records]
+    for _ in range(bfs_max_depth):
+        if not frontier or len(edges) >= limit:
+            break
+
+        records, _, _ = await driver.execute_query(
+            query,
+            frontier=frontier,
+            max_fanout=max_fanout,
+            hop_limit=limit - len(edges),
+            routing_='r',
+            **filter_params,
+        )
+
+        next_frontier: list[str] = []
+        for record in records:
+            if record['id'] in seen_edge_ids:
+                continue
+            seen_edge_ids.add(record['id'])
+            edges.append(get_semantic_edge_from_record(record))
+
+            target_node_id = record['target_node_id']
+            if target_node_id not in visited_node_ids:
+                visited_node_ids.add(target_node_id)
+                next_frontier.append(target_node_id)
+
+        frontier = next_frontier
 
     return edges
 
 
+def get_vocabulary_fulltext_search_query(filter_query: str, provider: GraphProvider) -> str:
+    return get_node_fulltext_search_query(
+        provider,
+        'vocabulary_Names',
+        'n:Vocabulary AND apoc.node.degree(n) > 0' + filter_query,
+        VOCABULARY_NODE_RETURN_LEAN,
+    )
+
+
 async def node_fulltext_search(
     driver: GraphDriver,
     query: str,
     search_filter: SearchFilters,
     group_ids: list[str] | None = None,
     limit=RELEVANT_SCHEMA_LIMIT,
+    compiled_query: str | None = None,
 ) -> list[VocabularyNode]:
     # BM25 search to get top nodes
     fuzzy_query = fulltext_query(query, group_ids, driver.fulltext_syntax)
     if fuzzy_query == '':
         return []
     filter_query, filter_params = node_search_filter_query_constructor(search_filter)
-
-    query = (
-        get_nodes_query(driver.provider, 'vocabulary_Names', '$query')
-        + """
-        YIELD node AS n, score
-        """
-        + filter_query
-        + """
-        WHERE apoc.node.degree(n) > 0
-        """
-        + """
-        WITH n, score
-        ORDER BY score DESC
-        LIMIT $limit
-        RETURN
-        """
-        + VOCABULARY_NODE_RETURN
+    query = get_compiled_query(
+        compiled_query, filter_query, get_vocabulary_fulltext_search_query, driver.provider
     )
 
     records, _, _ = await driver.execute_query(
@@ -356,41 +514,100 @@ async def node_fulltext_search(
     return nodes
 
 
+@lru_cache(maxsize=1)
+def get_vocabulary_similarity_search_query() -> str:
+    return (
+        get_nodes_similarity_query(VOCABULARY_VECTOR_INDEX)
+        + """
+        YIELD node AS n, score
+        WHERE score > $min_score
+        RETURN
+        """
+        + VOCABULARY_NODE_RETURN_LEAN
+        + """
+        ORDER BY score DESC
+        """
+    )
+
+
 async def node_similarity_search(
     driver: GraphDriver,
-    search_vector: list[float],
+    search_vector: asyncio.Future | list[float],
     search_filter: SearchFilters,
     group_ids: list[str] | None = None,
     limit=RELEVANT_SCHEMA_LIMIT,
     min_score: float = DEFAULT_MIN_SCORE,
+    compiled_query: str | None = None,
 ) -> list[VocabularyNode]:
-    # vector similarity search over entity names
-    query_params: dict[str, Any] = {}
+    """
+    Approximate nearest neighbour search over vocabulary embeddings.
 
-    # group_filter_query: LiteralString = 'WHERE n.group_id IS NOT NULL'
-    # if group_ids is not None:
-    #     group_filter_query += ' AND n.group_id IN $group_ids'
-    #     query_params['group_ids'] = group_ids
-    group_filter_query = 'WHERE n.embedding IS NOT NULL'
+    Candidates come from the vocabulary vector index. Label filters are applied to the
+    returned candidates, and the index is queried again with a larger k while filters
+    discard too many of them. When the label filter narrows the search down to a small
+    set of nodes, those nodes are scored exactly instead.
+    """
+    search_vector = await resolve_query_vector(search_vector)
+    node_labels = search_filter.node_labels
+
+    if node_labels:
+        candidate_count = await count_nodes_by_labels(driver, node_labels)
+        if candidate_count <= EXACT_SEARCH_MAX_CANDIDATES:
+            return await node_exact_similarity_search(
+                driver, search_vector, node_labels, limit, min_score
+            )
+
+    # label filters are applied to the returned candidates, so the Cypher never varies
+    query = compiled_query or get_vocabulary_similarity_search_query()
+
+    k = min(limit * ANN_OVERFETCH_FACTOR, MAX_ANN_CANDIDATES) if node_labels else limit
+    while True:
+        records, _, _ = await driver.execute_query(
+            query,
+            search_vector=search_vector,
+            k=k,
+            min_score=min_score,
+            routing_='r',
+        )
 
-    filter_query, filter_params = node_search_filter_query_constructor(search_filter)
-    query_params.update(filter_params)
+        matches = [
+            record
+            for record in records
+            if not node_labels or any(label in record['labels'] for label in node_labels)
+        ]
 
+        # stop once enough candidates survive the filters or the index has nothing more to offer
+        if len(matches) >= limit or len(records) < k or k >= MAX_ANN_CANDIDATES:
+            break
+        k = min(k * 2, MAX_ANN_CANDIDATES)
+
+    nodes = [get_vocabulary_node_from_record(record) for record in matches[:limit]]
+
+    return nodes
+
+
+async def node_exact_similarity_search(
+    driver: GraphDriver,
+    search_vector: list[float],
+    node_labels: list[str],
+    limit=RELEVANT_SCHEMA_LIMIT,
+    min_score: float = DEFAULT_MIN_SCORE,
+) -> list[VocabularyNode]:
+    # brute-force cosine similarity, only used when the label filter leaves few candidates
     query = (
         RUNTIME_QUERY
         + """
-        MATCH (n:Vocabulary)
-        """
-        + group_filter_query
-        + filter_query
-        + """
+        MATCH (n:"""
+        + '|'.join(node_labels)
+        + """)
+        WHERE n:Vocabulary AND n.embedding IS NOT NULL
         WITH n, """
-        + get_vector_cosine_func_query('n.embedding', '$search_vector', driver.provider)
+        + get_vector_cosine_func_query('n.embedding', '$search_vector')
         + """ AS score
         WHERE score > $min_score
         RETURN
         """
-        + VOCABULARY_NODE_RETURN
+        + VOCABULARY_NODE_RETURN_LEAN
         + """
         ORDER BY score DESC
         LIMIT $limit
@@ -403,7 +620,6 @@ async def node_similarity_search(
         limit=limit,
         min_score=min_score,
         routing_='r',
-        **query_params,
     )
 
     nodes = [get_vocabulary_node_from_record(record) for record in records]
@@ -411,6 +627,24 @@ async def node_similarity_search(
     return nodes
 
 
+async def count_nodes_by_labels(driver: GraphDriver, node_labels: list[str]) -> int:
+    # single label counts are served from the count store, so this does not scan nodes
+    query = (
+        'CALL {\n'
+        + '\nUNION ALL\n'.join(
+            f'MATCH (n:{label}) RETURN count(n) AS label_count' for label in node_labels
+        )
+        + """
+        }
+        RETURN sum(label_count) AS count
+        """
+    )
+
+    records, _, _ = await driver.execute_query(query, routing_='r')
+
+    return records[0]['count'] if records else 0
+
+
 async def node_bfs_search(
     driver: GraphDriver,
     bfs_origin_node_uuids: list[str] | None,
@@ -434,7 +668,7 @@ async def node_bfs_search(
         + """
         RETURN
         """
-        + VOCABULARY_NODE_RETURN
+        + VOCABULARY_NODE_RETURN_LEAN
         + """
         LIMIT $limit
         """
@@ -453,32 +687,27 @@ async def node_bfs_search(
     return nodes
 
 
+def get_article_fulltext_search_query(filter_query: str, provider: GraphProvider) -> str:
+    return get_node_fulltext_search_query(
+        provider, 'article_Title', 'n:Article' + filter_query, ARTICLE_NODE_RETURN_LEAN
+    )
+
+
 async def article_fulltext_search(
     driver: GraphDriver,
     query: str,
     search_filter: SearchFilters,
     group_ids: list[str] | None = None,
     limit=RELEVANT_SCHEMA_LIMIT,
+    compiled_query: str | None = None,
 ) -> list[ArticleNode]:
     # BM25 search to get top nodes
     fuzzy_query = fulltext_query(query, group_ids, driver.fulltext_syntax)
     if fuzzy_query == '':
         return []
     filter_query, filter_params = node_search_filter_query_constructor(search_filter)
-
-    query = (
-        get_nodes_query(driver.provider, 'article_Title', '$query')
-        + """
-        YIELD node AS n, score
-        """
-        + filter_query
-        + """
-        WITH n, score
-        ORDER BY score DESC
-        LIMIT $limit
-        RETURN
-        """
-        + ARTICLE_NODE_RETURN
+    query = get_compiled_query(
+        compiled_query, filter_query, get_article_fulltext_search_query, driver.provider
     )
 
     records, _, _ = await driver.execute_query(
@@ -494,24 +723,50 @@ async def article_fulltext_search(
 
     return nodes
 
+def get_sentence_fulltext_search_query(filter_query: str, provider: GraphProvider) -> str:
+    return get_node_fulltext_search_query(
+        provider, 'Sentences', 'n:Sentence' + filter_query, SENTENCE_NODE_RETURN
+    )
+
+
 async def sentence_fulltext_search(
     driver: GraphDriver,
     query: str,
     search_filter: SearchFilters,
     group_ids: list[str] | None = None,
     limit=RELEVANT_SCHEMA_LIMIT,
+    compiled_query: str | None = None,
 ) -> list[SentenceNode]:
     # BM25 search to get top nodes
     fuzzy_query = fulltext_query(query, group_ids, driver.fulltext_syntax)
     if fuzzy_query == '':
         return []
     filter_query, filter_params = node_search_filter_query_constructor(search_filter)
+    query = get_compiled_query(
+        compiled_query, filter_query, get_sentence_fulltext_search_query, driver.provider
+    )
 
-    query = (
-        get_nodes_query(driver.provider, 'Sentences', '$query')
+    records, _, _ = await driver.execute_query(
+        query,
+        query=fuzzy_query,
+        group_ids=group_ids,
+        limit=limit,
+        routing_='r',
+        **filter_params,
+    )
+
+    nodes = [get_sentence_node_from_record(record) for record in records]
+
+    return nodes
+
+
+@lru_cache(maxsize=128)
+def get_sentence_similarity_search_query(filter_query: str) -> str:
+    return (
+        get_nodes_similarity_query(SENTENCE_VECTOR_INDEX)
         + """
         YIELD node AS n, score
-        """
+        WHERE score > $min_score AND n:Sentence"""
         + filter_query
         + """
         WITH n, score
@@ -522,12 +777,30 @@ async def sentence_fulltext_search(
         + SENTENCE_NODE_RETURN
     )
 
-    records, _, _ = await driver.execute_query(
+
+async def sentence_similarity_search(
+    driver: GraphDriver,
+    search_vector: asyncio.Future | list[float],
+    search_filter: SearchFilters,
+    group_ids: list[str] | None = None,
+    limit=RELEVANT_SCHEMA_LIMIT,
+    min_score: float = DEFAULT_MIN_SCORE,
+    compiled_query: str | None = None,
+) -> list[SentenceNode]:
+    # approximate nearest neighbour search over sentence embeddings
+    search_vector = await resolve_query_vector(search_vector)
+
+    filter_query, filter_params = node_search_filter_query_constructor(search_filter)
+    query = get_compiled_query(compiled_query, filter_query, get_sentence_similarity_search_query)
+
+    records = await query_vector_index(
+        driver,
+        SENTENCE_VECTOR_INDEX,
         query,
-        query=fuzzy_query,
-        group_ids=group_ids,
+        search_vector=search_vector,
+        k=min(limit * ANN_OVERFETCH_FACTOR, MAX_ANN_CANDIDATES) if filter_query else limit,
         limit=limit,
-        routing_='r',
+        min_score=min_score,
         **filter_params,
     )
 
@@ -536,6 +809,270 @@ async def sentence_fulltext_search(
     return nodes
 
 
+def return_to_map_projection(return_fragment: str) -> str:
+    # Rewrites a RETURN fragment ("expr AS alias, ...") as a map literal ("{alias: expr, ...}")
+    # so channels with different columns can share the columns of a UNION
+    items: list[str] = []
+    depth = 0
+    current = ''
+    for char in return_fragment:
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        if char == ',' and depth == 0:
+            items.append(current)
+            current = ''
+        else:
+            current += char
+    items.append(current)
+
+    entries = []
+    for item in items:
+        expression, alias = item.strip().rsplit(' AS ', 1)
+        entries.append(f'{alias.strip()}: {expression.strip()}')
+
+    return '{' + ', '.join(entries) + '}'
+
+
+@lru_cache(maxsize=128)
+def get_edge_fulltext_search_query(
+    filter_query: str, return_query: str, query_param: str = '$query'
+) -> str:
+    # project the endpoints straight from the yielded relationship instead of re-matching it
+    return (
+        get_relationships_query('Semantic_rels', query_param)
+        + """
+        YIELD relationship AS e, score
+        WITH e, score, startNode(e) AS n, endNode(e) AS m
+        WHERE type(e) = 'Cooccur' AND n:Vocabulary AND m:Vocabulary"""
+        + filter_query
+        + """
+        WITH e, score, n, m
+        ORDER BY score DESC
+        LIMIT $limit
+        RETURN
+        """
+        + return_query
+    )
+
+
+@lru_cache(maxsize=128)
+def get_node_fulltext_search_query(
+    provider: GraphProvider,
+    index_name: str,
+    where_query: str,
+    return_query: str,
+    query_param: str = '$query',
+) -> str:
+    return (
+        get_nodes_query(provider, index_name, query_param)
+        + """
+        YIELD node AS n, score
+        WHERE """
+        + where_query
+        + """
+        WITH n, score
+        ORDER BY score DESC
+        LIMIT $limit
+        RETURN
+        """
+        + return_query
+    )
+
+
+def get_channel_fulltext_search_query(
+    provider: GraphProvider,
+    channel: str,
+    edge_filter_query: str,
+    node_filter_query: str,
+    return_prefix: str = '',
+    query_param: str = '$query',
+) -> str:
+    # every channel returns its item as a map so channel queries can be unioned or unwound
+    if channel == EDGE_CHANNEL:
+        return get_edge_fulltext_search_query(
+            edge_filter_query,
+            return_prefix + return_to_map_projection(SEMANTIC_EDGE_RETURN) + ' AS item, score',
+            query_param,
+        )
+    if channel == ARTICLE_CHANNEL:
+        return get_node_fulltext_search_query(
+            provider,
+            'article_Title',
+            'n:Article' + node_filter_query,
+            return_prefix + return_to_map_projection(ARTICLE_NODE_RETURN_LEAN) + ' AS item, score',
+            query_param,
+        )
+    if channel == SENTENCE_CHANNEL:
+        return get_node_fulltext_search_query(
+            provider,
+            'Sentences',
+            'n:Sentence' + node_filter_query,
+            return_prefix + return_to_map_projection(SENTENCE_NODE_RETURN) + ' AS item, score',
+            query_param,
+        )
+    if channel == VOCABULARY_CHANNEL:
+        return get_node_fulltext_search_query(
+            provider,
+            'vocabulary_Names',
+            'n:Vocabulary AND apoc.node.degree(n) > 0' + node_filter_query,
+            return_prefix
+            + return_to_map_projection(VOCABULARY_NODE_RETURN_LEAN)
+            + ' AS item, score',
+            query_param,
+        )
+
+    raise ValueError(f'Unknown fulltext search channel: {channel}')
+
+
+@lru_cache(maxsize=128)
+def get_multi_channel_fulltext_query(
+    provider: GraphProvider,
+    channels: tuple[str, ...],
+    edge_filter_query: str,
+    node_filter_query: str,
+) -> str:
+    subqueries = [
+        get_channel_fulltext_search_query(
+            provider, channel, edge_filter_query, node_filter_query, f"'{channel}' AS channel, "
+        )
+        for channel in channels
+    ]
+
+    return (
+        'CALL {\n'
+        + '\nUNION ALL\n'.join(subqueries)
+        + """
+        }
+        RETURN channel, item, score
+        """
+    )
+
+
+@lru_cache(maxsize=128)
+def get_batch_fulltext_query(
+    provider: GraphProvider, channel: str, edge_filter_query: str, node_filter_query: str
+) -> str:
+    return (
+        """
+        UNWIND $queries AS q
+        CALL {
+            WITH q
+        """
+        + get_channel_fulltext_search_query(
+            provider, channel, edge_filter_query, node_filter_query, query_param='q.query'
+        )
+        + """
+        }
+        RETURN q.index AS query_index, item, score
+        ORDER BY query_index, score DESC
+        """
+    )
+
+
+def get_fulltext_channel_item(channel: str, item: dict) -> Any:
+    if channel == EDGE_CHANNEL:
+        return get_semantic_edge_from_record(item)
+    if channel == ARTICLE_CHANNEL:
+        return get_article_node_from_record(item)
+    if channel == SENTENCE_CHANNEL:
+        return get_sentence_node_from_record(item)
+    if channel == VOCABULARY_CHANNEL:
+        return get_vocabulary_node_from_record(item)
+
+    raise ValueError(f'Unknown fulltext search channel: {channel}')
+
+
+async def multi_channel_fulltext_search(
+    driver: GraphDriver,
+    query: str,
+    search_filter: SearchFilters,
+    channels: list[str],
+    group_ids: list[str] | None = None,
+    limit=RELEVANT_SCHEMA_LIMIT,
+    compiled_query: str | None = None,
+) -> dict[str, list]:
+    # fulltext search over every requested index in a single statement and round trip;
+    # compiled_query is the unfiltered statement for channels, reused when no filter applies
+    results: dict[str, list] = {channel: [] for channel in channels}
+    fuzzy_query = fulltext_query(query, group_ids, driver.fulltext_syntax)
+    if fuzzy_query == '' or not channels:
+        return results
+
+    edge_filter_query, edge_filter_params = edge_search_filter_query_constructor(search_filter)
+    node_filter_query, node_filter_params = node_search_filter_query_constructor(search_filter)
+    if compiled_query is not None and edge_filter_query == '' and node_filter_query == '':
+        query = compiled_query
+    else:
+        query = get_multi_channel_fulltext_query(
+            driver.provider, tuple(channels), edge_filter_query, node_filter_query
+        )
+    params = {**edge_filter_params, **node_filter_params}
+
+    records, _, _ = await driver.execute_query(
+        query,
+        query=fuzzy_query,
+        limit=limit,
+        routing_='r',
+        **params,
+    )
+
+    # UNION ALL does not keep the per-branch ordering, so each channel is re-sorted by score
+    records = sorted(records, key=lambda record: record['score'], reverse=True)
+    for record in records:
+        channel = record['channel']
+        results[channel].append(get_fulltext_channel_item(channel, record['item']))
+
+    return results
+
+
+async def batch_fulltext_search(
+    driver: GraphDriver,
+    queries: list[str],
+    search_filter: SearchFilters,
+    channel: str,
+    group_ids: list[str] | None = None,
+    limit=RELEVANT_SCHEMA_LIMIT,
+    compiled_query: str | None = None,
+) -> list[list]:
+    # fulltext search for many queries against one index in a single UNWIND statement;
+    # compiled_query is the unfiltered statement for the channel, reused when no filter applies
+    results: list[list] = [[] for _ in queries]
+    fuzzy_queries = []
+    for index, query in enumerate(queries):
+        fuzzy_query = fulltext_query(query, group_ids, driver.fulltext_syntax)
+        if fuzzy_query != '':
+            fuzzy_queries.append({'index': index, 'query': fuzzy_query})
+    if not fuzzy_queries:
+        return results
+
+    edge_filter_query, edge_filter_params = edge_search_filter_query_constructor(search_filter)
+    node_filter_query, node_filter_params = node_search_filter_query_constructor(search_filter)
+    if compiled_query is not None and edge_filter_query == '' and node_filter_query == '':
+        query = compiled_query
+    else:
+        query = get_batch_fulltext_query(
+            driver.provider, channel, edge_filter_query, node_filter_query
+        )
+    params = {**edge_filter_params, **node_filter_params}
+
+    records, _, _ = await driver.execute_query(
+        query,
+        queries=fuzzy_queries,
+        limit=limit,
+        routing_='r',
+        **params,
+    )
+
+    for record in records:
+        results[record['query_index']].append(
+            get_fulltext_channel_item(channel, record['item'])
+        )
+
+    return results
+
+
 # async def community_fulltext_search(
 #     driver: GraphDriver,
 #     query: str,
@@ -609,12 +1146,12 @@ async def article_similarity_search(
     #     """
     # )
     query = (
-    get_nodes_similarity_query('article_embeddings', search_vector, limit) + """
+    get_nodes_similarity_query(ARTICLE_VECTOR_INDEX) + """
     YIELD node AS n, score
     WHERE score > $min_score
     RETURN
     """ 
-    + ARTICLE_NODE_RETURN 
+    + ARTICLE_NODE_RETURN_LEAN 
     + """
     ORDER BY score DESC
     LIMIT $limit
@@ -624,6 +1161,7 @@ async def article_similarity_search(
     records, _, _ = await driver.execute_query(
         query,
         search_vector=search_vector,
+        k=limit,
         limit=limit,
         min_score=min_score,
         routing_='r',
@@ -959,6 +1497,80 @@ def rrf(
     ]
 
 
+async def cascade_rerank(
+    cross_encoder: CrossEncoderClient,
+    query: str,
+    search_result_uuids: list[list[str]],
+    passages: dict[str, str],
+    limit: int,
+    top_k: int = DEFAULT_CROSS_ENCODER_TOP_K,
+    timeout: float | None = DEFAULT_CROSS_ENCODER_TIMEOUT,
+    min_score: float = 0,
+) -> tuple[list[str], list[float]]:
+    """
+    Cross-encoder reranking on a budgeted head of the RRF fusion.
+
+    Candidates are fused with rrf and only the top_k are sent to the cross-encoder, in
+    chunks of limit in RRF order. The cascade stops once the timeout is spent or the
+    scores are confidently separated: the weakest of the best limit scores clears
+    CROSS_ENCODER_CONFIDENT_SCORE, or a whole chunk scores well below it. Scored candidates
+    come first, ordered by cross-encoder score; the candidates that were never scored
+    follow in RRF order with a score of 0, unless min_score is positive.
+    """
+    fused_uuids, _ = rrf(search_result_uuids)
+    head = fused_uuids[:top_k]
+    chunk_size = max(limit, 1)
+    deadline = monotonic() + timeout if timeout is not None else None
+
+    scores: dict[str, float] = {}
+    for start in range(0, len(head), chunk_size):
+        remaining = deadline - monotonic() if deadline is not None else None
+        if remaining is not None and remaining <= 0:
+            break
+
+        chunk = head[start : start + chunk_size]
+        try:
+            ranked_items = await asyncio.wait_for(
+                cross_encoder.rank_items(query, [(uuid, passages[uuid]) for uuid in chunk]),
+                remaining,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f'cross-encoder reranking timed out after scoring {len(scores)} candidates'
+            )
+            break
+
+        chunk_scores = dict(ranked_items)
+        scores.update(chunk_scores)
+        if cross_encoder_scores_separated(scores, chunk_scores, limit):
+            break
+
+    ranked_uuids = sorted(scores, key=lambda uuid: scores[uuid], reverse=True)
+    reranked_uuids = [uuid for uuid in ranked_uuids if scores[uuid] >= min_score]
+    reranked_scores = [scores[uuid] for uuid in reranked_uuids]
+
+    # unscored candidates carry a score of 0, so a positive min_score drops them just like
+    # the scored candidates the cross-encoder rejected
+    tail_uuids = (
+        [uuid for uuid in fused_uuids if uuid not in scores] if min_score <= 0 else []
+    )
+
+    return reranked_uuids + tail_uuids, reranked_scores + [0.0] * len(tail_uuids)
+
+
+def cross_encoder_scores_separated(
+    scores: dict[str, float], chunk_scores: dict[str, float], limit: int
+) -> bool:
+    if len(scores) < limit or not chunk_scores:
+        return False
+
+    kth_score = sorted(scores.values(), reverse=True)[limit - 1]
+    if kth_score >= CROSS_ENCODER_CONFIDENT_SCORE:
+        return True
+
+    return max(chunk_scores.values()) < kth_score - CROSS_ENCODER_SEPARATION_MARGIN
+
+
 async def node_distance_reranker(
     driver: GraphDriver,
     node_uuids: list[str],
@@ -1032,95 +1644,211 @@ async def article_vocabulary_reranker(
     ]
 
 
+@lru_cache(maxsize=SIMHASH_CACHE_SIZE)
+def simhash(text: str) -> tuple[int, tuple[str, ...]]:
+    """
+    64-bit SimHash over the word shingles of a text.
+
+    Words are lowercased and stopwords dropped, so texts that only differ in case,
+    punctuation or function words fingerprint identically. Hashing runs of
+    SIMHASH_SHINGLE_SIZE words rather than single words keeps word order in the
+    fingerprint, so "A inhibits B" and "B inhibits A" land far apart. Identifiers that
+    contain digits (genes, variants, ...) and negations are returned alongside the
+    fingerprint: texts that differ only in BRCA1 vs BRCA2, or in a "not", are not
+    duplicates however close they hash.
+    """
+    words = [
+        word
+        for word in re.findall(r'\w+', re.sub(r"n't\b", ' not', text.lower()))
+        if word not in SIMHASH_STOPWORDS
+    ]
+    keys = tuple(
+        sorted(
+            {
+                word
+                for word in words
+                if word in SIMHASH_NEGATIONS or any(char.isdigit() for char in word)
+            }
+        )
+    )
+    if not words:
+        return 0, keys
+
+    shingles = [
+        ' '.join(words[i : i + SIMHASH_SHINGLE_SIZE])
+        for i in range(len(words) - SIMHASH_SHINGLE_SIZE + 1)
+    ] or [' '.join(words)]
+
+    hashes = np.array(
+        [
+            int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), 'little')
+            for shingle in shingles
+        ],
+        dtype=np.uint64,
+    )
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    weights = bits.sum(axis=0, dtype=np.int64) * 2 - len(shingles)
+    fingerprint = int.from_bytes(np.packbits(weights > 0, bitorder='little').tobytes(), 'little')
+
+    return fingerprint, keys
+
+
+def collapse_near_duplicates(
+    search_results: list[list[SearchItem]],
+    get_text: Callable[[SearchItem], str],
+    max_distance: int = DEFAULT_NEAR_DUPLICATE_DISTANCE,
+) -> list[list[SearchItem]]:
+    """
+    Collapse near-duplicate candidates across the result lists of a channel.
+
+    Candidates whose SimHash is within max_distance bits of an earlier candidate, with the
+    same identifiers and negations, are replaced by that earlier candidate. Each result list keeps its
+    order and the cluster representative appears once per list, so rerankers only see one
+    member of each cluster while rrf still credits the representative for every list its
+    duplicates were found in.
+    """
+    representatives: list[tuple[int, tuple[str, ...], SearchItem]] = []
+    canonical: dict[str, SearchItem] = {}
+    for result in search_results:
+        for item in result:
+            if item.id in canonical:
+                continue
+            fingerprint, keys = simhash(get_text(item) or '')
+            for other_fingerprint, other_keys, representative in representatives:
+                if (
+                    keys == other_keys
+                    and (fingerprint ^ other_fingerprint).bit_count() <= max_distance
+                ):
+                    canonical[item.id] = representative
+                    break
+            else:
+                representatives.append((fingerprint, keys, item))
+                canonical[item.id] = item
+
+    collapsed_results: list[list[SearchItem]] = []
+    for result in search_results:
+        collapsed = {canonical[item.id].id: canonical[item.id] for item in result}
+        collapsed_results.append(list(collapsed.values()))
+
+    return collapsed_results
+
+
 def maximal_marginal_relevance(
     query_vector: list[float],
     candidates: dict[str, list[float]],
     mmr_lambda: float = DEFAULT_MMR_LAMBDA,
     min_score: float = -2.0,
+    limit: int | None = None,
 ) -> tuple[list[str], list[float]]:
     start = time()
-    query_array = np.array(query_vector)
-    candidate_arrays: dict[str, NDArray] = {}
-    for uuid, embedding in candidates.items():
-        candidate_arrays[uuid] = normalize_l2(embedding)
+    if not candidates:
+        return [], []
+
+    uuids: list[str] = list(candidates.keys())
+
+    # Normalize all candidates at once and get every pairwise similarity from one matrix product
+    candidate_matrix = np.asarray(list(candidates.values()), dtype=np.float64)
+    norms = np.linalg.norm(candidate_matrix, axis=1, keepdims=True)
+    candidate_matrix = candidate_matrix / np.where(norms == 0, 1, norms)
+    relevance = candidate_matrix @ normalize_l2(query_vector)
+    similarity_matrix = candidate_matrix @ candidate_matrix.T
+
+    # Greedy selection: each pick is penalized by its similarity to the closest item already picked
+    n_select = len(uuids) if limit is None else min(limit, len(uuids))
+    selected = np.zeros(len(uuids), dtype=bool)
+    max_similarity = np.zeros(len(uuids))
+    selected_indices: list[int] = []
+    mmr_scores: list[float] = []
+    for step in range(n_select):
+        mmr = mmr_lambda * relevance + (mmr_lambda - 1) * max_similarity
+        mmr[selected] = -np.inf
+        best = int(np.argmax(mmr))
+
+        selected[best] = True
+        selected_indices.append(best)
+        mmr_scores.append(float(mmr[best]))
+
+        if step == 0:
+            max_similarity = similarity_matrix[best].copy()
+        else:
+            np.maximum(max_similarity, similarity_matrix[best], out=max_similarity)
 
-    uuids: list[str] = list(candidate_arrays.keys())
+    end = time()
+    logger.debug(f'Completed MMR reranking in {(end - start) * 1000} ms')
 
-    similarity_matrix = np.zeros((len(uuids), len(uuids)))
+    return [
+        uuids[index]
+        for index, score in zip(selected_indices, mmr_scores, strict=True)
+        if score >= min_score
+    ], [score for score in mmr_scores if score >= min_score]
 
-    for i, uuid_1 in enumerate(uuids):
-        for j, uuid_2 in enumerate(uuids[:i]):
-            u = candidate_arrays[uuid_1]
-            v = candidate_arrays[uuid_2]
-            similarity = np.dot(u, v)
 
-            similarity_matrix[i, j] = similarity
-            similarity_matrix[j, i] = similarity
+def mmr_rerank(
+    query_vector: list[float],
+    search_result_uuids: list[list[str]],
+    candidates: dict[str, list[float]],
+    mmr_lambda: float = DEFAULT_MMR_LAMBDA,
+    min_score: float = -2.0,
+    limit: int | None = None,
+) -> tuple[list[str], list[float]]:
+    """
+    maximal_marginal_relevance over the candidates that have an embedding.
 
-    mmr_scores: dict[str, float] = {}
-    for i, uuid in enumerate(uuids):
-        max_sim = np.max(similarity_matrix[i, :])
-        mmr = mmr_lambda * np.dot(query_array, candidate_arrays[uuid]) + (mmr_lambda - 1) * max_sim
-        mmr_scores[uuid] = mmr
+    Candidates without a stored embedding (e.g. sentences the embedding backfill has not
+    reached yet) cannot be placed by MMR. Instead of being dropped they follow the MMR
+    picks in RRF order with a score of 0, unless min_score is positive, so a partly
+    embedded graph still fills the limit.
+    """
+    reranked_uuids, scores = maximal_marginal_relevance(
+        query_vector, candidates, mmr_lambda, min_score, limit
+    )
 
-    uuids.sort(reverse=True, key=lambda c: mmr_scores[c])
+    fused_uuids, _ = rrf(search_result_uuids)
+    unembedded_uuids = [uuid for uuid in fused_uuids if uuid not in candidates]
+    if not unembedded_uuids:
+        return reranked_uuids, scores
 
-    end = time()
-    logger.debug(f'Completed MMR reranking in {(end - start) * 1000} ms')
+    logger.warning(
+        f'MMR reranking skipped {len(unembedded_uuids)} candidates without an embedding'
+    )
+    if min_score > 0:
+        return reranked_uuids, scores
 
-    return [uuid for uuid in uuids if mmr_scores[uuid] >= min_score], [
-        mmr_scores[uuid] for uuid in uuids if mmr_scores[uuid] >= min_score
-    ]
+    if limit is not None:
+        unembedded_uuids = unembedded_uuids[: max(limit - len(reranked_uuids), 0)]
+
+    return reranked_uuids + unembedded_uuids, scores + [0.0] * len(unembedded_uuids)
 
 
 async def get_embeddings_for_vocabulary(
     driver: GraphDriver, nodes: list[VocabularyNode]
 ) -> dict[str, list[float]]:
-    results, _, _ = await driver.execute_query(
-        """
-        MATCH (n:Vocabulary)
-        WHERE n.id IN $node_uuids
-        RETURN DISTINCT
-            n.id AS uuid,
-            n.embedding AS embedding
-        """,
-        node_uuids=[node.id for node in nodes],
-        routing_='r',
-    )
+    # Hydrates the nodes in place; nodes that already carry an embedding are not refetched
+    await VocabularyNode.load_embeddings(driver, nodes)
 
-    embeddings_dict: dict[str, list[float]] = {}
-    for result in results:
-        uuid: str = result.get('uuid')
-        embedding: list[float] = result.get('embedding')
-        if uuid is not None and embedding is not None:
-            embeddings_dict[uuid] = embedding
-
-    return embeddings_dict
-
-
-    async def get_embeddings_for_articles(
-        driver: GraphDriver, articles: list[ArticleNode]
-    ) -> dict[str, list[float]]:
-        results, _, _ = await driver.execute_query(
-            """
-            MATCH (a:Article)
-            WHERE a.id IN $article_uuids
-            RETURN DISTINCT
-                a.id AS uuid,
-                a.openai_embedding AS embedding
-            """,
-            article_uuids=[article.id for article in articles],
-            routing_='r',
-        )
+    return {node.id: node.embedding for node in nodes if node.embedding is not None}
+
+
+async def get_embeddings_for_articles(
+    driver: GraphDriver, articles: list[ArticleNode]
+) -> dict[str, list[float]]:
+    await ArticleNode.load_openai_embeddings(driver, articles)
 
-        embeddings_dict: dict[str, list[float]] = {}
-        for result in results:
-            uuid: str = result.get('uuid')
-            embedding: list[float] = result.get('embedding')
-            if uuid is not None and embedding is not None:
-                embeddings_dict[uuid] = embedding
+    return {
+        article.id: article.openai_embedding
+        for article in articles
+        if article.openai_embedding is not None
+    }
+
+
+async def get_embeddings_for_sentences(
+    driver: GraphDriver, sentences: list[SentenceNode]
+) -> dict[str, list[float]]:
+    await SentenceNode.load_embeddings(driver, sentences)
 
-        return embeddings_dict
+    return {
+        sentence.id: sentence.embedding for sentence in sentences if sentence.embedding is not None
+    }
 
 
 # async def get_embeddings_for_edges(
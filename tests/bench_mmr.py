@@ -0,0 +1,99 @@
+"""
+Benchmark of maximal_marginal_relevance against the pairwise-loop implementation it replaced.
+
+Run from the repository root with `python -m tests.bench_mmr`. Candidates are random
+EMBEDDING_DIM vectors; every row reports the best of REPEATS runs in milliseconds.
+
+Results on a single-core x86_64 Linux container, Python 3.11, NumPy 2 with OpenBLAS
+(timings vary by about 30% between runs on this machine):
+
+    candidates  limit  pairwise loop (ms)  greedy matrix (ms)  speedup
+            50     20                 5.5                 2.8     2.0x
+            50   None                 5.5                 3.0     1.9x
+           200     20                43.3                11.7     3.7x
+           200   None                43.3                13.2     3.3x
+          1000     20              1042.1               114.2     9.1x
+          1000   None              1042.1               136.9     7.6x
+
+The pairwise loop scores every candidate once against all others, so its cost does not
+depend on the limit; the greedy selection reruns one vector update per pick. At 1000
+candidates about a third of the greedy time is spent converting the embedding lists into
+one array.
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+from embedder.client import EMBEDDING_DIM
+from helpers import normalize_l2
+from search.search_utils import DEFAULT_MMR_LAMBDA, maximal_marginal_relevance
+
+CANDIDATE_COUNTS = (50, 200, 1000)
+LIMITS = (20, None)
+REPEATS = 5
+
+
+def pairwise_loop_mmr(
+    query_vector: list[float],
+    candidates: dict[str, list[float]],
+    mmr_lambda: float = DEFAULT_MMR_LAMBDA,
+    min_score: float = -2.0,
+) -> tuple[list[str], list[float]]:
+    # the implementation before the vectorized greedy selection, kept as the baseline
+    query_array = np.array(query_vector)
+    candidate_arrays = {uuid: normalize_l2(embedding) for uuid, embedding in candidates.items()}
+    uuids = list(candidate_arrays.keys())
+
+    similarity_matrix = np.zeros((len(uuids), len(uuids)))
+    for i, uuid_1 in enumerate(uuids):
+        for j, uuid_2 in enumerate(uuids[:i]):
+            similarity = np.dot(candidate_arrays[uuid_1], candidate_arrays[uuid_2])
+            similarity_matrix[i, j] = similarity
+            similarity_matrix[j, i] = similarity
+
+    mmr_scores: dict[str, float] = {}
+    for i, uuid in enumerate(uuids):
+        max_sim = np.max(similarity_matrix[i, :])
+        mmr_scores[uuid] = (
+            mmr_lambda * np.dot(query_array, candidate_arrays[uuid]) + (mmr_lambda - 1) * max_sim
+        )
+
+    uuids.sort(reverse=True, key=lambda uuid: mmr_scores[uuid])
+    return [uuid for uuid in uuids if mmr_scores[uuid] >= min_score], [
+        mmr_scores[uuid] for uuid in uuids if mmr_scores[uuid] >= min_score
+    ]
+
+
+def best_time_ms(run) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = perf_counter()
+        run()
+        timings.append((perf_counter() - start) * 1000)
+
+    return min(timings)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    query_vector = rng.standard_normal(EMBEDDING_DIM).tolist()
+
+    print('candidates  limit  pairwise loop (ms)  greedy matrix (ms)  speedup')
+    for count in CANDIDATE_COUNTS:
+        candidates = {
+            f'candidate-{i}': rng.standard_normal(EMBEDDING_DIM).tolist() for i in range(count)
+        }
+        baseline_ms = best_time_ms(lambda: pairwise_loop_mmr(query_vector, candidates))
+        for limit in LIMITS:
+            greedy_ms = best_time_ms(
+                lambda: maximal_marginal_relevance(query_vector, candidates, limit=limit)
+            )
+            print(
+                f'{count:>10}  {str(limit):>5}  {baseline_ms:>18.1f}  {greedy_ms:>18.1f}  '
+                f'{baseline_ms / greedy_ms:>6.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import asyncio
+
+from cross_encoder.client import CrossEncoderClient
+from search.search_utils import cascade_rerank
+
+
+class FixedScoreCrossEncoder(CrossEncoderClient):
+    def __init__(self, scores: dict[str, float]):
+        self.scores = scores
+
+    async def rank(self, query: str, passages: list[str]) -> list[tuple[str, float]]:
+        ranked = [(passage, self.scores[passage]) for passage in passages]
+        return sorted(ranked, key=lambda item: item[1], reverse=True)
+
+
+def run_cascade(min_score: float) -> tuple[list[str], list[float]]:
+    passages = {uuid: uuid for uuid in ['a', 'b', 'c', 'd']}
+    cross_encoder = FixedScoreCrossEncoder({'a': 0.8, 'b': 0.1, 'c': 0.7, 'd': 0.6})
+
+    return asyncio.run(
+        cascade_rerank(
+            cross_encoder,
+            'query',
+            [['a', 'b', 'c', 'd']],
+            passages,
+            limit=2,
+            top_k=2,
+            timeout=None,
+            min_score=min_score,
+        )
+    )
+
+
+def test_unscored_tail_follows_in_rrf_order_without_min_score():
+    uuids, scores = run_cascade(min_score=0)
+
+    assert uuids == ['a', 'b', 'c', 'd']
+    assert scores == [0.8, 0.1, 0.0, 0.0]
+
+
+def test_min_score_drops_unscored_tail():
+    uuids, scores = run_cascade(min_score=0.5)
+
+    # b was scored and rejected; c and d were never scored and must not outrank that verdict
+    assert uuids == ['a']
+    assert scores == [0.8]
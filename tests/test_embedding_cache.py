@@ -0,0 +1,35 @@
+import asyncio
+
+from embedder.cache import CachedEmbedder
+from embedder.client import EmbedderClient
+
+
+class SlowEmbedder(EmbedderClient):
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, input_data):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return [1.0, 0.0]
+
+    async def create_batch(self, input_data_list):
+        return [await self.create([text]) for text in input_data_list]
+
+
+def test_cancelled_caller_does_not_cancel_concurrent_callers():
+    async def run():
+        embedder = CachedEmbedder(SlowEmbedder())
+        owner = asyncio.create_task(embedder.create('TNF signaling'))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(embedder.create('TNF signaling'))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+
+        return await waiter, embedder
+
+    embedding, embedder = asyncio.run(run())
+
+    assert embedding == [1.0, 0.0]
+    assert embedder.embedder.calls == 1
+    assert embedder.stats()['size'] == 1
@@ -0,0 +1,37 @@
+import asyncio
+
+from driver.driver import query_deadline
+from nodes import EmbeddingLoader
+
+
+class SlowDriver:
+    def __init__(self):
+        self.deadlines = []
+
+    async def execute_query(self, query, ids, **kwargs):
+        self.deadlines.append(query_deadline.get())
+        await asyncio.sleep(0.05)
+        return [{'id': id, 'embedding': [1.0]} for id in ids], None, None
+
+
+def test_timed_out_caller_does_not_cancel_other_callers():
+    async def run():
+        driver = SlowDriver()
+        loader = EmbeddingLoader(driver, 'Sentence', 'embedding')
+
+        token = query_deadline.set(123.0)
+        timed_out = asyncio.ensure_future(
+            asyncio.wait_for(loader.load_many(['a', 'b']), timeout=0.01)
+        )
+        query_deadline.reset(token)
+        other = asyncio.ensure_future(loader.load_many(['a', 'b']))
+        results = await asyncio.gather(timed_out, other, return_exceptions=True)
+
+        return results, driver
+
+    (timed_out, other), driver = asyncio.run(run())
+
+    assert isinstance(timed_out, asyncio.TimeoutError)
+    assert other == {'a': [1.0], 'b': [1.0]}
+    # the batched read does not inherit the deadline of the caller that triggered it
+    assert driver.deadlines == [None]
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from graph_queries import get_nodes_similarity_query, get_relationships_similarity_query
+from search.search_filters import SearchFilters
+from search.search_utils import (
+    edge_similarity_search,
+    node_similarity_search,
+    sentence_similarity_search,
+)
+
+
+class RecordingDriver:
+    def __init__(self):
+        self.calls: list[tuple[str, dict]] = []
+
+    async def execute_query(self, query, **kwargs):
+        self.calls.append((query, kwargs))
+        return [], None, None
+
+
+@pytest.mark.parametrize(
+    'builder', [get_nodes_similarity_query, get_relationships_similarity_query]
+)
+def test_similarity_query_passes_vector_and_k_as_parameters(builder):
+    query = builder('vocabulary_embeddings')
+
+    assert '$search_vector' in query
+    assert '$k' in query
+    assert query == builder('vocabulary_embeddings')
+
+
+@pytest.mark.parametrize(
+    'search', [node_similarity_search, edge_similarity_search, sentence_similarity_search]
+)
+def test_similarity_search_cypher_is_identical_across_query_vectors(search):
+    driver = RecordingDriver()
+
+    asyncio.run(search(driver, [0.1, 0.2, 0.3], SearchFilters(), limit=5))
+    asyncio.run(search(driver, [0.9, -0.4, 0.0], SearchFilters(), limit=20))
+
+    (first_query, first_params), (second_query, second_params) = driver.calls
+    assert first_query == second_query
+    assert '0.1' not in first_query and '0.9' not in second_query
+    assert first_params['search_vector'] == [0.1, 0.2, 0.3]
+    assert second_params['search_vector'] == [0.9, -0.4, 0.0]
+    assert first_params['k'] != second_params['k']
@@ -0,0 +1,22 @@
+from search.search_utils import mmr_rerank
+
+
+def test_candidates_without_embeddings_follow_mmr_picks_in_rrf_order():
+    uuids, scores = mmr_rerank(
+        [1.0, 0.0],
+        [['a', 'b', 'c', 'd']],
+        {'a': [1.0, 0.0], 'c': [0.0, 1.0]},
+        min_score=-2.0,
+        limit=3,
+    )
+
+    assert uuids == ['a', 'c', 'b']
+    assert scores[2] == 0.0
+
+
+def test_positive_min_score_drops_candidates_without_embeddings():
+    uuids, _ = mmr_rerank(
+        [1.0, 0.0], [['a', 'b']], {'a': [1.0, 0.0]}, min_score=0.1, limit=2
+    )
+
+    assert uuids == ['a']
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from search.search_utils import collapse_near_duplicates
+
+
+def collapse(*texts: str) -> list[str]:
+    items = [SimpleNamespace(id=str(i), text=text) for i, text in enumerate(texts)]
+    [collapsed] = collapse_near_duplicates([items], lambda item: item.text)
+
+    return [item.text for item in collapsed]
+
+
+def test_formatting_variants_collapse():
+    texts = collapse(
+        'TNF induces apoptosis of hepatocytes in mice.',
+        'tnf induces apoptosis of hepatocytes in mice',
+    )
+
+    assert texts == ['TNF induces apoptosis of hepatocytes in mice.']
+
+
+def test_direction_is_not_collapsed():
+    texts = collapse('insulin inhibits glucagon secretion', 'glucagon inhibits insulin secretion')
+
+    assert len(texts) == 2
+
+
+def test_negation_is_not_collapsed():
+    texts = collapse(
+        'metformin reduces hepatic glucose production in diabetic patients',
+        'metformin does not reduce hepatic glucose production in diabetic patients',
+        "metformin doesn't reduce hepatic glucose production in diabetic patients",
+        'metformin reduces no hepatic glucose production in diabetic patients',
+    )
+
+    # the contracted negation is a formatting variant of the spelled-out one
+    assert texts == [
+        'metformin reduces hepatic glucose production in diabetic patients',
+        'metformin does not reduce hepatic glucose production in diabetic patients',
+        'metformin reduces no hepatic glucose production in diabetic patients',
+    ]
+
+
+def test_identifiers_are_not_collapsed():
+    texts = collapse(
+        'mutations in BRCA1 increase breast cancer risk',
+        'mutations in BRCA2 increase breast cancer risk',
+    )
+
+    assert len(texts) == 2
@@ -0,0 +1,34 @@
+import asyncio
+
+from cross_encoder.cache import CachedCrossEncoder
+from cross_encoder.client import CrossEncoderClient
+
+
+class SlowCrossEncoder(CrossEncoderClient):
+    def __init__(self):
+        self.ranked: list[list[str]] = []
+
+    async def rank(self, query, passages):
+        self.ranked.append(passages)
+        await asyncio.sleep(0.05)
+        return [(passage, 1.0 / len(passage)) for passage in passages]
+
+
+def test_cancelled_caller_does_not_cancel_concurrent_rankings():
+    async def run():
+        cross_encoder = CachedCrossEncoder(SlowCrossEncoder())
+        owner = asyncio.create_task(cross_encoder.rank('TNF', ['TNF alpha', 'IL6']))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cross_encoder.rank('TNF', ['IL6', 'TNF alpha', 'NF-kB']))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+
+        return await waiter, cross_encoder
+
+    ranked, cross_encoder = asyncio.run(run())
+
+    assert ranked == [('IL6', 1 / 3), ('NF-kB', 1 / 5), ('TNF alpha', 1 / 9)]
+    # the waiter only sends the passage nobody is scoring yet
+    assert cross_encoder.cross_encoder.ranked == [['TNF alpha', 'IL6'], ['NF-kB']]
+    stats = cross_encoder.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 3, 3)
@@ -0,0 +1,19 @@
+from nodes import VocabularyNode
+from search.search_cache import SearchResultCache
+from search.search_config import SearchResults
+
+
+def test_cached_results_are_not_shared_between_callers():
+    cache = SearchResultCache()
+    results = SearchResults(nodes=[VocabularyNode(id='v1', name='TNF')], node_reranker_scores=[1.0])
+    cache.set('key', results)
+
+    # mutating the stored results or a hit must not leak into the next hit
+    results.nodes[0].embedding = [1.0, 0.0]
+    hit = cache.get('key')
+    hit.nodes[0].embedding = [0.0, 1.0]
+    hit.node_reranker_scores.append(0.5)
+
+    cached = cache.get('key')
+    assert cached.nodes[0].embedding is None
+    assert cached.node_reranker_scores == [1.0]
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+from neo4j.exceptions import Neo4jError
+
+from search.search_utils import SENTENCE_VECTOR_INDEX, query_vector_index
+
+
+class FailingDriver:
+    def __init__(self, error: Exception):
+        self.error = error
+
+    async def execute_query(self, query, **kwargs):
+        raise self.error
+
+
+def client_error(code: str, message: str) -> Exception:
+    return Neo4jError._hydrate_neo4j(code=code, message=message)
+
+
+def test_missing_vector_index_degrades_to_no_results():
+    error = client_error(
+        'Neo.ClientError.Procedure.ProcedureCallFailed',
+        f'Failed to invoke procedure: There is no such vector schema index: {SENTENCE_VECTOR_INDEX}',
+    )
+
+    records = asyncio.run(query_vector_index(FailingDriver(error), SENTENCE_VECTOR_INDEX, ''))
+
+    assert records == []
+
+
+@pytest.mark.parametrize(
+    'error',
+    [
+        client_error(
+            'Neo.ClientError.Statement.SyntaxError', f'Invalid input near {SENTENCE_VECTOR_INDEX}'
+        ),
+        RuntimeError(f'connection lost while querying {SENTENCE_VECTOR_INDEX}'),
+    ],
+)
+def test_other_errors_are_raised(error):
+    with pytest.raises(type(error)):
+        asyncio.run(query_vector_index(FailingDriver(error), SENTENCE_VECTOR_INDEX, ''))